@@ -1,102 +1,486 @@
-import requests
-import base64
+import os
+import orjson
+import httpx
+import binascii
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-import pandas as pd
+from typing import Optional, List, Dict, Any, Tuple, Callable, NamedTuple, TYPE_CHECKING
+from urllib.parse import urlparse, parse_qs
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Constants for GitHub API
 BASE_URL = "https://api.github.com"
+GRAPHQL_URL = f"{BASE_URL}/graphql"
 HEADERS = {"Accept": "application/vnd.github.v3+json"}
 
+# JSON payloads compress several-fold; only advertise brotli when httpx can decode it
+try:
+    import brotli  # noqa: F401
+    HEADERS["Accept-Encoding"] = "br, gzip"
+except ImportError:
+    HEADERS["Accept-Encoding"] = "gzip"
+
+MAX_CONCURRENT_PAGES = 10
+MAX_CONCURRENT_DIRS = 16
+RATE_LIMIT_MIN_REMAINING = 5
+MAX_RATE_LIMIT_WAIT = 10  # seconds; longer waits fail fast instead of holding a worker thread
+MAX_RETRIES = 5
+CONTENTS_CACHE_SIZE = 4096
+CONTENTS_CACHE_TTL = 300  # seconds, for listings of the default branch (ref=None)
+ETAG_CACHE_SIZE = 2048
+RETRY_STATUSES = (502, 503)
+
+# Shared HTTP/2 client: concurrent page and directory requests from the worker
+# threads are multiplexed over one pooled keep-alive connection to api.github.com
+_SESSION = httpx.Client(
+    headers=HEADERS,
+    timeout=30,
+    follow_redirects=True,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        retries=3
+    )
+)
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Whether a response is a primary or secondary rate-limit rejection."""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+def _reset_delay(response: httpx.Response) -> float:
+    """Seconds until the rate-limit window in `X-RateLimit-Reset` resets."""
+    reset = response.headers.get("X-RateLimit-Reset")
+    return max(0.0, int(reset) - time.time()) if reset else 0.0
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a throttled or failed request."""
+    if "Retry-After" in response.headers:
+        return float(response.headers["Retry-After"])
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return _reset_delay(response)
+    return min(2 ** attempt, 60)
+
+# Last (X-RateLimit-Remaining, X-RateLimit-Reset) seen per token; tokens not seen yet, or
+# whose window has since reset, count as a full hourly budget
+_TOKEN_BUDGETS: Dict[str, Tuple[int, float]] = {}
+_TOKEN_LOCK = threading.Lock()
+TOKEN_HOURLY_LIMIT = 5000
+
+def _github_tokens() -> List[str]:
+    """Tokens from GITHUB_TOKENS (comma-separated) or GITHUB_TOKEN.
+
+    Read on every call rather than at import, so a later load_dotenv() still applies.
+    """
+    raw = os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN") or ""
+    return [token.strip() for token in raw.split(",") if token.strip()]
+
+def _pick_token() -> Optional[str]:
+    """The configured token with the most requests left, or None when there are none."""
+    tokens = _github_tokens()
+    if not tokens:
+        return None
+    now = time.time()
+
+    def budget(token: str) -> int:
+        remaining, reset = _TOKEN_BUDGETS.get(token, (TOKEN_HOURLY_LIMIT, 0.0))
+        return TOKEN_HOURLY_LIMIT if reset and now >= reset else remaining
+
+    with _TOKEN_LOCK:
+        return max(tokens, key=budget)
+
+def _record_remaining(token: Optional[str], response: httpx.Response) -> None:
+    """Remember how many requests `token` has left after `response`, and when that resets."""
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if token is None or (remaining is None and not _is_rate_limited(response)):
+        return
+    reset = float(response.headers.get("X-RateLimit-Reset") or 0)
+    with _TOKEN_LOCK:
+        _TOKEN_BUDGETS[token] = (0 if _is_rate_limited(response) else int(remaining), reset)
+
+# LRU (ETAG_CACHE_SIZE entries) of the last successful response per (url, params), revalidated with
+# If-None-Match: key -> (ETag, body, Link header)
+_ETAG_CACHE: "OrderedDict[Tuple[str, Tuple], Tuple[str, bytes, Optional[str]]]" = OrderedDict()
+_ETAG_CACHE_LOCK = threading.Lock()
+
+def _conditional_get(url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+    """GET a URL, serving the cached response when GitHub answers 304 Not Modified.
+
+    304 responses carry no body and do not count against the primary rate limit.
+    Requests rotate over the configured tokens, each going to the one with the most
+    requests left, so the tokens' hourly budgets add up.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    with _ETAG_CACHE_LOCK:
+        cached = _ETAG_CACHE.get(key)
+        if cached is not None:
+            _ETAG_CACHE.move_to_end(key)
+
+    for attempt in range(MAX_RETRIES + 1):
+        token = _pick_token()
+        headers = {"Authorization": f"token {token}"} if token else {}
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        response = _SESSION.get(url, params=params, headers=headers)
+        _record_remaining(token, response)
+        if attempt < MAX_RETRIES and _is_rate_limited(response) and _pick_token() != token:
+            continue  # Another token still has budget; switch instead of waiting
+        if attempt < MAX_RETRIES and (response.status_code in RETRY_STATUSES or _is_rate_limited(response)):
+            delay = _retry_delay(response, attempt)
+            if delay > MAX_RATE_LIMIT_WAIT and _is_rate_limited(response):
+                print(f"GitHub rate limit exceeded; resets in {delay:.0f} seconds, not waiting.")
+                break
+            print(f"GitHub returned {response.status_code}, retrying in {delay:.0f} seconds...")
+            time.sleep(delay)
+            continue
+        break
+
+    # Slow down before the budget runs out rather than hitting the limit mid-pagination
+    # (only once no other token has more left)
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if (response.status_code in (200, 304) and remaining is not None and int(remaining) < RATE_LIMIT_MIN_REMAINING
+            and _pick_token() == token):
+        wait_time = _reset_delay(response)
+        # Only wait out a window that is about to reset; otherwise spend the remaining budget
+        # and let the next request fail fast
+        if wait_time <= MAX_RATE_LIMIT_WAIT:
+            print(f"Rate limit nearly exhausted. Waiting {wait_time:.0f} seconds for reset.")
+            time.sleep(wait_time)
+
+    if response.status_code == 304 and cached is not None:
+        # Replay the cached body as a 200, keeping the fresh rate-limit headers from the 304
+        etag, content, link = cached
+        replay_headers = {name: value for name, value in response.headers.items()
+                          if name.lower().startswith("x-ratelimit-")}
+        replay_headers["ETag"] = etag
+        if link:
+            replay_headers["Link"] = link
+        return httpx.Response(200, headers=replay_headers, content=content, request=response.request)
+    if response.status_code == 200 and response.headers.get("ETag"):
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[key] = (response.headers["ETag"], response.content, response.headers.get("Link"))
+            _ETAG_CACHE.move_to_end(key)
+            if len(_ETAG_CACHE) > ETAG_CACHE_SIZE:
+                _ETAG_CACHE.popitem(last=False)
+    return response
+
+class FileEntry(NamedTuple):
+    """A file in the nested listing returned by get_recursive_contents."""
+    name: str
+    path: str
+    size: int
+    url: str
+    type: str = "file"
+
+class DirEntry(NamedTuple):
+    """A directory in the nested listing returned by get_recursive_contents."""
+    name: str
+    path: str
+    contents: list
+    type: str = "dir"
+
+# LRU of get_contents results: (owner, repo, path, ref) -> (fetched_at, contents)
+_CONTENTS_CACHE: "OrderedDict[Tuple[str, str, str, Optional[str]], Tuple[float, Any]]" = OrderedDict()
+_CONTENTS_CACHE_LOCK = threading.Lock()
+
+@lru_cache(maxsize=128)
+def _repo_url(owner: str, repo: str) -> str:
+    """Base API URL for a repository, built once per (owner, repo)."""
+    return f"{BASE_URL}/repos/{owner}/{repo}"
+
 def get_repo_info(owner: str, repo: str) -> Optional[Dict[str, Any]]:
-    url = f"{BASE_URL}/repos/{owner}/{repo}"
-    response = requests.get(url, headers=HEADERS)
+    url = _repo_url(owner, repo)
+    response = _conditional_get(url)
 
     if response.status_code == 200:
-        return response.json()
+        return orjson.loads(response.content)
     else:
         print(f"Error get_repo_info: {response.status_code}: {response.text}")
         return None
 
-def _paginated_get(url: str, params: Optional[Dict[str, Any]] = None, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
-    """Handle paginated API responses with rate limit awareness."""
+def _fetch_page(url: str, params: Dict[str, Any], page: int) -> Optional[List[Dict[str, Any]]]:
+    """Fetch a single page of a paginated endpoint."""
+    response = _conditional_get(url, params={**params, "page": page})
+
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    else:
+        print(f"Error {response.status_code}: {response.text}")
+        return None
+
+def _last_page(response: httpx.Response) -> int:
+    """Read the last page number from the `Link: rel="last"` header."""
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+
+def _to_dataframe(items: List[Dict[str, Any]]) -> "pd.DataFrame":
+    """Build a DataFrame from API items in one columnar pass (via Arrow when available)."""
+    # Imported here so callers that never ask for DataFrames don't pay pandas' import time
+    import pandas as pd
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        try:
+            return pa.Table.from_pylist(items).to_pandas(split_blocks=True, self_destruct=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Inconsistent field types across items; let pandas infer object columns
+            pass
+    return pd.DataFrame.from_records(items)
+
+def _paginated_get(url: str, params: Optional[Dict[str, Any]] = None, max_items: Optional[int] = None,
+                   return_df: bool = False, filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None):
+    """Handle paginated API responses, fetching pages after the first concurrently.
+
+    `filter_fn` is applied to each page as it arrives, so rejected items are never
+    accumulated. Returns a list of items, or a DataFrame when `return_df` is set.
+    """
     if params is None:
         params = {}
 
-    items = []
-    page = 1
     per_page = min(100, params.get("per_page", 30))
     params["per_page"] = per_page
+    params["page"] = 1
+    response = _conditional_get(url, params=params)
 
-    while True:
-        params["page"] = page
-        response = requests.get(url, headers=HEADERS, params=params)
+    if response.status_code != 200:
+        print(f"Error {response.status_code}: {response.text}")
+        return []
 
-        if response.status_code == 200:
-            page_items = response.json()
-            if not page_items:
-                break
+    page_items = orjson.loads(response.content)
+    if not page_items:
+        return _to_dataframe([]) if return_df else []
+    # Keep each page's list and flatten once at the end instead of growing one list per page
+    pages = [page_items if filter_fn is None else list(filter(filter_fn, page_items))]
+    collected = len(pages[0])
 
-            items.extend(page_items)
-            page += 1
+    # The first page tells us how many pages exist, so the rest can be fetched in parallel
+    last_page = _last_page(response)
+    if max_items and filter_fn is None:
+        # Every item counts towards max_items, so later pages are never needed
+        last_page = min(last_page, -(-max_items // per_page))
 
-            # Check if we've reached the requested limit
-            if max_items and len(items) >= max_items:
-                return items[:max_items]
+    if last_page > 1:
+        remaining_pages = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as executor:
+            for start in range(0, len(remaining_pages), MAX_CONCURRENT_PAGES):
+                batch = remaining_pages[start:start + MAX_CONCURRENT_PAGES]
+                complete = True
+                for page_items in executor.map(lambda page: _fetch_page(url, params, page), batch):
+                    # Stop at the first failed or empty page, as the serial loop did
+                    if not page_items:
+                        complete = False
+                        break
+                    if filter_fn is not None:
+                        page_items = list(filter(filter_fn, page_items))
+                    pages.append(page_items)
+                    collected += len(page_items)
 
-            # Check if we've reached the end (GitHub returns fewer items than requested)
-            if len(page_items) < per_page:
-                break
-        else:
-            print(f"Error {response.status_code}: {response.text}")
-            break
+                if not complete or (max_items and collected >= max_items):
+                    break
 
+    items = list(islice(chain.from_iterable(pages), max_items or None))
+    if return_df:
+        return _to_dataframe(items)
     return items
 
+REPO_BUNDLE_QUERY = """
+query($owner: String!, $name: String!, $maxIssues: Int!, $maxPrs: Int!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    url
+    createdAt
+    updatedAt
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    licenseInfo { name }
+    defaultBranchRef { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    openIssues: issues(states: OPEN) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    refs(refPrefix: "refs/heads/", first: 100) {
+      totalCount
+      nodes { name target { oid } }
+    }
+    issues(first: $maxIssues, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title state url createdAt closedAt
+        author { login }
+        labels(first: 10) { nodes { name } }
+      }
+    }
+    pullRequests(first: $maxPrs, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title state url createdAt closedAt mergedAt
+        author { login }
+      }
+    }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+  }
+}
+"""
+
+def get_repo_bundle(owner: str, repo: str, max_issues: int = 100, max_prs: int = 100) -> Optional[Dict[str, Any]]:
+    """Get repository info, branches, issues, pull requests and README in one GraphQL request.
+
+    Results are converted to the same shapes the REST helpers return. Returns None when
+    no GitHub token is set (GraphQL requires authentication), when more than one page
+    of issues or pull requests is requested, or on error, so callers can fall back to REST.
+    """
+    token = _pick_token()
+    if not token or max_issues > 100 or max_prs > 100:
+        return None
+
+    response = _SESSION.post(
+        GRAPHQL_URL,
+        json={
+            "query": REPO_BUNDLE_QUERY,
+            "variables": {"owner": owner, "name": repo, "maxIssues": max_issues, "maxPrs": max_prs}
+        },
+        headers={"Authorization": f"bearer {token}"}
+    )
+
+    if response.status_code != 200:
+        print(f"Error get_repo_bundle: {response.status_code}: {response.text}")
+        return None
+
+    payload = orjson.loads(response.content)
+    data = (payload.get("data") or {}).get("repository")
+    if payload.get("errors") or not data:
+        print(f"Error get_repo_bundle: {payload.get('errors')}")
+        return None
+
+    repository = {
+        "name": data["name"],
+        "full_name": data["nameWithOwner"],
+        "description": data["description"],
+        "html_url": data["url"],
+        "created_at": data["createdAt"],
+        "updated_at": data["updatedAt"],
+        "stargazers_count": data["stargazerCount"],
+        "forks_count": data["forkCount"],
+        # REST counts open pull requests as issues too
+        "open_issues_count": data["openIssues"]["totalCount"] + data["openPullRequests"]["totalCount"],
+        "language": (data["primaryLanguage"] or {}).get("name"),
+        "license": {"name": data["licenseInfo"]["name"]} if data["licenseInfo"] else None,
+        "default_branch": (data["defaultBranchRef"] or {}).get("name"),
+        "topics": [node["topic"]["name"] for node in data["repositoryTopics"]["nodes"]]
+    }
+
+    # GraphQL caps a connection at 100 nodes; fetch the rest of the branches over REST
+    if data["refs"]["totalCount"] > len(data["refs"]["nodes"]):
+        branches = get_branches(owner, repo)
+    else:
+        branches = [
+            {"name": node["name"], "commit": {"sha": node["target"]["oid"]}}
+            for node in data["refs"]["nodes"]
+        ]
+
+    issues = [
+        {
+            "number": node["number"],
+            "title": node["title"],
+            "state": node["state"].lower(),
+            "html_url": node["url"],
+            "created_at": node["createdAt"],
+            "closed_at": node["closedAt"],
+            "user": {"login": (node["author"] or {}).get("login")},
+            "labels": [{"name": label["name"]} for label in node["labels"]["nodes"]]
+        }
+        for node in data["issues"]["nodes"]
+    ]
+
+    pull_requests = [
+        {
+            "number": node["number"],
+            "title": node["title"],
+            "state": "open" if node["state"] == "OPEN" else "closed",
+            "html_url": node["url"],
+            "created_at": node["createdAt"],
+            "closed_at": node["closedAt"],
+            "merged_at": node["mergedAt"],
+            "user": {"login": (node["author"] or {}).get("login")}
+        }
+        for node in data["pullRequests"]["nodes"]
+    ]
+
+    readme = None
+    if data["readme"] and data["readme"].get("text") is not None:
+        readme = {"name": "README.md", "path": "README.md", "content": data["readme"]["text"]}
+
+    return {
+        "repository": repository,
+        "branches": branches,
+        "issues": issues,
+        "pull_requests": pull_requests,
+        "readme": readme
+    }
+
 def get_contributors(owner: str, repo: str, max_contributors: Optional[int] = None) -> List[Dict[str, Any]]:
     """Get repository contributors with pagination support."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/contributors"
+    url = f"{_repo_url(owner, repo)}/contributors"
     return _paginated_get(url, max_items=max_contributors)
 
-def get_commits(owner: str, repo: str, params: Optional[Dict[str, Any]] = None, max_commits: Optional[int] = None) -> List[Dict[str, Any]]:
+def get_commits(owner: str, repo: str, params: Optional[Dict[str, Any]] = None, max_commits: Optional[int] = None, return_df: bool = False,
+                filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None):
     """Get commits with enhanced filtering and pagination."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/commits"
-    return _paginated_get(url, params=params, max_items=max_commits)
+    url = f"{_repo_url(owner, repo)}/commits"
+    return _paginated_get(url, params=params, max_items=max_commits, return_df=return_df, filter_fn=filter_fn)
 
 def get_branches(owner: str, repo: str) -> List[Dict[str, Any]]:
     """Get repository branches."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/branches"
+    url = f"{_repo_url(owner, repo)}/branches"
     return _paginated_get(url)
 
-def get_issues(owner: str, repo: str, state: str = "all", max_issues: Optional[int] = None, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def get_issues(owner: str, repo: str, state: str = "all", max_issues: Optional[int] = None, params: Optional[Dict[str, Any]] = None, return_df: bool = False,
+               filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None):
     """Get repository issues with enhanced filtering."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/issues"
+    url = f"{_repo_url(owner, repo)}/issues"
     if params is None:
         params = {}
     params["state"] = state
-    return _paginated_get(url, params=params, max_items=max_issues)
+    return _paginated_get(url, params=params, max_items=max_issues, return_df=return_df, filter_fn=filter_fn)
 
-def get_pull_requests(owner: str, repo: str, state: str = "all", max_prs: Optional[int] = None, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def get_pull_requests(owner: str, repo: str, state: str = "all", max_prs: Optional[int] = None, params: Optional[Dict[str, Any]] = None, return_df: bool = False,
+                      filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None):
     """Get repository pull requests with enhanced filtering."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/pulls"
+    url = f"{_repo_url(owner, repo)}/pulls"
     if params is None:
         params = {}
     params["state"] = state
-    return _paginated_get(url, params=params, max_items=max_prs)
+    return _paginated_get(url, params=params, max_items=max_prs, return_df=return_df, filter_fn=filter_fn)
 
 def get_readme(owner: str, repo: str, ref: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Get repository README content."""
-    url = f"{BASE_URL}/repos/{owner}/{repo}/readme"
+    url = f"{_repo_url(owner, repo)}/readme"
     params = {}
     if ref:
         params["ref"] = ref
 
-    response = requests.get(url, headers=HEADERS, params=params)
+    response = _conditional_get(url, params=params)
 
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         if data.get("content"):
-            content = base64.b64decode(data["content"]).decode("utf-8")
+            # a2b_base64 accepts the ASCII str as-is, skipping b64decode's extra encode/validate copy
+            content = binascii.a2b_base64(data["content"]).decode("utf-8")
             return {
                 "name": data["name"],
                 "path": data["path"],
@@ -108,52 +492,139 @@ def get_readme(owner: str, repo: str, ref: Optional[str] = None) -> Optional[Dic
         return None
 
 def get_contents(owner, repo, path="", ref=None):
-        url = f"{BASE_URL}/repos/{owner}/{repo}/contents/{path}"
+        """Get repository contents at a path, memoized per (owner, repo, path, ref)."""
+        key = (owner, repo, path, ref)
+        with _CONTENTS_CACHE_LOCK:
+            cached = _CONTENTS_CACHE.get(key)
+            if cached is not None:
+                fetched_at, contents = cached
+                # Listings of the default branch can change, so they expire
+                if ref is not None or time.monotonic() - fetched_at < CONTENTS_CACHE_TTL:
+                    _CONTENTS_CACHE.move_to_end(key)
+                    return contents
+                del _CONTENTS_CACHE[key]
+
+        url = f"{_repo_url(owner, repo)}/contents/{path}"
         params = {}
         if ref:
             params["ref"] = ref
 
-        response = requests.get(url, headers=HEADERS, params=params)
+        response = _conditional_get(url, params=params)
 
         if response.status_code == 200:
-            return response.json()
+            contents = orjson.loads(response.content)
+            with _CONTENTS_CACHE_LOCK:
+                _CONTENTS_CACHE[key] = (time.monotonic(), contents)
+                if len(_CONTENTS_CACHE) > CONTENTS_CACHE_SIZE:
+                    _CONTENTS_CACHE.popitem(last=False)
+            return contents
         else:
             return []
 
+def clear_contents_cache():
+        """Forget memoized get_contents results, e.g. after the repository was updated."""
+        with _CONTENTS_CACHE_LOCK:
+            _CONTENTS_CACHE.clear()
+
+def get_tree(owner, repo, ref=None):
+        """Get every entry of the repository tree in a single request.
+
+        Returns the flat list of git tree entries, or None if the tree could not be
+        fetched or GitHub truncated it.
+        """
+        url = f"{_repo_url(owner, repo)}/git/trees/{ref or 'HEAD'}"
+        response = _conditional_get(url, params={"recursive": 1})
+
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            if data.get("truncated"):
+                return None
+            return data["tree"]
+        else:
+            print(f"Error get_tree: {response.status_code}")
+            return None
+
 def get_recursive_contents(owner, repo, path="", max_depth=3, current_depth=0, max_files=1000, ref=None):
-        """Recursively get repository contents with a depth limit and file count limit."""
-        if current_depth >= max_depth:
-            return []
+        """Get nested repository contents with a depth limit and file count limit.
+
+        Built from a single recursive tree request; falls back to walking the contents
+        API when the tree is unavailable or truncated.
+        """
+        tree = get_tree(owner, repo, ref)
+        if tree is None:
+            return _walk_contents(owner, repo, path, max_depth, current_depth, max_files, ref)
+
+        root = path.strip("/")
+        prefix = f"{root}/" if root else ""
+        levels = max_depth - current_depth
+
+        # Keep entries under `path` within the depth limit, shallowest first so the
+        # file limit is applied level by level like the contents walk
+        entries = []
+        for entry in tree:
+            if not entry["path"].startswith(prefix):
+                continue
+            depth = entry["path"][len(prefix):].count("/")
+            if depth < levels:
+                entries.append((depth, entry))
+        entries.sort(key=lambda pair: pair[0])
 
-        contents = get_contents(owner, repo, path, ref)
         results = []
+        dirs = {root: results}
         file_count = 0
 
-        for item in contents:
+        for _, entry in entries:
             if file_count >= max_files:
                 break
 
-            if item["type"] == "dir":
-                # For directories, add the directory itself and recursively get contents
-                dir_item = {
-                    "type": "dir",
-                    "name": item["name"],
-                    "path": item["path"],
-                    "contents": get_recursive_contents(
-                        owner, repo, item["path"], max_depth, current_depth + 1,
-                        max_files - file_count, ref
-                    )
-                }
-                results.append(dir_item)
+            entry_path = entry["path"]
+            name = entry_path.rsplit("/", 1)[-1]
+            parent = dirs[entry_path.rsplit("/", 1)[0] if "/" in entry_path else ""]
+
+            if entry["type"] == "tree":
+                dir_item = DirEntry(name, entry_path, [])
+                parent.append(dir_item)
+                dirs[entry_path] = dir_item.contents
             else:
-                # For files, add the file info
-                results.append({
-                    "type": "file",
-                    "name": item["name"],
-                    "path": item["path"],
-                    "size": item["size"],
-                    "url": item["html_url"]
-                })
+                parent.append(FileEntry(
+                    name, entry_path, entry.get("size", 0),
+                    f"https://github.com/{owner}/{repo}/blob/{ref or 'HEAD'}/{entry_path}"
+                ))
                 file_count += 1
 
-        return results
\ No newline at end of file
+        return results
+
+def _walk_contents(owner, repo, path="", max_depth=3, current_depth=0, max_files=1000, ref=None):
+        """Walk repository contents breadth-first via the contents API.
+
+        All directories on the same level are listed in parallel, since each listing
+        is an independent API call.
+        """
+        results = []
+        level = [(path, results)]
+        file_count = 0
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DIRS) as executor:
+            while level and current_depth < max_depth and file_count < max_files:
+                next_level = []
+                listings = executor.map(lambda entry: get_contents(owner, repo, entry[0], ref), level)
+
+                for (_, target), contents in zip(level, listings):
+                    for item in contents:
+                        if file_count >= max_files:
+                            break
+
+                        if item["type"] == "dir":
+                            # For directories, add the directory itself and queue its contents for the next level
+                            dir_item = DirEntry(item["name"], item["path"], [])
+                            target.append(dir_item)
+                            next_level.append((item["path"], dir_item.contents))
+                        else:
+                            # For files, add the file info
+                            target.append(FileEntry(item["name"], item["path"], item["size"], item["html_url"]))
+                            file_count += 1
+
+                level = next_level
+                current_depth += 1
+
+        return results
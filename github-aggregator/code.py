@@ -1,22 +1,38 @@
 # Import necessary libraries (keep existing ones + add new ones)
-import requests
+import asyncio
+import httpx
 import json
+import orjson
 import os
+import sys
+import pickle
+import hashlib
+import heapq
+import io
 import base64
 import re
 import ast
 import networkx as nx
 import radon.metrics as metrics
 import radon.complexity as complexity
+import radon.raw as raw
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from IPython import get_ipython
 from IPython.display import display, Markdown, HTML
 import numpy as np
 from github import Github, GithubException # PyGithub, add GithubException
 import time
+import sqlite3
+import random
+import threading
+import zipfile
+from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv # For environment variables
 
 # --- Neo4j and Gemini ---
@@ -24,28 +40,286 @@ from neo4j import GraphDatabase, basic_auth
 import google.generativeai as genai
 
 # --- GitHubRepoInfo Class ---
+# One GraphQL request for the fields otherwise spread across several REST endpoints (including the latest commits)
+REPO_BUNDLE_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    url
+    createdAt
+    updatedAt
+    stargazerCount
+    forkCount
+    owner { login avatarUrl __typename }
+    primaryLanguage { name }
+    licenseInfo { name }
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: 30) {
+            pageInfo { hasNextPage }
+            nodes {
+              oid url message
+              author { name email date user { login } }
+              committer { name email date user { login } }
+            }
+          }
+        }
+      }
+    }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    openIssues: issues(states: OPEN) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+      totalCount
+      edges { size node { name } }
+    }
+    refs(refPrefix: "refs/heads/", first: 100) {
+      totalCount
+      nodes { name target { oid } }
+    }
+    releases(first: 50, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { name tagName url createdAt publishedAt isDraft isPrerelease }
+    }
+  }
+}
+"""
+
+# Only the pull request fields get_pr_timeline uses, most recently updated first
+PR_TIMELINE_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { state createdAt updatedAt closedAt mergedAt additions deletions changedFiles }
+    }
+  }
+}
+"""
+
+# Everything get_pull_request_details returns, in one request instead of PyGithub's repo + pull calls
+PR_DETAILS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      number title state merged body url createdAt updatedAt closedAt mergedAt
+      author { login }
+      commits { totalCount }
+      additions deletions changedFiles
+      labels(first: 100) { nodes { name } }
+      assignees(first: 100) { nodes { login } }
+      milestone { title }
+    }
+  }
+}
+"""
+
+# Line prefixes extract_code_summary counts as comments
+COMMENT_PREFIXES = ('#', '//', '/*', '*', '<!--')
+# Byte lookup table of the ASCII whitespace str.lstrip removes
+WHITESPACE_TABLE = np.zeros(256, dtype=bool)
+WHITESPACE_TABLE[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+
+# Bump when extract_code_summary's output changes, to invalidate cached summaries
+SUMMARY_CACHE_VERSION = 1
+
+# Extensions (lowercase) and extensionless file names treated as text by is_text_file
+TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.rst', '.py', '.js', '.html', '.css', '.java', '.c',
+    '.cpp', '.h', '.hpp', '.json', '.xml', '.yaml', '.yml', '.toml',
+    '.ini', '.cfg', '.conf', '.sh', '.bat', '.ps1', '.rb', '.pl', '.php',
+    '.go', '.rs', '.ts', '.jsx', '.tsx', '.vue', '.swift', '.kt', '.scala',
+    '.groovy', '.lua', '.r', '.dart', '.ex', '.exs', '.erl', '.hrl',
+    '.clj', '.hs', '.elm', '.f90', '.f95', '.f03', '.sql', '.cs', '.ipynb',
+    '.rmd', '.jl', '.fs', '.ml', '.mli', '.d', '.scm', '.lisp',
+    '.el', '.m', '.mm', '.vb', '.asm', '.s', '.dockerfile', '.gradle'
+})
+# os.path.splitext gives dotfiles and these names no extension, so match them by name
+TEXT_FILENAMES = frozenset({
+    '.gitignore', '.dockerignore', '.env', '.editorconfig', '.htaccess',
+    'Dockerfile', 'Makefile', 'LICENSE', 'README', 'CHANGELOG', 'Procfile', 'Gemfile', 'Rakefile'
+})
+# Extensions of the files summarized and dependency-analyzed as code
+CODE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx'})
+
+# AST fields holding nested statements (or except handlers / match cases, which hold statements)
+STATEMENT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+# Tree-sitter grammars for analyze_js_ts; without tree_sitter_languages the regexes below are used
+try:
+    from tree_sitter_languages import get_language, get_parser
+    JS_TS_GRAMMARS = {'.js': 'javascript', '.jsx': 'javascript', '.ts': 'typescript', '.tsx': 'tsx'}
+except ImportError:
+    JS_TS_GRAMMARS = {}
+
+# igraph computes the dependency network layout natively when installed; NetworkX stays the graph API
+try:
+    import igraph as ig
+except ImportError:
+    ig = None
+
+# One query for every definition analyze_js_ts reports, run in a single pass over the syntax tree
+JS_TS_QUERY = """
+(function_declaration) @function
+(generator_function_declaration) @function
+(method_definition) @function
+(variable_declarator value: [(arrow_function) (function)]) @function
+(pair value: [(arrow_function) (function)]) @function
+(class_declaration) @class
+(import_statement) @import
+(variable_declarator value: (call_expression function: (identifier) @_require (#eq? @_require "require"))) @require
+(export_statement) @export
+(call_expression function: (identifier) @hook (#match? @hook "^use[A-Z]"))
+"""
+
+@lru_cache(maxsize=None)
+def js_ts_parser(grammar):
+    """Build (and cache) the tree-sitter parser and compiled query for a grammar."""
+    return get_parser(grammar), get_language(grammar).query(JS_TS_QUERY)
+
+def line_metrics(text):
+    """Count total, code, comment and blank lines of text in one vectorized pass over its bytes."""
+    buf = np.frombuffer(text.encode('utf-8', 'replace'), dtype=np.uint8)
+    newlines = np.flatnonzero(buf == 0x0A)
+    starts = np.r_[0, newlines + 1]
+    ends = np.r_[newlines, len(buf)]
+
+    # First non-whitespace byte at or after each line start; the line is blank if that lies past its end
+    solid = np.flatnonzero(~WHITESPACE_TABLE[buf])
+    first = np.append(solid, len(buf))[np.searchsorted(solid, starts)]
+    blank = first >= ends
+
+    # Compare the bytes at each line's first position against every comment prefix (padded past the end)
+    padded = np.concatenate([buf, np.zeros(max(map(len, COMMENT_PREFIXES)), dtype=np.uint8)])
+    comment = np.zeros(len(starts), dtype=bool)
+    for prefix in COMMENT_PREFIXES:
+        match = ~blank
+        for offset, byte in enumerate(prefix.encode()):
+            match &= padded[first + offset] == byte
+        comment |= match
+
+    blank_lines = int(blank.sum())
+    comment_lines = int(comment.sum())
+    return len(starts), len(starts) - blank_lines - comment_lines, comment_lines, blank_lines
+
+# Regexes for analyze_js_ts, compiled once at import
+# Each pattern is paired with a literal every match must contain, so a cheap substring
+# check can skip whole scans on files that cannot match
+JS_FUNCTION_PATTERNS = [
+    # Regular functions
+    ('function', re.compile(r'function\s+(\w+)\s*\(([^)]*)\)')),
+    # Arrow functions assigned to variables
+    ('=>', re.compile(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:\([^)]*\)|[^=]*)\s*=>\s*{')),
+    # Class methods
+    ('(', re.compile(r'(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*{')),
+    # Object methods
+    ('function', re.compile(r'(\w+)\s*:\s*function\s*\(([^)]*)\)'))
+]
+JS_CLASS_PATTERN = re.compile(r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*{([^}]*)}', re.DOTALL)
+JS_METHOD_PATTERN = re.compile(r'(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*{([^}]*)}')
+# ES6 imports and CommonJS requires, told apart by match.lastgroup
+JS_IMPORT_PATTERN = re.compile(
+    r'(?P<es6>import\s+(?:{(?P<es6_names>[^}]*)}|\*\s+as\s+(?P<es6_namespace>\w+)|(?P<es6_default>\w+))'
+    r'\s+from\s+[\'"][^\'"]+[\'"])'
+    r'|(?P<cjs>(?:const|let|var)\s+(?:{(?P<cjs_names>[^}]*)}|(?P<cjs_default>\w+))'
+    r'\s*=\s*require\([\'"][^\'"]+[\'"]\))'
+)
+JS_HOOK_PATTERN = re.compile(r'use([A-Z]\w+)\s*\(')
+# Named and default exports
+JS_EXPORT_PATTERN = re.compile(
+    r'export\s+(?:const|let|var|function|class)\s+(?P<named>\w+)'
+    r'|export\s+default\s+(?:function|class)?\s*(?P<default>\w+)?'
+)
+
 class GitHubRepoInfo:
     """Enhanced class to get comprehensive information about a GitHub repository."""
 
-    def __init__(self, token=None):
-        """Initialize with optional GitHub API token."""
+    # Upper bound on concurrent requests, to stay clear of GitHub's secondary rate limits
+    max_concurrent_requests = 10
+    # Threads summarizing code files locally (summarize_code_files)
+    max_summary_workers = min(16, (os.cpu_count() or 1) * 2)
+    # Retries for transient responses (secondary rate limits, 5xx, statistics still computing)
+    max_retries = 6
+    # Weekly series longer than this are charted without per-week markers/bars and with automatic date ticks
+    dense_chart_weeks = 156
+    # Threads writing files in export_repo_text's directory mode
+    max_export_writers = 16
+    # Largest dependency network display_repo_info draws, when igraph is available for the layout
+    max_native_layout_nodes = 300
+    # Seconds a get_repo_bundle result is reused before GitHub is queried again
+    bundle_ttl = 300
+    # On-disk cache of extract_code_summary results (None disables it)
+    summary_cache_dir = os.path.expanduser("~/.cache/repo_llm/summaries")
+    # Summaries kept in memory, least recently used dropped first
+    summary_cache_size = 4096
+    # Summary cache file limits: files unused for longer than the age (seconds) are deleted, then the oldest beyond the count
+    summary_cache_max_age = 30 * 24 * 3600
+    summary_cache_max_files = 20000
+    # Response cache limits: rows older than the age (seconds) are dropped, then the oldest beyond the count
+    response_cache_max_age = 7 * 24 * 3600
+    response_cache_max_rows = 20000
+    # Stores between prunes of the response cache
+    response_cache_prune_every = 500
+
+    def __init__(self, token=None, tokens=None,
+                 cache_path=os.path.expanduser("~/.cache/repo_llm/github_responses.sqlite")):
+        """Initialize with optional GitHub API token(s).
+
+        Several tokens (a list, or a comma-separated GITHUB_TOKENS variable) are
+        rotated between requests, so each one's hourly budget adds to the total.
+        Responses are cached on disk by default, at `cache_path` under ~/.cache/repo_llm,
+        and revalidated with ETags, so unchanged resources cost no rate limit. Pass
+        cache_path=None to opt out; the cache stores response bodies (file contents
+        of private repositories included) unencrypted, readable only by the current user.
+        It is pruned to `response_cache_max_age` and `response_cache_max_rows`.
+        """
         self.base_url = "https://api.github.com"
         self.headers = {"Accept": "application/vnd.github.v3+json"}
-        self.token = token
+        # Shared HTTP/2 keep-alive client; concurrent calls multiplex over the same connections
+        self.session = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=30,
+            follow_redirects=True
+        )
+        self._bundles = {} # GraphQL results per (owner, repo) -> (time.monotonic() when fetched, bundle)
+        self._summary_cache = OrderedDict() # extract_code_summary results by content hash, least recently used first
+        self._summary_lock = threading.Lock()
+        self._summary_dir_ready = False # Whether summary_cache_dir was created and pruned by this instance
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._cache_stores = 0
+        if cache_path:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None)
+            if os.path.exists(cache_path):  # Not for ":memory:"
+                os.chmod(cache_path, 0o600)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, etag TEXT, headers TEXT, content BLOB, stored_at REAL)"
+            )
+            self._cache_prune()
         self.github = None # Initialize github attribute
 
-        # Set up authentication
-        if token:
-            self.headers["Authorization"] = f"token {token}"
-            try:
-                self.github = Github(token)
-                self.github.get_user().login # Test connection
-            except Exception as e:
-                print(f"Warning: Failed to initialize PyGithub with token: {e}")
-                self.github = Github() # Fallback to unauthenticated
-        elif os.environ.get("GITHUB_TOKEN"):
-            self.token = os.environ.get("GITHUB_TOKEN")
-            self.headers["Authorization"] = f"token {self.token}"
+        if not tokens:
+            if token:
+                tokens = [token]
+            elif os.environ.get("GITHUB_TOKENS"):
+                tokens = [t.strip() for t in os.environ["GITHUB_TOKENS"].split(",") if t.strip()]
+            elif os.environ.get("GITHUB_TOKEN"):
+                tokens = [os.environ.get("GITHUB_TOKEN")]
+            else:
+                tokens = []
+        self.token = tokens[0] if tokens else None
+
+        # Set up authentication (PyGithub uses the first token)
+        if self.token:
             try:
                 self.github = Github(self.token)
                 self.github.get_user().login # Test connection
@@ -55,25 +329,56 @@ class GitHubRepoInfo:
         else:
             self.github = Github() # Unauthenticated
 
-        # Configure rate limit handling
-        self.rate_limit_remaining = 5000 # Assume higher limit if authenticated
-        self.rate_limit_reset = datetime.now()
+        # Configure rate limit handling, tracked per token (None when unauthenticated)
+        self._tokens = [
+            {"token": t, "remaining": 5000, "reset": datetime.now()} # Assume higher limit if authenticated
+            for t in (tokens or [None])
+        ]
+        self._tokens_lock = threading.Lock()
         # Initialize rate limit info if possible
         if self.github:
             try:
                  rate_limit = self.github.get_rate_limit()
-                 self.rate_limit_remaining = rate_limit.core.remaining
-                 self.rate_limit_reset = datetime.fromtimestamp(rate_limit.core.reset)
+                 self._tokens[0]["remaining"] = rate_limit.core.remaining
+                 self._tokens[0]["reset"] = datetime.fromtimestamp(rate_limit.core.reset)
             except Exception as e:
                  print(f"Warning: Could not get initial rate limit from PyGithub: {e}")
 
+    def _pick_token(self):
+        """Pick the token with the most remaining requests, or the soonest reset if all are nearly spent."""
+        with self._tokens_lock:
+            entry = max(self._tokens, key=lambda t: t["remaining"])
+            if entry["remaining"] <= 10:
+                entry = min(self._tokens, key=lambda t: t["reset"])
+            # Reserve a request now so concurrent callers spread across tokens
+            entry["remaining"] -= 1
+            return entry
+
+    def close(self):
+        """Close the HTTP client, its pooled connections and the response cache."""
+        self.session.close()
+        if self._cache:
+            self._cache.close()
+            self._cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _headers_for(self, entry):
+        """Build request headers authenticated with the given token entry."""
+        if entry["token"]:
+            return {**self.headers, "Authorization": f"token {entry['token']}"}
+        return self.headers
 
     # --- Keep ALL existing methods from the original GitHubRepoInfo class ---
     # ... ( _check_rate_limit, _paginated_get, get_repo_info, get_contributors, ...)
-    def _check_rate_limit(self):
-        """Check API rate limit and wait if necessary."""
-        if self.rate_limit_remaining <= 10:
-            reset_time = self.rate_limit_reset
+    def _check_rate_limit(self, entry):
+        """Check a token's API rate limit and wait if necessary."""
+        if entry["remaining"] <= 10:
+            reset_time = entry["reset"]
             current_time = datetime.now()
 
             if reset_time > current_time:
@@ -81,58 +386,280 @@ class GitHubRepoInfo:
                 print(f"Rate limit nearly exhausted. Waiting {wait_time:.0f} seconds for reset.")
                 time.sleep(wait_time)
 
-        # Update rate limit info after each API call
-        response = requests.get(f"{self.base_url}/rate_limit", headers=self.headers)
+    def _update_limits_from_response(self, response, entry):
+        """Update a token's rate limit info from the `X-RateLimit-*` headers GitHub sends on every response."""
+        # Only track the core REST budget; search and GraphQL report their own buckets
+        if response.headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        with self._tokens_lock:
+            if remaining is not None:
+                entry["remaining"] = int(remaining)
+            if reset is not None:
+                entry["reset"] = datetime.fromtimestamp(int(reset))
+
+    def _is_retryable(self, response, retry_accepted=False):
+        """Whether a response is a transient condition worth retrying."""
+        if response.status_code == 202:
+            return retry_accepted
+        if response.status_code in (429, 502, 503, 504):
+            return True
+        if response.status_code == 403:
+            # Retry secondary/abuse limits and an exhausted token; other 403s are real errors
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                return True
+            message = response.text.lower()
+            return "secondary rate limit" in message or "abuse detection" in message
+        return False
+
+    def _cache_lookup(self, key):
+        """Return the cached (etag, headers, content) row for a request key, if any."""
+        if not self._cache:
+            return None
+        with self._cache_lock:
+            return self._cache.execute(
+                "SELECT etag, headers, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _cache_prune(self):
+        """Drop cached responses past the maximum age, then the oldest beyond the maximum row count."""
+        with self._cache_lock:
+            self._cache.execute(
+                "DELETE FROM responses WHERE stored_at < ?", (time.time() - self.response_cache_max_age,)
+            )
+            self._cache.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT ?)", (self.response_cache_max_rows,)
+            )
+
+    def _cache_store(self, key, response):
+        """Cache a 200 response that carries an ETag."""
+        etag = response.headers.get("ETag")
+        if not self._cache or not etag:
+            return
+        # The stored body is already decoded, so drop the transfer headers describing the wire format
+        headers = [(name, value) for name, value in response.headers.items()
+                   if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        with self._cache_lock:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, headers, content, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, etag, json.dumps(headers), response.content, time.time())
+            )
+            self._cache_stores += 1
+            prune = self._cache_stores % self.response_cache_prune_every == 0
+        if prune:
+            self._cache_prune()
+
+    def _get(self, url, params=None, retry_accepted=False):
+        """GET an API URL with the least-used token, retrying transient failures with exponential backoff.
+
+        Cached responses are revalidated with `If-None-Match`; a 304 (free of rate limit cost)
+        is answered from the cache. With `retry_accepted`, 202 responses (GitHub still
+        computing statistics) are retried too.
+        """
+        key = str(httpx.URL(url, params=params))
+        cached = self._cache_lookup(key)
+
+        for attempt in range(self.max_retries + 1):
+            entry = self._pick_token()
+            self._check_rate_limit(entry)
+            headers = self._headers_for(entry)
+            if cached:
+                headers = {**headers, "If-None-Match": cached[0]}
+            response = self.session.get(url, headers=headers, params=params)
+            self._update_limits_from_response(response, entry)
+
+            if response.status_code == 304 and cached:
+                return httpx.Response(200, headers=json.loads(cached[1]), content=cached[2], request=response.request)
+            if response.status_code == 200:
+                self._cache_store(key, response)
+
+            if attempt == self.max_retries or not self._is_retryable(response, retry_accepted):
+                return response
+
+            retry_after = response.headers.get("Retry-After")
+            delay = int(retry_after) if retry_after else min(32, 2 ** attempt) + random.random()
+            print(f"GitHub returned {response.status_code}, retrying in {delay:.0f} seconds...")
+            time.sleep(delay)
+
+    def _fetch_page(self, url, params, page):
+        """Fetch a single page of a paginated endpoint."""
+        response = self._get(url, {**params, "page": page})
+
         if response.status_code == 200:
-            rate_data = response.json()
-            self.rate_limit_remaining = rate_data["resources"]["core"]["remaining"]
-            self.rate_limit_reset = datetime.fromtimestamp(rate_data["resources"]["core"]["reset"])
+            return orjson.loads(response.content)
+        else:
+            print(f"Error {response.status_code}: {response.text}")
+            return None
+
+    def _last_page(self, response):
+        """Read the last page number from a response's `Link: rel="last"` header."""
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return 1
+        return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
 
     def _paginated_get(self, url, params=None, max_items=None):
-        """Handle paginated API responses with rate limit awareness."""
+        """Handle paginated API responses, fetching pages after the first concurrently."""
         if params is None:
             params = {}
 
-        items = []
-        page = 1
-        per_page = min(100, params.get("per_page", 30))
+        per_page = min(100, params.get("per_page", 100))
         params["per_page"] = per_page
 
-        while True:
-            self._check_rate_limit()
+        params["page"] = 1
+        response = self._get(url, params)
 
-            params["page"] = page
-            response = requests.get(url, headers=self.headers, params=params)
+        if response.status_code != 200:
+            print(f"Error {response.status_code}: {response.text}")
+            return []
 
-            if response.status_code == 200:
-                page_items = response.json()
-                if not page_items:
-                    break
+        items = orjson.loads(response.content)
+        if not items:
+            return []
 
-                items.extend(page_items)
-                page += 1
+        # The first page's Link header tells us how many pages exist, so fetch the rest in parallel
+        last_page = self._last_page(response)
+        if max_items:
+            last_page = min(last_page, -(-max_items // per_page))
+
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+                pages = executor.map(lambda page: self._fetch_page(url, params, page), range(2, last_page + 1))
+                for page_items in pages:
+                    # Stop at the first failed or empty page, as the serial loop did
+                    if not page_items:
+                        break
+                    items.extend(page_items)
+
+        if max_items:
+            return items[:max_items]
+        return items
 
-                # Check if we've reached the requested limit
-                if max_items and len(items) >= max_items:
-                    return items[:max_items]
+    def get_repo_bundle(self, owner, repo):
+        """Get repository info, languages, branches, recent commits and releases in one GraphQL request.
 
-                # Check if we've reached the end (GitHub returns fewer items than requested)
-                if len(page_items) < per_page:
-                    break
-            else:
-                print(f"Error {response.status_code}: {response.text}")
-                break
+        Results are converted to the shapes the REST endpoints return and cached per
+        repository for `bundle_ttl` seconds. Returns None without a token (GraphQL requires
+        authentication) or on error, so callers fall back to REST; errors are not cached.
+        """
+        key = (owner, repo)
+        cached = self._bundles.get(key)
+        if cached and time.monotonic() - cached[0] < self.bundle_ttl:
+            return cached[1]
 
-        return items
+        if not self.token:
+            return None
+
+        response = self.session.post(
+            f"{self.base_url}/graphql",
+            headers=self._headers_for(self._tokens[0]),
+            json={"query": REPO_BUNDLE_QUERY, "variables": {"owner": owner, "name": repo}}
+        )
+
+        if response.status_code != 200:
+            print(f"Error getting repository bundle: {response.status_code}")
+            return None
+
+        payload = orjson.loads(response.content)
+        data = (payload.get("data") or {}).get("repository")
+        if payload.get("errors") or not data:
+            print(f"Error getting repository bundle: {payload.get('errors')}")
+            return None
+
+        repository = {
+            "name": data["name"],
+            "full_name": data["nameWithOwner"],
+            "owner": {
+                "login": data["owner"]["login"],
+                "avatar_url": data["owner"]["avatarUrl"],
+                "type": data["owner"]["__typename"]
+            },
+            "description": data["description"],
+            "html_url": data["url"],
+            "created_at": data["createdAt"],
+            "updated_at": data["updatedAt"],
+            "stargazers_count": data["stargazerCount"],
+            "forks_count": data["forkCount"],
+            # REST counts open pull requests as issues too
+            "open_issues_count": data["openIssues"]["totalCount"] + data["openPullRequests"]["totalCount"],
+            "language": (data["primaryLanguage"] or {}).get("name"),
+            "license": {"name": data["licenseInfo"]["name"]} if data["licenseInfo"] else None,
+            "default_branch": (data["defaultBranchRef"] or {}).get("name"),
+            "topics": [node["topic"]["name"] for node in data["repositoryTopics"]["nodes"]]
+        }
+
+        # GraphQL caps a connection at 100 nodes; None means "incomplete, use REST"
+        languages = None
+        if data["languages"]["totalCount"] <= len(data["languages"]["edges"]):
+            languages = {edge["node"]["name"]: edge["size"] for edge in data["languages"]["edges"]}
+
+        branches = None
+        if data["refs"]["totalCount"] <= len(data["refs"]["nodes"]):
+            branches = [
+                {"name": node["name"], "commit": {"sha": node["target"]["oid"]}}
+                for node in data["refs"]["nodes"]
+            ]
+
+        def git_actor(actor):
+            return {"name": actor["name"], "email": actor["email"], "date": actor["date"]}
+
+        history = (((data["defaultBranchRef"] or {}).get("target") or {}).get("history")
+                   or {"pageInfo": {"hasNextPage": False}, "nodes": []})
+        commits = [
+            {
+                "sha": node["oid"],
+                "html_url": node["url"],
+                "commit": {
+                    "message": node["message"],
+                    "author": git_actor(node["author"]),
+                    "committer": git_actor(node["committer"])
+                },
+                # Like REST, author/committer are only set when the commit is linked to a GitHub account
+                "author": {"login": node["author"]["user"]["login"]} if node["author"]["user"] else None,
+                "committer": {"login": node["committer"]["user"]["login"]} if node["committer"]["user"] else None
+            }
+            for node in history["nodes"]
+        ]
+
+        releases = [
+            {
+                "name": node["name"],
+                "tag_name": node["tagName"],
+                "html_url": node["url"],
+                "created_at": node["createdAt"],
+                "published_at": node["publishedAt"],
+                "draft": node["isDraft"],
+                "prerelease": node["isPrerelease"]
+            }
+            for node in data["releases"]["nodes"]
+        ]
+
+        bundle = {
+            "repository": repository,
+            "languages": languages,
+            "branches": branches,
+            "commits": commits,
+            "more_commits": history["pageInfo"]["hasNextPage"],
+            "releases": releases,
+            "releases_total": data["releases"]["totalCount"]
+        }
+        self._bundles[key] = (time.monotonic(), bundle)
+        return bundle
 
     def get_repo_info(self, owner, repo):
         """Get basic repository information."""
-        self._check_rate_limit()
+        bundle = self.get_repo_bundle(owner, repo)
+        if bundle:
+            return bundle["repository"]
+
         url = f"{self.base_url}/repos/{owner}/{repo}"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url)
 
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             print(f"Error {response.status_code}: {response.text}")
             return None
@@ -145,51 +672,49 @@ class GitHubRepoInfo:
     # ... ( get_languages, get_commits, get_commit_activity, get_code_frequency, ...)
     def get_languages(self, owner, repo):
         """Get languages used in the repository."""
-        self._check_rate_limit()
+        bundle = self.get_repo_bundle(owner, repo)
+        if bundle and bundle["languages"] is not None:
+            return bundle["languages"]
+
         url = f"{self.base_url}/repos/{owner}/{repo}/languages"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url)
 
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             print(f"Error getting languages: {response.status_code}")
             return {}
 
     def get_commits(self, owner, repo, params=None, max_commits=None):
         """Get commits with enhanced filtering and pagination."""
+        # Unfiltered requests the bundle's latest default-branch commits fully cover skip REST
+        bundle = None if params else self.get_repo_bundle(owner, repo)
+        if bundle and (not bundle["more_commits"] or (max_commits is not None and max_commits <= len(bundle["commits"]))):
+            return bundle["commits"][:max_commits]
+
         url = f"{self.base_url}/repos/{owner}/{repo}/commits"
         return self._paginated_get(url, params=params, max_items=max_commits)
 
     def get_commit_activity(self, owner, repo):
         """Get commit activity stats for the past year."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
-        response = requests.get(url, headers=self.headers)
+        # GitHub answers 202 while it computes the statistics; _get retries until they are ready
+        response = self._get(url, retry_accepted=True)
 
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 202:
-            # GitHub is computing the statistics, wait and retry
-            print("GitHub is computing statistics, waiting and retrying...")
-            time.sleep(2)
-            return self.get_commit_activity(owner, repo)
+            return orjson.loads(response.content)
         else:
             print(f"Error getting commit activity: {response.status_code}")
             return []
 
     def get_code_frequency(self, owner, repo):
         """Get weekly code addition and deletion statistics."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/stats/code_frequency"
-        response = requests.get(url, headers=self.headers)
+        # GitHub answers 202 while it computes the statistics; _get retries until they are ready
+        response = self._get(url, retry_accepted=True)
 
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 202:
-            # GitHub is computing the statistics, wait and retry
-            print("GitHub is computing statistics, waiting and retrying...")
-            time.sleep(2)
-            return self.get_code_frequency(owner, repo)
+            return orjson.loads(response.content)
         else:
             print(f"Error getting code frequency: {response.status_code}")
             return []
@@ -197,28 +722,34 @@ class GitHubRepoInfo:
     # ... ( get_contributor_activity, get_branches, get_releases, get_issues, ...)
     def get_contributor_activity(self, owner, repo):
         """Get contributor commit activity over time."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/stats/contributors"
-        response = requests.get(url, headers=self.headers)
+        # GitHub answers 202 while it computes the statistics; _get retries until they are ready
+        response = self._get(url, retry_accepted=True)
 
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 202:
-            # GitHub is computing the statistics, wait and retry
-            print("GitHub is computing statistics, waiting and retrying...")
-            time.sleep(2)
-            return self.get_contributor_activity(owner, repo)
+            return orjson.loads(response.content)
         else:
             print(f"Error getting contributor activity: {response.status_code}")
             return []
 
     def get_branches(self, owner, repo):
         """Get repository branches."""
+        bundle = self.get_repo_bundle(owner, repo)
+        if bundle and bundle["branches"] is not None:
+            return bundle["branches"]
+
         url = f"{self.base_url}/repos/{owner}/{repo}/branches"
         return self._paginated_get(url)
 
     def get_releases(self, owner, repo, max_releases=None):
         """Get repository releases with pagination support."""
+        bundle = self.get_repo_bundle(owner, repo)
+        if bundle:
+            releases = bundle["releases"]
+            # Use the bundle when it holds every release, or at least as many as requested
+            if bundle["releases_total"] <= len(releases) or (max_releases and max_releases <= len(releases)):
+                return releases[:max_releases] if max_releases else releases
+
         url = f"{self.base_url}/repos/{owner}/{repo}/releases"
         return self._paginated_get(url, max_items=max_releases)
 
@@ -231,6 +762,15 @@ class GitHubRepoInfo:
         return self._paginated_get(url, params=params, max_items=max_issues)
 
     # ... ( get_issue_timeline, get_pull_requests, get_pr_timeline, get_contents, ...)
+    def _daily_counts(self, timestamps, date_range):
+        """Count timestamps per calendar day of date_range, keyed by 'YYYY-MM-DD'."""
+        # Bin into a dense array indexed by day offset; only the returned dict uses date strings
+        start_day = date_range[0].normalize().to_datetime64().astype('datetime64[D]')
+        offsets = (timestamps.to_numpy().astype('datetime64[D]') - start_day).astype(np.int64)
+        in_range = (offsets >= 0) & (offsets < len(date_range))
+        counts = np.bincount(offsets[in_range], minlength=len(date_range))
+        return dict(zip(date_range.strftime('%Y-%m-%d'), counts.tolist()))
+
     def get_issue_timeline(self, owner, repo, days_back=180):
         """Analyze issue creation and closing over time."""
         # Get issues including closed ones
@@ -239,37 +779,24 @@ class GitHubRepoInfo:
         # Prepare timeline data
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
-
-        # Initialize daily counters
         date_range = pd.date_range(start=start_date, end=end_date)
-        created_counts = {d.strftime('%Y-%m-%d'): 0 for d in date_range}
-        closed_counts = {d.strftime('%Y-%m-%d'): 0 for d in date_range}
 
-        # Collect issue creation and closing dates
-        for issue in issues:
-            created_at = datetime.strptime(issue['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-            if created_at >= start_date:
-                created_counts[created_at.strftime('%Y-%m-%d')] += 1
+        # Parse all issue dates at once rather than per row
+        df = pd.DataFrame(issues, columns=['created_at', 'closed_at', 'state'])
+        created_at = pd.to_datetime(df['created_at'], format='%Y-%m-%dT%H:%M:%SZ')
+        closed_at = pd.to_datetime(df['closed_at'].where(df['state'] == 'closed'), format='%Y-%m-%dT%H:%M:%SZ')
 
-            if issue['state'] == 'closed' and issue.get('closed_at'):
-                closed_at = datetime.strptime(issue['closed_at'], '%Y-%m-%dT%H:%M:%SZ')
-                if closed_at >= start_date:
-                    closed_counts[closed_at.strftime('%Y-%m-%d')] += 1
+        # Daily counters of issue creation and closing
+        created_counts = self._daily_counts(created_at[created_at >= start_date], date_range)
+        closed_counts = self._daily_counts(closed_at[closed_at >= start_date], date_range)
 
         # Calculate resolution times for closed issues
-        resolution_times = []
-        for issue in issues:
-            if issue['state'] == 'closed' and issue.get('closed_at'):
-                created_at = datetime.strptime(issue['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-                closed_at = datetime.strptime(issue['closed_at'], '%Y-%m-%dT%H:%M:%SZ')
-                resolution_time = (closed_at - created_at).total_seconds() / 3600  # hours
-                resolution_times.append(resolution_time)
+        resolution_times = ((closed_at - created_at).dt.total_seconds() / 3600).dropna().tolist()  # hours
 
         # Calculate issue labels distribution
-        label_counts = defaultdict(int)
-        for issue in issues:
-            for label in issue.get('labels', []):
-                label_counts[label['name']] += 1
+        label_counts = Counter(chain.from_iterable(
+            (label['name'] for label in issue.get('labels', ())) for issue in issues
+        ))
 
         return {
             'created': created_counts,
@@ -286,59 +813,92 @@ class GitHubRepoInfo:
         params["state"] = state
         return self._paginated_get(url, params=params, max_items=max_prs)
 
+    def get_pr_timeline_items(self, owner, repo, since):
+        """Get the pull requests updated since a date, with only the fields timelines need.
+
+        Uses a GraphQL cursor loop (which also returns additions/deletions, absent from the
+        REST list) and stops at the first page older than `since`. Returns None without a
+        token or on error, so callers can fall back to REST.
+        """
+        if not self.token:
+            return None
+
+        since = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        prs = []
+        cursor = None
+
+        while True:
+            response = self.session.post(
+                f"{self.base_url}/graphql",
+                headers=self._headers_for(self._tokens[0]),
+                json={"query": PR_TIMELINE_QUERY, "variables": {"owner": owner, "name": repo, "cursor": cursor}}
+            )
+            payload = orjson.loads(response.content) if response.status_code == 200 else {}
+            connection = ((payload.get("data") or {}).get("repository") or {}).get("pullRequests")
+            if payload.get("errors") or not connection:
+                print(f"Error getting pull request timeline: {response.status_code} {payload.get('errors')}")
+                return None
+
+            for node in connection["nodes"]:
+                # Ordered by last update, so nothing after this can fall inside the window
+                if node["updatedAt"] < since:
+                    return prs
+                prs.append({
+                    "state": "open" if node["state"] == "OPEN" else "closed",
+                    "created_at": node["createdAt"],
+                    "closed_at": node["closedAt"],
+                    "merged_at": node["mergedAt"],
+                    "additions": node["additions"],
+                    "deletions": node["deletions"],
+                    "changed_files": node["changedFiles"]
+                })
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                return prs
+            cursor = connection["pageInfo"]["endCursor"]
+
     def get_pr_timeline(self, owner, repo, days_back=180):
         """Analyze PR creation, closing, and metrics over time."""
-        # Get PRs including closed and merged ones
-        prs = self.get_pull_requests(owner, repo, state="all")
-
         # Prepare timeline data
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
 
-        # Initialize daily counters
+        # Get PRs including closed and merged ones; a day of slack covers local vs UTC timestamps
+        prs = self.get_pr_timeline_items(owner, repo, since=start_date - timedelta(days=1))
+        if prs is None:
+            prs = self.get_pull_requests(owner, repo, state="all")
         date_range = pd.date_range(start=start_date, end=end_date)
-        created_counts = {d.strftime('%Y-%m-%d'): 0 for d in date_range}
-        closed_counts = {d.strftime('%Y-%m-%d'): 0 for d in date_range}
-        merged_counts = {d.strftime('%Y-%m-%d'): 0 for d in date_range}
-
-        # Track metrics
-        merge_times = []
-        pr_sizes = []
-
-        # Collect PR data
-        for pr in prs:
-            created_at = datetime.strptime(pr['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-            if created_at >= start_date:
-                created_counts[created_at.strftime('%Y-%m-%d')] += 1
-
-                # Get PR size (additions + deletions)
-                if pr.get('additions') is not None and pr.get('deletions') is not None:
-                    pr_sizes.append({
-                        'additions': pr['additions'],
-                        'deletions': pr['deletions'],
-                        'total': pr['additions'] + pr['deletions'],
-                        'files_changed': pr.get('changed_files', 0)
-                    })
 
-            # Check if PR is closed
-            if pr['state'] == 'closed':
-                closed_at = datetime.strptime(pr['closed_at'], '%Y-%m-%dT%H:%M:%SZ')
-                if closed_at >= start_date:
-                    closed_counts[closed_at.strftime('%Y-%m-%d')] += 1
-
-                    # Check if PR was merged
-                    if pr['merged_at']:
-                        merged_at = datetime.strptime(pr['merged_at'], '%Y-%m-%dT%H:%M:%SZ')
-                        if merged_at >= start_date:
-                            merged_counts[merged_at.strftime('%Y-%m-%d')] += 1
-
-                            # Calculate time to merge
-                            merge_time = (merged_at - created_at).total_seconds() / 3600  # hours
-                            merge_times.append(merge_time)
-
-        # Calculate acceptance rate
-        total_closed = sum(closed_counts.values())
-        total_merged = sum(merged_counts.values())
+        # Parse all PR dates at once rather than per row
+        df = pd.DataFrame(prs, columns=['created_at', 'closed_at', 'merged_at', 'state',
+                                        'additions', 'deletions', 'changed_files'])
+        created_at = pd.to_datetime(df['created_at'], format='%Y-%m-%dT%H:%M:%SZ')
+        closed_at = pd.to_datetime(df['closed_at'].where(df['state'] == 'closed'), format='%Y-%m-%dT%H:%M:%SZ')
+        recently_closed = closed_at >= start_date
+        # Merges only count for PRs closed within the window
+        merged_at = pd.to_datetime(df['merged_at'].where(recently_closed), format='%Y-%m-%dT%H:%M:%SZ')
+        recently_merged = merged_at >= start_date
+
+        # Daily counters of PR creation, closing and merging
+        created_counts = self._daily_counts(created_at[created_at >= start_date], date_range)
+        closed_counts = self._daily_counts(closed_at[recently_closed], date_range)
+        merged_counts = self._daily_counts(merged_at[recently_merged], date_range)
+
+        # Calculate time to merge
+        merge_times = ((merged_at - created_at)[recently_merged].dt.total_seconds() / 3600).tolist()  # hours
+
+        # Get PR size (additions + deletions) where the API reported it
+        sized = df[(created_at >= start_date) & df['additions'].notna() & df['deletions'].notna()]
+        pr_sizes = pd.DataFrame({
+            'additions': sized['additions'],
+            'deletions': sized['deletions'],
+            'total': sized['additions'] + sized['deletions'],
+            'files_changed': sized['changed_files'].fillna(0)
+        }).astype(int).to_dict('records')
+
+        # Calculate acceptance rate straight from the window masks
+        total_closed = int(recently_closed.sum())
+        total_merged = int(recently_merged.sum())
         acceptance_rate = (total_merged / total_closed) * 100 if total_closed > 0 else 0
 
         return {
@@ -352,32 +912,30 @@ class GitHubRepoInfo:
 
     def get_contents(self, owner, repo, path="", ref=None):
         """Get repository contents at the specified path."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
         params = {}
         if ref:
             params["ref"] = ref
 
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, params)
 
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             # print(f"Error getting contents: {response.status_code}")
             return []
     # ... ( get_readme, get_file_content, is_text_file, get_recursive_contents, ...)
     def get_readme(self, owner, repo, ref=None):
         """Get repository README file."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/readme"
         params = {}
         if ref:
             params["ref"] = ref
 
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, params)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("content"):
                 content = base64.b64decode(data["content"]).decode("utf-8")
                 return {
@@ -392,17 +950,23 @@ class GitHubRepoInfo:
 
     def get_file_content(self, owner, repo, path, ref=None):
         """Get the content of a specific file in the repository."""
-        self._check_rate_limit()
         url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
         params = {}
         if ref:
             params["ref"] = ref
 
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, params)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("content"):
+                # Unless the extension says text, sniff a small decoded prefix for NUL bytes
+                # before decoding the whole blob (GitHub wraps base64 lines, so drop the
+                # newlines and keep whole 4-character groups)
+                if not self.is_text_file(data["name"]):
+                    prefix = data["content"][:8192].replace("\n", "")
+                    if b"\x00" in base64.b64decode(prefix[:len(prefix) // 4 * 4]):
+                        return "[Binary file content not displayed]"
                 try:
                     content = base64.b64decode(data["content"]).decode("utf-8")
                     return content
@@ -415,86 +979,92 @@ class GitHubRepoInfo:
 
     def is_text_file(self, file_path):
         """Determine if a file is likely a text file based on extension."""
-        text_extensions = [
-            '.txt', '.md', '.rst', '.py', '.js', '.html', '.css', '.java', '.c',
-            '.cpp', '.h', '.hpp', '.json', '.xml', '.yaml', '.yml', '.toml',
-            '.ini', '.cfg', '.conf', '.sh', '.bat', '.ps1', '.rb', '.pl', '.php',
-            '.go', '.rs', '.ts', '.jsx', '.tsx', '.vue', '.swift', '.kt', '.scala',
-            '.groovy', '.lua', '.r', '.dart', '.ex', '.exs', '.erl', '.hrl',
-            '.clj', '.hs', '.elm', '.f90', '.f95', '.f03', '.sql', '.gitignore',
-            '.dockerignore', '.env', '.editorconfig', '.htaccess', '.cs', '.ipynb',
-            '.R', '.Rmd', '.jl', '.fs', '.ml', '.mli', '.d', '.scm', '.lisp',
-            '.el', '.m', '.mm', '.vb', '.asm', '.s', '.Dockerfile', '.gradle'
-        ]
-
-        extension = os.path.splitext(file_path)[1].lower()
-        return extension in text_extensions
+        name = os.path.basename(file_path)
+        return os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS or name in TEXT_FILENAMES
 
     def get_recursive_contents(self, owner, repo, path="", max_depth=3, current_depth=0, max_files=1000, ref=None):
         """Recursively get repository contents with a depth limit and file count limit."""
         if current_depth >= max_depth:
             return []
 
-        contents = self.get_contents(owner, repo, path, ref)
         results = []
-        file_count = 0
-
-        for item in contents:
-            if file_count >= max_files:
-                break
-
-            if item["type"] == "dir":
-                # For directories, add the directory itself and recursively get contents
-                dir_item = {
-                    "type": "dir",
-                    "name": item["name"],
-                    "path": item["path"],
-                    "contents": self.get_recursive_contents(
-                        owner, repo, item["path"], max_depth, current_depth + 1,
-                        max_files - file_count, ref
-                    )
-                }
-                results.append(dir_item)
-            else:
-                # For files, add the file info
-                results.append({
-                    "type": "file",
-                    "name": item["name"],
-                    "path": item["path"],
-                    "size": item["size"],
-                    "url": item["html_url"]
-                })
-                file_count += 1
+        # Walk one depth level at a time, listing every directory of a level concurrently.
+        # Each pending entry is (path, depth, file budget, list to fill with its items).
+        level = [(path, current_depth, max_files, results)]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            while level:
+                listings = executor.map(lambda entry: self.get_contents(owner, repo, entry[0], ref), level)
+                next_level = []
+
+                for (_, depth, budget, items), contents in zip(level, listings):
+                    file_count = 0
+
+                    for item in contents:
+                        if file_count >= budget:
+                            break
+
+                        if item["type"] == "dir":
+                            # For directories, add the directory itself and queue its contents
+                            dir_item = {
+                                "type": "dir",
+                                "name": item["name"],
+                                "path": item["path"],
+                                "contents": []
+                            }
+                            items.append(dir_item)
+                            if depth + 1 < max_depth:
+                                next_level.append((item["path"], depth + 1, budget - file_count, dir_item["contents"]))
+                        else:
+                            # For files, add the file info
+                            items.append({
+                                "type": "file",
+                                "name": item["name"],
+                                "path": item["path"],
+                                "size": item["size"],
+                                "url": item["html_url"]
+                            })
+                            file_count += 1
+
+                level = next_level
 
         return results
     # ... ( get_all_text_files, get_documentation_files, analyze_ast, analyze_js_ts, ...)
     def get_all_text_files(self, owner, repo, path="", max_files=50, ref=None):
         """Get content of all text files in the repository (with limit)."""
-        contents = self.get_contents(owner, repo, path, ref)
         text_files = []
-        file_count = 0
-
-        # Process current directory
-        for item in contents:
-            if file_count >= max_files:
-                break
-
-            if item["type"] == "file" and self.is_text_file(item["name"]):
-                content = self.get_file_content(owner, repo, item["path"], ref)
-                if content and content != "[Binary file content not displayed]":
-                    text_files.append({
-                        "name": item["name"],
-                        "path": item["path"],
-                        "content": content
-                    })
-                    file_count += 1
-            elif item["type"] == "dir":
-                # Recursively get text files from subdirectories
-                subdir_files = self.get_all_text_files(
-                    owner, repo, item["path"], max_files - file_count, ref
-                )
-                text_files.extend(subdir_files)
-                file_count += len(subdir_files)
+        dirs = [path]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            # Breadth-first: list a whole level concurrently, then fetch its text files concurrently
+            while dirs and len(text_files) < max_files:
+                listings = executor.map(lambda dir_path: self.get_contents(owner, repo, dir_path, ref), dirs)
+                candidates = []
+                dirs = []
+
+                for contents in listings:
+                    for item in contents:
+                        if item["type"] == "file" and self.is_text_file(item["name"]):
+                            candidates.append(item)
+                        elif item["type"] == "dir":
+                            dirs.append(item["path"])
+
+                # Fetch in batches so we stop early once the file budget is spent
+                for start in range(0, len(candidates), self.max_concurrent_requests):
+                    if len(text_files) >= max_files:
+                        break
+
+                    batch = candidates[start:start + self.max_concurrent_requests]
+                    bodies = executor.map(lambda item: self.get_file_content(owner, repo, item["path"], ref), batch)
+
+                    for item, content in zip(batch, bodies):
+                        if content and content != "[Binary file content not displayed]" and len(text_files) < max_files:
+                            text_files.append({
+                                "name": item["name"],
+                                "path": item["path"],
+                                "extension": os.path.splitext(item["name"])[1].lower(),
+                                "content": content
+                            })
 
         return text_files
 
@@ -508,36 +1078,41 @@ class GitHubRepoInfo:
             ".github/ISSUE_TEMPLATE", ".github/PULL_REQUEST_TEMPLATE.md"
         ]
 
-        doc_files = []
+        # Probe every documentation path concurrently; results keep doc_paths order
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            found = executor.map(lambda path: self._get_documentation_path(owner, repo, path, ref), doc_paths)
+            return [doc for docs in found for doc in docs]
 
-        # Try to get each documentation file/directory
-        for path in doc_paths:
-            try:
-                contents = self.get_contents(owner, repo, path, ref)
+    def _get_documentation_path(self, owner, repo, path, ref=None):
+        """Get documentation files from a single file or directory path."""
+        doc_files = []
 
-                # If it's a directory, get all markdown files in it
-                if isinstance(contents, list):
-                    for item in contents:
-                        if item["type"] == "file" and item["name"].lower().endswith((".md", ".rst", ".txt")):
-                            content = self.get_file_content(owner, repo, item["path"], ref)
-                            if content:
-                                doc_files.append({
-                                    "name": item["name"],
-                                    "path": item["path"],
-                                    "content": content
-                                })
-                # If it's a file, get its content
-                elif isinstance(contents, dict) and contents.get("type") == "file":
-                    content = self.get_file_content(owner, repo, path, ref)
-                    if content:
-                        doc_files.append({
-                            "name": contents["name"],
-                            "path": contents["path"],
-                            "content": content
-                        })
-            except:
-                # Path doesn't exist or access issues
-                continue
+        try:
+            contents = self.get_contents(owner, repo, path, ref)
+
+            # If it's a directory, get all markdown files in it
+            if isinstance(contents, list):
+                for item in contents:
+                    if item["type"] == "file" and item["name"].lower().endswith((".md", ".rst", ".txt")):
+                        content = self.get_file_content(owner, repo, item["path"], ref)
+                        if content:
+                            doc_files.append({
+                                "name": item["name"],
+                                "path": item["path"],
+                                "content": content
+                            })
+            # If it's a file, get its content
+            elif isinstance(contents, dict) and contents.get("type") == "file":
+                content = self.get_file_content(owner, repo, path, ref)
+                if content:
+                    doc_files.append({
+                        "name": contents["name"],
+                        "path": contents["path"],
+                        "content": content
+                    })
+        except:
+            # Path doesn't exist or access issues
+            pass
 
         return doc_files
 
@@ -547,101 +1122,7 @@ class GitHubRepoInfo:
             return None
 
         try:
-            tree = ast.parse(code)
-
-            # Extract more detailed information using AST
-            functions = []
-            classes = []
-            imports = []
-            function_complexities = {}
-
-            for node in ast.walk(tree):
-                # Get function definitions with arguments
-                if isinstance(node, ast.FunctionDef):
-                    args = []
-                    defaults = len(node.args.defaults)
-                    args_count = len(node.args.args) - defaults
-
-                    # Get positional args
-                    for arg in node.args.args[:args_count]:
-                        if hasattr(arg, 'arg'):  # Python 3
-                            args.append(arg.arg)
-                        else:  # Python 2
-                            args.append(arg.id)
-
-                    # Get args with defaults
-                    for i, arg in enumerate(node.args.args[args_count:]):
-                        if hasattr(arg, 'arg'):  # Python 3
-                            args.append(f"{arg.arg}=...")
-                        else:  # Python 2
-                            args.append(f"{arg.id}=...")
-
-                    # Calculate function complexity
-                    func_complexity = complexity.cc_visit(node)
-                    function_complexities[node.name] = func_complexity
-
-                    # Get docstring if available
-                    docstring = ast.get_docstring(node)
-
-                    functions.append({
-                        'name': node.name,
-                        'args': args,
-                        'complexity': func_complexity,
-                        'docstring': docstring
-                    })
-
-                # Get class definitions
-                elif isinstance(node, ast.ClassDef):
-                    methods = []
-                    class_docstring = ast.get_docstring(node)
-
-                    # Get class methods
-                    for child in node.body:
-                        if isinstance(child, ast.FunctionDef):
-                            method_complexity = complexity.cc_visit(child)
-                            method_docstring = ast.get_docstring(child)
-
-                            methods.append({
-                                'name': child.name,
-                                'complexity': method_complexity,
-                                'docstring': method_docstring
-                            })
-
-                    classes.append({
-                        'name': node.name,
-                        'methods': methods,
-                        'docstring': class_docstring
-                    })
-
-                # Get imports
-                elif isinstance(node, ast.Import):
-                    for name in node.names:
-                        imports.append(name.name)
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for name in node.names:
-                        imports.append(f"{module}.{name.name}")
-
-            # Calculate overall code complexity
-            code_complexity = complexity.cc_visit_ast(tree)
-
-            # Calculate maintainability index
-            try:
-                mi_score = metrics.mi_visit(code, True)
-            except:
-                mi_score = None
-
-            return {
-                'functions': functions,
-                'classes': classes,
-                'imports': imports,
-                'complexity': {
-                    'overall': code_complexity,
-                    'functions': function_complexities,
-                    'maintainability_index': mi_score
-                }
-            }
-
+            return self._analyze_python_source(code)
         except SyntaxError:
             print(f"Syntax error in Python file: {file_path}")
             return None
@@ -649,6 +1130,129 @@ class GitHubRepoInfo:
             print(f"Error analyzing {file_path}: {str(e)}")
             return None
 
+    @staticmethod
+    def _analyze_python_source(code):
+        """Parse Python source once and extract its definitions and metrics.
+
+        Repeat files are served by extract_code_summary's content-hash cache, not here.
+        """
+        tree = ast.parse(code)
+
+        # One complexity pass over the whole tree; functions and methods look their block up by position
+        visitor = complexity.ComplexityVisitor.from_ast(tree)
+        blocks = {}
+        pending = list(visitor.blocks)
+        while pending:
+            block = pending.pop()
+            blocks[(block.lineno, block.name)] = block
+            pending.extend(getattr(block, 'closures', []))
+            pending.extend(getattr(block, 'methods', []))
+            pending.extend(getattr(block, 'inner_classes', []))
+
+        def block_complexity(node):
+            block = blocks.get((node.lineno, node.name))
+            return [block] if block else complexity.cc_visit(node)
+
+        # Extract more detailed information using AST
+        functions = []
+        classes = []
+        imports = []
+        function_complexities = {}
+
+        # Breadth-first like ast.walk, but only through statement bodies: functions, classes
+        # and imports are statements, so expression subtrees never need visiting
+        pending = deque(tree.body)
+        while pending:
+            node = pending.popleft()
+            pending.extend(chain.from_iterable(getattr(node, field, ()) for field in STATEMENT_FIELDS))
+
+            # Get function definitions with arguments
+            if isinstance(node, ast.FunctionDef):
+                args = []
+                defaults = len(node.args.defaults)
+                args_count = len(node.args.args) - defaults
+
+                # Get positional args
+                for arg in node.args.args[:args_count]:
+                    if hasattr(arg, 'arg'):  # Python 3
+                        args.append(arg.arg)
+                    else:  # Python 2
+                        args.append(arg.id)
+
+                # Get args with defaults
+                for i, arg in enumerate(node.args.args[args_count:]):
+                    if hasattr(arg, 'arg'):  # Python 3
+                        args.append(f"{arg.arg}=...")
+                    else:  # Python 2
+                        args.append(f"{arg.id}=...")
+
+                # Calculate function complexity
+                func_complexity = block_complexity(node)
+                function_complexities[node.name] = func_complexity
+
+                # Get docstring if available
+                docstring = ast.get_docstring(node)
+
+                functions.append({
+                    'name': node.name,
+                    'args': args,
+                    'complexity': func_complexity,
+                    'docstring': docstring
+                })
+
+            # Get class definitions
+            elif isinstance(node, ast.ClassDef):
+                methods = []
+                class_docstring = ast.get_docstring(node)
+
+                # Get class methods
+                for child in node.body:
+                    if isinstance(child, ast.FunctionDef):
+                        method_complexity = block_complexity(child)
+                        method_docstring = ast.get_docstring(child)
+
+                        methods.append({
+                            'name': child.name,
+                            'complexity': method_complexity,
+                            'docstring': method_docstring
+                        })
+
+                classes.append({
+                    'name': node.name,
+                    'methods': methods,
+                    'docstring': class_docstring
+                })
+
+            # Get imports
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                prefix = f"{node.module or ''}." if isinstance(node, ast.ImportFrom) else ""
+                imports.extend(prefix + name.name for name in node.names)
+
+        # Calculate overall code complexity
+        code_complexity = visitor.blocks
+
+        # Calculate maintainability index from the parsed tree (as metrics.mi_visit(code, True) would)
+        try:
+            raw_metrics = raw.analyze(code)
+            comment_lines = raw_metrics.comments + raw_metrics.multi
+            comments = comment_lines / float(raw_metrics.sloc) * 100 if raw_metrics.sloc != 0 else 0
+            mi_score = metrics.mi_compute(metrics.h_visit_ast(tree).total.volume,
+                                          visitor.total_complexity, raw_metrics.lloc, comments)
+        except:
+            mi_score = None
+
+        return {
+            'docstring': ast.get_docstring(tree),
+            'functions': functions,
+            'classes': classes,
+            'imports': imports,
+            'complexity': {
+                'overall': code_complexity,
+                'functions': function_complexities,
+                'maintainability_index': mi_score
+            }
+        }
+
     def analyze_js_ts(self, code, file_path):
         """Analyze JavaScript/TypeScript code using regex with improved patterns."""
         if not file_path.endswith(('.js', '.ts', '.jsx', '.tsx')):
@@ -663,20 +1267,18 @@ class GitHubRepoInfo:
             'hooks': []  # For React hooks
         }
 
-        # Function patterns (covering various declaration styles)
-        function_patterns = [
-            # Regular functions
-            r'function\s+(\w+)\s*\(([^)]*)\)',
-            # Arrow functions assigned to variables
-            r'(?:const|let|var)\s+(\w+)\s*=\s*(?:\([^)]*\)|[^=]*)\s*=>\s*{',
-            # Class methods
-            r'(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*{',
-            # Object methods
-            r'(\w+)\s*:\s*function\s*\(([^)]*)\)'
-        ]
+        grammar = JS_TS_GRAMMARS.get(os.path.splitext(file_path)[1])
+        if grammar:
+            try:
+                return self._analyze_js_ts_tree(code, file_path, grammar)
+            except Exception as e:
+                print(f"Tree-sitter failed on {file_path}, falling back to regex: {str(e)}")
 
-        for pattern in function_patterns:
-            for match in re.finditer(pattern, code):
+        # Function patterns (covering various declaration styles); they overlap, so each gets its own scan
+        for literal, pattern in JS_FUNCTION_PATTERNS:
+            if literal not in code:
+                continue
+            for match in pattern.finditer(code):
                 func_name = match.group(1)
                 args = match.group(2).strip() if len(match.groups()) > 1 else ""
                 results['functions'].append({
@@ -685,16 +1287,14 @@ class GitHubRepoInfo:
                 })
 
         # Class pattern
-        class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*{([^}]*)}'
-        for match in re.finditer(class_pattern, code, re.DOTALL):
+        for match in JS_CLASS_PATTERN.finditer(code) if 'class' in code else ():
             class_name = match.group(1)
             parent_class = match.group(2) if match.group(2) else None
             class_body = match.group(3)
 
             # Find methods in class
             methods = []
-            method_pattern = r'(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*{([^}]*)}'
-            for method_match in re.finditer(method_pattern, class_body):
+            for method_match in JS_METHOD_PATTERN.finditer(class_body):
                 method_name = method_match.group(1)
                 methods.append(method_name)
 
@@ -704,54 +1304,227 @@ class GitHubRepoInfo:
                 'methods': methods
             })
 
-        # Import patterns
-        import_patterns = [
-            # ES6 imports
-            r'import\s+(?:{([^}]*)}|\*\s+as\s+(\w+)|(\w+))\s+from\s+[\'"]([^\'"]+)[\'"]',
-            # CommonJS requires
-            r'(?:const|let|var)\s+(?:{([^}]*)}|(\w+))\s*=\s*require\([\'"]([^\'"]+)[\'"]\)'
-        ]
-
-        for pattern in import_patterns:
-            for match in re.finditer(pattern, code):
-                groups = match.groups()
-                if groups[0]:  # Destructured import
-                    imports = [name.strip() for name in groups[0].split(',')]
-                    for imp in imports:
-                        results['imports'].append(imp)
-                elif groups[1]:  # Namespace import (import * as X)
-                    results['imports'].append(groups[1])
-                elif groups[2]:  # Default import
-                    results['imports'].append(groups[2])
-                elif groups[3]:  # Module name
-                    results['imports'].append(groups[3])
+        # Imports: one scan for both styles, keeping ES6 imports ahead of CommonJS requires
+        es6_imports = []
+        commonjs_imports = []
+        for match in JS_IMPORT_PATTERN.finditer(code) if 'import' in code or 'require' in code else ():
+            if match.lastgroup == 'es6':
+                if match.group('es6_names'):  # Destructured import
+                    es6_imports.extend(name.strip() for name in match.group('es6_names').split(','))
+                elif match.group('es6_namespace'):  # Namespace import (import * as X)
+                    es6_imports.append(match.group('es6_namespace'))
+                elif match.group('es6_default'):  # Default import
+                    es6_imports.append(match.group('es6_default'))
+            else:
+                if match.group('cjs_names'):  # Destructured require
+                    commonjs_imports.extend(name.strip() for name in match.group('cjs_names').split(','))
+                elif match.group('cjs_default'):
+                    commonjs_imports.append(match.group('cjs_default'))
+        results['imports'] = es6_imports + commonjs_imports
 
         # React hooks detection (for React files)
-        if file_path.endswith(('.jsx', '.tsx')):
-            hook_pattern = r'use([A-Z]\w+)\s*\('
-            for match in re.finditer(hook_pattern, code):
+        if file_path.endswith(('.jsx', '.tsx')) and 'use' in code:
+            for match in JS_HOOK_PATTERN.finditer(code):
                 hook_name = 'use' + match.group(1)
                 results['hooks'].append(hook_name)
 
-        # Export patterns
-        export_patterns = [
-            # Named exports
-            r'export\s+(?:const|let|var|function|class)\s+(\w+)',
-            # Default exports
-            r'export\s+default\s+(?:function|class)?\s*(\w+)?'
-        ]
+        # Exports: one scan for both styles, keeping named exports ahead of default exports
+        named_exports = []
+        default_exports = []
+        for match in JS_EXPORT_PATTERN.finditer(code) if 'export' in code else ():
+            if match.group('named'):
+                named_exports.append(match.group('named'))
+            elif match.group('default'):
+                default_exports.append(match.group('default'))
+        results['exports'] = named_exports + default_exports
+
+        return results
+
+    def _analyze_js_ts_tree(self, code, file_path, grammar):
+        """Analyze JavaScript/TypeScript code from a tree-sitter syntax tree."""
+        parser, query = js_ts_parser(grammar)
+        tree = parser.parse(code.encode('utf-8'))
+
+        def text(node):
+            return node.text.decode('utf-8', 'replace') if node else ""
+
+        def params(node):
+            # Parenthesized parameter list, or the bare parameter of `x => ...`
+            found = node.child_by_field_name('parameters') or node.child_by_field_name('parameter')
+            return text(found).strip('()').strip()
+
+        results = {
+            'functions': [],
+            'classes': [],
+            'imports': [],
+            'exports': [],
+            'hooks': []  # For React hooks
+        }
+        es6_imports = []
+        commonjs_imports = []
+
+        for node, capture in query.captures(tree.root_node):
+            if capture == 'function':
+                # Declarations and methods carry their own parameters; assignments and pairs hold a function value
+                value = node.child_by_field_name('value') or node
+                name = node.child_by_field_name('name') or node.child_by_field_name('key')
+                results['functions'].append({
+                    'name': text(name),
+                    'args': params(value)
+                })
 
-        for pattern in export_patterns:
-            for match in re.finditer(pattern, code):
-                if match.group(1):
-                    results['exports'].append(match.group(1))
+            elif capture == 'class':
+                parent_class = None
+                for child in node.children:
+                    if child.type == 'class_heritage' and child.named_children:
+                        heritage = child.named_children[0]
+                        if heritage.type == 'extends_clause':  # TypeScript wraps the parent class
+                            heritage = heritage.child_by_field_name('value') or heritage.named_children[0]
+                        if heritage.type != 'implements_clause':
+                            parent_class = text(heritage)
+
+                body = node.child_by_field_name('body')
+                results['classes'].append({
+                    'name': text(node.child_by_field_name('name')),
+                    'extends': parent_class,
+                    'methods': [text(member.child_by_field_name('name')) for member in body.named_children
+                                if member.type == 'method_definition'] if body else []
+                })
 
+            elif capture == 'import':
+                for clause in node.named_children:
+                    if clause.type != 'import_clause':
+                        continue
+                    for part in clause.named_children:
+                        if part.type == 'named_imports':  # Destructured import
+                            es6_imports.extend(text(spec) for spec in part.named_children
+                                               if spec.type == 'import_specifier')
+                        elif part.type == 'namespace_import':  # Namespace import (import * as X)
+                            es6_imports.extend(text(name) for name in part.named_children)
+                        else:  # Default import
+                            es6_imports.append(text(part))
+
+            elif capture == 'require':
+                target = node.child_by_field_name('name')
+                if target.type == 'object_pattern':  # Destructured require
+                    commonjs_imports.extend(text(prop) for prop in target.named_children)
+                else:
+                    commonjs_imports.append(text(target))
+
+            elif capture == 'export':
+                declaration = node.child_by_field_name('declaration')
+                value = node.child_by_field_name('value')
+                if declaration is not None:
+                    if declaration.type in ('lexical_declaration', 'variable_declaration'):
+                        results['exports'].extend(text(declarator.child_by_field_name('name'))
+                                                  for declarator in declaration.named_children
+                                                  if declarator.type == 'variable_declarator')
+                    elif declaration.child_by_field_name('name'):
+                        results['exports'].append(text(declaration.child_by_field_name('name')))
+                elif value is not None:
+                    # Default export: an identifier, or a named function/class
+                    name = value if value.type == 'identifier' else value.child_by_field_name('name')
+                    if name:
+                        results['exports'].append(text(name))
+
+            elif capture == 'hook' and file_path.endswith(('.jsx', '.tsx')):
+                results['hooks'].append(text(node))
+
+        results['imports'] = es6_imports + commonjs_imports
         return results
     # ... ( extract_code_summary, analyze_dependencies, create_dependency_graph, ...)
     def extract_code_summary(self, file_content, file_path):
-        """Extract comprehensive summary information from code files."""
+        """Extract comprehensive summary information from code files.
+
+        Summaries are cached in memory (LRU) and on disk, keyed by a hash of the content and
+        extension, so repeated calls and re-runs skip parsing unchanged files.
+        """
         extension = os.path.splitext(file_path)[1].lower()
+        key = hashlib.sha256(f"{SUMMARY_CACHE_VERSION}:{sys.version_info[:2]}:{extension}:".encode()
+                             + file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        with self._summary_lock:
+            if key in self._summary_cache:
+                self._summary_cache.move_to_end(key)
+                return self._summary_cache[key]
+
+        cache_file = os.path.join(self.summary_cache_dir, f"{key}.pkl") if self.summary_cache_dir else None
+        if cache_file and self._prepare_summary_cache_dir() and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    summary = pickle.load(f)
+                os.utime(cache_file)  # Age pruning counts from the last use
+                self._remember_summary(key, summary)
+                return summary
+            except Exception:
+                pass  # Unreadable entry; recompute and overwrite it
+
+        summary = self._extract_code_summary(file_content, file_path, extension)
+        self._remember_summary(key, summary)
+
+        if cache_file and self._summary_dir_ready:
+            try:
+                # Write to a private temp file and rename, so concurrent summarizers never read a partial entry
+                tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+                    pickle.dump(summary, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, cache_file)
+            except Exception as e:
+                print(f"Warning: Could not write summary cache for {file_path}: {e}")
 
+        return summary
+
+    def _remember_summary(self, key, summary):
+        """Keep a summary in the in-memory LRU, evicting beyond summary_cache_size."""
+        with self._summary_lock:
+            self._summary_cache[key] = summary
+            self._summary_cache.move_to_end(key)
+            while len(self._summary_cache) > self.summary_cache_size:
+                self._summary_cache.popitem(last=False)
+
+    def _prepare_summary_cache_dir(self):
+        """Create summary_cache_dir private to the current user and prune it, once per instance.
+
+        Entries are unpickled, so the directory must not be writable by anyone else.
+        Returns whether the on-disk cache is usable.
+        """
+        with self._summary_lock:
+            if self._summary_dir_ready:
+                return True
+            try:
+                os.makedirs(self.summary_cache_dir, mode=0o700, exist_ok=True)
+                os.chmod(self.summary_cache_dir, 0o700)
+                self._prune_summary_cache()
+            except OSError as e:
+                print(f"Warning: Summary cache disabled: {e}")
+                self.summary_cache_dir = None
+                return False
+            self._summary_dir_ready = True
+            return True
+
+    def _prune_summary_cache(self):
+        """Delete summary files unused for summary_cache_max_age, then the oldest beyond summary_cache_max_files."""
+        entries = []
+        with os.scandir(self.summary_cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.pkl') and entry.is_file():
+                    entries.append((entry.stat().st_mtime, entry.path))
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.summary_cache_max_age
+        for i, (mtime, path) in enumerate(entries):
+            if i >= self.summary_cache_max_files or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # Already removed by a concurrent prune
+
+    def summarize_code_files(self, files):
+        """Run extract_code_summary over many files concurrently; returns {path: summary} in input order."""
+        with ThreadPoolExecutor(max_workers=self.max_summary_workers) as executor:
+            summaries = executor.map(lambda file: self.extract_code_summary(file["content"], file["path"]), files)
+            return {file["path"]: summary for file, summary in zip(files, summaries)}
+
+    def _extract_code_summary(self, file_content, file_path, extension):
+        """Build the summary for extract_code_summary."""
         # Initialize summary
         summary = {
             "functions": [],
@@ -770,14 +1543,9 @@ class GitHubRepoInfo:
                 summary["imports"] = ast_result["imports"]
                 summary["complexity"] = ast_result["complexity"]
 
-                # Try to extract module docstring
-                try:
-                    tree = ast.parse(file_content)
-                    module_docstring = ast.get_docstring(tree)
-                    if module_docstring:
-                        summary["description"] = module_docstring
-                except:
-                    pass
+                # Module docstring, from the tree analyze_ast already parsed
+                if ast_result["docstring"]:
+                    summary["description"] = ast_result["docstring"]
 
                 # Add detailed function and class info
                 summary["detailed_functions"] = ast_result["functions"]
@@ -799,24 +1567,10 @@ class GitHubRepoInfo:
 
         # Calculate basic code metrics for any text file
         if file_content:
-            lines = file_content.split('\n')
-            code_lines = 0
-            comment_lines = 0
-            blank_lines = 0
-
-            comment_prefixes = ['#', '//', '/*', '*', '<!--']
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    blank_lines += 1
-                elif any(line.startswith(prefix) for prefix in comment_prefixes):
-                    comment_lines += 1
-                else:
-                    code_lines += 1
+            total_lines, code_lines, comment_lines, blank_lines = line_metrics(file_content)
 
             summary["metrics"] = {
-                "total_lines": len(lines),
+                "total_lines": total_lines,
                 "code_lines": code_lines,
                 "comment_lines": comment_lines,
                 "blank_lines": blank_lines,
@@ -825,13 +1579,17 @@ class GitHubRepoInfo:
 
         return summary
 
-    def analyze_dependencies(self, owner, repo, max_files=100):
-        """Analyze code dependencies across the repository."""
+    def analyze_dependencies(self, owner, repo, max_files=100, text_files=None):
+        """Analyze code dependencies across the repository.
+
+        Pass text_files (as returned by get_all_text_files) to reuse files already fetched.
+        """
         # Get Python and JavaScript files
-        text_files = self.get_all_text_files(owner, repo, max_files=max_files)
+        if text_files is None:
+            text_files = self.get_all_text_files(owner, repo, max_files=max_files)
 
         # Filter for Python and JS/TS files
-        code_files = [f for f in text_files if f["name"].endswith(('.py', '.js', '.ts', '.jsx', '.tsx'))]
+        code_files = [f for f in text_files if f["extension"] in CODE_EXTENSIONS]
 
         # Track dependencies
         dependencies = {
@@ -842,15 +1600,16 @@ class GitHubRepoInfo:
 
         # Extract module names from file paths
         file_to_module = {}
+        summaries = self.summarize_code_files(code_files)
         for file in code_files:
             # Convert file path to potential module name
-            module_path = os.path.splitext(file["path"])[0].replace('/', '.')
+            module_path = file["path"][:-len(file["extension"])].replace('/', '.')
             file_to_module[file["path"]] = module_path
 
             # Track what each file defines
-            summary = self.extract_code_summary(file["content"], file["path"])
+            summary = summaries[file["path"]]
 
-            if file["name"].endswith('.py'):
+            if file["extension"] == '.py':
                 for function in summary.get("functions", []):
                     dependencies['modules'][file["path"]].add(f"{module_path}.{function}")
                 for class_name in summary.get("classes", []):
@@ -859,24 +1618,39 @@ class GitHubRepoInfo:
                 for export in summary.get("exports", []):
                     dependencies['modules'][file["path"]].add(export)
 
+        # Index module paths once so import resolution is a hash lookup (first file wins on duplicates)
+        module_paths = set(file_to_module.values())
+        path_by_module = {}
+        for f_path, m_path in file_to_module.items():
+            path_by_module.setdefault(m_path, f_path)
+        # JS/TS files by path without extension; when stems collide, earlier extensions in this order win
+        js_path_by_stem = {}
+        for ext in ('.js', '.ts', '.jsx', '.tsx'):
+            for f_path in file_to_module:
+                if f_path.endswith(ext):
+                    js_path_by_stem.setdefault(f_path[:-len(ext)], f_path)
+        # Python import name -> (is internal, defining file or None)
+        python_imports = {}
+
         # Analyze imports/dependencies
         for file in code_files:
-            summary = self.extract_code_summary(file["content"], file["path"])
+            summary = summaries[file["path"]]
 
             for imp in summary.get("imports", []):
                 # Check if this is an internal import
                 is_internal = False
 
-                if file["name"].endswith('.py'):
-                    # For Python, check if the import matches any module path
-                    for module_path in file_to_module.values():
-                        if imp == module_path or imp.startswith(f"{module_path}."):
-                            is_internal = True
-                            # Find the file that defines this module
-                            for f_path, m_path in file_to_module.items():
-                                if m_path == imp.split('.')[0]:
-                                    dependencies['internal'][file["path"]].add(f_path)
-                                    break
+                if file["extension"] == '.py':
+                    # For Python, the import is internal if it or one of its dotted prefixes is a module path;
+                    # imports repeat across files, so each distinct one is resolved once
+                    if imp not in python_imports:
+                        parts = imp.split('.')
+                        internal = any('.'.join(parts[:i]) in module_paths for i in range(1, len(parts) + 1))
+                        # The file that defines this module
+                        python_imports[imp] = (internal, path_by_module.get(parts[0]) if internal else None)
+                    is_internal, target = python_imports[imp]
+                    if target:
+                        dependencies['internal'][file["path"]].add(target)
                 else:
                     # For JS/TS, check relative imports
                     if imp.startswith('./') or imp.startswith('../'):
@@ -885,18 +1659,18 @@ class GitHubRepoInfo:
                         src_dir = os.path.dirname(file["path"])
                         target_path = os.path.normpath(os.path.join(src_dir, imp))
 
-                        # Add known extensions if not specified
-                        if '.' not in os.path.basename(target_path):
-                            for ext in ['.js', '.ts', '.jsx', '.tsx']:
-                                test_path = f"{target_path}{ext}"
-                                if test_path in file_to_module:
-                                    dependencies['internal'][file["path"]].add(test_path)
-                                    break
+                        # Exact path, else the path with a known extension, else a directory index file
+                        if target_path in file_to_module:
+                            target = target_path
+                        else:
+                            target = js_path_by_stem.get(target_path) or js_path_by_stem.get(os.path.join(target_path, 'index'))
+                        if target:
+                            dependencies['internal'][file["path"]].add(target)
 
                 # If not internal, consider it external
                 if not is_internal:
                     # Clean up the import name (remove relative path parts)
-                    if not file["name"].endswith('.py'):
+                    if file["extension"] != '.py':
                         imp = imp.split('/')[0]  # Take the package name part
                     dependencies['external'][file["path"]].add(imp)
 
@@ -906,26 +1680,31 @@ class GitHubRepoInfo:
         """Create a NetworkX graph from dependencies for visualization."""
         G = nx.DiGraph()
 
-        # Add nodes for files
-        for file_path in dependencies['internal'].keys():
-            G.add_node(file_path, type='file')
-
-        # Add edges for internal dependencies
-        for file_path, deps in dependencies['internal'].items():
-            for dep in deps:
-                G.add_edge(file_path, dep)
-
-        # Add nodes and edges for external dependencies
-        external_nodes = set()
-        for file_path, deps in dependencies['external'].items():
-            for dep in deps:
-                external_node = f"ext:{dep}"
-                if external_node not in external_nodes:
-                    G.add_node(external_node, type='external')
-                    external_nodes.add(external_node)
-                G.add_edge(file_path, external_node)
+        # Add nodes for files and for external packages (add_nodes_from ignores repeats)
+        G.add_nodes_from(dependencies['internal'].keys(), type='file')
+        G.add_nodes_from((f"ext:{dep}" for deps in dependencies['external'].values() for dep in deps),
+                         type='external')
+
+        # Add edges for internal and external dependencies in one batch
+        G.add_edges_from(chain(
+            ((file_path, dep) for file_path, deps in dependencies['internal'].items() for dep in deps),
+            ((file_path, f"ext:{dep}") for file_path, deps in dependencies['external'].items() for dep in deps)
+        ))
 
         return G
+
+    @staticmethod
+    def dependency_graph_layout(G, iterations=50, seed=42):
+        """Node positions for drawing G, computed by igraph when available."""
+        if ig is None or not len(G):
+            return nx.spring_layout(G, k=0.5, iterations=iterations, seed=seed)
+
+        nodes = list(G.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        graph = ig.Graph(n=len(nodes), edges=[(index[u], index[v]) for u, v in G.edges], directed=True)
+        start = np.random.default_rng(seed).random((len(nodes), 2)).tolist()  # fixed start for reproducibility
+        coords = graph.layout_fruchterman_reingold(seed=start, niter=iterations).coords
+        return dict(zip(nodes, np.asarray(coords)))
     # ... ( get_repo_text_summary, get_temporal_analysis, get_all_info, ...)
     def get_repo_text_summary(self, owner, repo, max_files=25):
         """Extract and summarize text content from the repository with improved metrics."""
@@ -939,47 +1718,42 @@ class GitHubRepoInfo:
         text_files = self.get_all_text_files(owner, repo, max_files=max_files)
 
         # Analyze code files
-        code_summary = {}
         complexity_metrics = {
             'cyclomatic_complexity': [],
             'maintainability_index': [],
             'comment_ratios': []
         }
 
-        for file in text_files:
-            ext = os.path.splitext(file["name"])[1].lower()
-            if ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
-                file_summary = self.extract_code_summary(file["content"], file["path"])
-                code_summary[file["path"]] = file_summary
+        code_files = [file for file in text_files if file["extension"] in CODE_EXTENSIONS]
+        code_summary = self.summarize_code_files(code_files)
 
-                # Collect complexity metrics
-                if file_summary.get('complexity'):
-                    cc = file_summary['complexity'].get('overall')
-                    if cc is not None:
-                        complexity_metrics['cyclomatic_complexity'].append((file["path"], cc))
+        for path, file_summary in code_summary.items():
+            # Collect complexity metrics
+            if file_summary.get('complexity'):
+                cc = file_summary['complexity'].get('overall')
+                if cc is not None:
+                    complexity_metrics['cyclomatic_complexity'].append((path, cc))
 
-                    mi = file_summary['complexity'].get('maintainability_index')
-                    if mi is not None:
-                        complexity_metrics['maintainability_index'].append((file["path"], mi))
+                mi = file_summary['complexity'].get('maintainability_index')
+                if mi is not None:
+                    complexity_metrics['maintainability_index'].append((path, mi))
 
-                if file_summary.get('metrics'):
-                    comment_ratio = file_summary['metrics'].get('comment_ratio', 0)
-                    complexity_metrics['comment_ratios'].append((file["path"], comment_ratio))
+            if file_summary.get('metrics'):
+                comment_ratio = file_summary['metrics'].get('comment_ratio', 0)
+                complexity_metrics['comment_ratios'].append((path, comment_ratio))
 
         # Analyze dependencies
-        dependencies = self.analyze_dependencies(owner, repo, max_files=max_files)
+        dependencies = self.analyze_dependencies(owner, repo, text_files=text_files)
 
         # Summarize repository content by file type
-        file_types = defaultdict(int)
-        for file in text_files:
-            ext = os.path.splitext(file["name"])[1].lower()
-            file_types[ext] += 1
+        file_types = Counter(file["extension"] for file in text_files)
 
-        # Calculate aggregate code metrics
-        total_code_lines = sum(summary.get('metrics', {}).get('code_lines', 0)
-                              for summary in code_summary.values())
-        total_comment_lines = sum(summary.get('metrics', {}).get('comment_lines', 0)
-                                 for summary in code_summary.values())
+        # Calculate aggregate code metrics in one pass over the summaries
+        total_code_lines = total_comment_lines = 0
+        for summary in code_summary.values():
+            file_metrics = summary.get('metrics') or {}
+            total_code_lines += file_metrics.get('code_lines', 0)
+            total_comment_lines += file_metrics.get('comment_lines', 0)
 
         aggregate_metrics = {
             'total_files': len(text_files),
@@ -1107,6 +1881,12 @@ class GitHubRepoInfo:
         if not repo_data or not repo_data["basic_info"]:
             return
 
+        # Imported here so analyses that never display anything don't pay matplotlib's import time
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+        # Every chart below is closed after plt.show() (or when drawing it fails), so pyplot does not keep
+        # each figure alive across repeated runs
+
         basic = repo_data["basic_info"]
 
         # Display basic repository information
@@ -1151,6 +1931,7 @@ class GitHubRepoInfo:
             plt.title("Language Distribution")
             plt.axis('equal')
             plt.show()
+            plt.close()
 
         # Display contributors
         if repo_data["contributors"]:
@@ -1177,6 +1958,7 @@ class GitHubRepoInfo:
             plt.xticks(rotation=45, ha='right')
             plt.tight_layout()
             plt.show()
+            plt.close()
 
         # Display recent commits
         if repo_data["recent_commits"]:
@@ -1221,9 +2003,9 @@ class GitHubRepoInfo:
             display(Markdown(f"**{readme['name']}**"))
 
             # Show a preview of the README content (first few lines)
-            lines = readme["content"].split("\n")
-            preview_lines = lines[:min(15, len(lines))]
-            preview = "\n".join(preview_lines)
+            # Split off only the lines shown; a 16th element means there is more
+            lines = readme["content"].split("\n", 15)
+            preview = "\n".join(lines[:15])
 
             display(Markdown(preview))
             if len(lines) > 15:
@@ -1257,10 +2039,9 @@ class GitHubRepoInfo:
 
                 # Get top 10 most complex files
                 complexity_data = repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]
-                complexity_data.sort(key=lambda x: x[1], reverse=True)
 
                 complex_files = []
-                for path, cc in complexity_data[:10]:
+                for path, cc in heapq.nlargest(10, complexity_data, key=itemgetter(1)):
                     complex_files.append({
                         "File": os.path.basename(path),
                         "Path": path,
@@ -1296,6 +2077,7 @@ class GitHubRepoInfo:
                     plt.legend()
                     plt.tight_layout()
                     plt.show()
+                    plt.close()
 
             # Display maintainability index if available
             if repo_data["text_content"]["complexity_metrics"]["maintainability_index"]:
@@ -1313,6 +2095,7 @@ class GitHubRepoInfo:
                     plt.legend()
                     plt.tight_layout()
                     plt.show()
+                    plt.close()
 
             # Display file type distribution
             if repo_data["text_content"]["file_type_counts"]:
@@ -1338,6 +2121,7 @@ class GitHubRepoInfo:
                 plt.xticks(rotation=45, ha='right')
                 plt.tight_layout()
                 plt.show()
+                plt.close()
 
         # Display dependency graph if available
         if repo_data["text_content"]["dependencies"]:
@@ -1350,22 +2134,16 @@ class GitHubRepoInfo:
             internal_deps = repo_data["text_content"]["dependencies"]["internal"]
             external_deps = repo_data["text_content"]["dependencies"]["external"]
 
-            # Count unique external dependencies
-            all_external = set()
-            for deps in external_deps.values():
-                all_external.update(deps)
-
-            # Find most imported packages
-            ext_counts = Counter()
-            for deps in external_deps.values():
-                ext_counts.update(deps)
+            # Find most imported packages; the counter's keys are the unique external dependencies
+            ext_counts = Counter(chain.from_iterable(external_deps.values()))
+            all_external = ext_counts.keys()
 
             top_imports = ext_counts.most_common(10)
 
             display(HTML(f"""
             <div style="background-color:#e8f4f8; padding:15px; border-radius:5px; margin:10px 0;">
                 <p><strong>Files with Dependencies:</strong> {len(internal_deps) + len(external_deps)}</p>
-                <p><strong>Internal Dependency Relationships:</strong> {sum(len(deps) for deps in internal_deps.values())}</p>
+                <p><strong>Internal Dependency Relationships:</strong> {sum(map(len, internal_deps.values()))}</p>
                 <p><strong>Unique External Dependencies:</strong> {len(all_external)}</p>
             </div>
             """))
@@ -1384,26 +2162,24 @@ class GitHubRepoInfo:
                 imports_df = pd.DataFrame(imports_data)
                 display(imports_df)
 
-            # Visualize dependency network (if not too large)
-            if len(G.nodes) <= 50:  # Only visualize if not too complex
+            # Visualize dependency network (if not too large). Past 50 nodes only igraph lays it out fast
+            # enough, and edges lose their arrowheads so Matplotlib draws them as one LineCollection
+            # instead of one FancyArrowPatch per edge
+            large = len(G.nodes) > 50
+            if not large or (ig is not None and len(G.nodes) <= self.max_native_layout_nodes):
                 try:
                     display(Markdown("### Dependency Network"))
 
                     plt.figure(figsize=(12, 12))
 
-                    # Node colors based on type
-                    node_colors = []
-                    for node in G.nodes:
-                        if G.nodes[node].get('type') == 'external':
-                            node_colors.append('red')
-                        else:
-                            node_colors.append('skyblue')
-
-                    # Node sizes based on connections
-                    node_sizes = [100 + 50 * G.degree(node) for node in G.nodes]
+                    # Node colors based on type, sizes based on connections (degrees looked up in one pass)
+                    degrees = dict(G.degree())
+                    nodes = list(G.nodes(data='type'))
+                    node_colors = np.where([node_type == 'external' for _, node_type in nodes], 'red', 'skyblue')
+                    node_sizes = 100 + 50 * np.fromiter((degrees[node] for node, _ in nodes), dtype=np.int32, count=len(nodes))
 
                     # Layout for the graph
-                    pos = nx.spring_layout(G, k=0.5, iterations=50, seed=42)  # Adding seed for reproducibility
+                    pos = self.dependency_graph_layout(G)
 
                     # Draw the graph
                     nx.draw_networkx(
@@ -1412,15 +2188,15 @@ class GitHubRepoInfo:
                         node_color=node_colors,
                         node_size=node_sizes,
                         alpha=0.7,
-                        arrows=True,
+                        arrows=not large,
                         arrowsize=10,
                         width=0.5
                     )
 
                     # Add labels for external dependencies
                     external_labels = {node: node.replace('ext:', '')
-                                    for node in G.nodes
-                                    if G.nodes[node].get('type') == 'external'}
+                                    for node, node_type in nodes
+                                    if node_type == 'external'}
 
                     nx.draw_networkx_labels(
                         G, pos,
@@ -1433,7 +2209,9 @@ class GitHubRepoInfo:
                     plt.axis('off')
                     plt.tight_layout()
                     plt.show()
+                    plt.close()
                 except Exception as e:
+                    plt.close()
                     print(f"Error generating dependency network visualization: {str(e)}")
                     print("Skipping network visualization due to data compatibility issues.")
 
@@ -1446,13 +2224,16 @@ class GitHubRepoInfo:
             if weekly_commits:
                 display(Markdown("### Weekly Commit Activity"))
 
-                # Convert to DataFrame for plotting
-                dates = [datetime.strptime(week['date'], '%Y-%m-%d') for week in weekly_commits]
-                commits = [week['total'] for week in weekly_commits]
+                # Convert to DataFrame for plotting; columns come out as arrays (dates parsed in one call)
+                commits_df = pd.DataFrame(weekly_commits)
+                dates = commits_df['date'].to_numpy(dtype='datetime64[D]')
+                commits = commits_df['total'].to_numpy()
 
                 try:
+                    dense = len(dates) > self.dense_chart_weeks
                     plt.figure(figsize=(14, 6))
-                    plt.plot(dates, commits, marker='o', linestyle='-', alpha=0.7)
+                    # Per-point markers only while they are distinguishable; a dense series is one plain path
+                    plt.plot(dates, commits, marker=None if dense else 'o', linestyle='-', alpha=0.7)
                     plt.title("Weekly Commit Activity")
                     plt.xlabel("Date")
                     plt.ylabel("Number of Commits")
@@ -1460,18 +2241,17 @@ class GitHubRepoInfo:
 
                     # Format x-axis to show dates nicely
                     plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-                    plt.gca().xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+                    plt.gca().xaxis.set_major_locator(mdates.AutoDateLocator() if dense else mdates.MonthLocator(interval=1))
                     plt.gcf().autofmt_xdate()
 
                     plt.tight_layout()
                     plt.show()
+                    plt.close()
                 except Exception as e:
+                    plt.close()
                     print(f"Error generating commit activity chart: {str(e)}")
                     print("Displaying raw data instead:")
-                    activity_df = pd.DataFrame({
-                        'Date': [week['date'] for week in weekly_commits],
-                        'Commits': [week['total'] for week in weekly_commits]
-                    })
+                    activity_df = commits_df[['date', 'total']].rename(columns={'date': 'Date', 'total': 'Commits'})
                     display(activity_df.head(10))
 
             # Code changes over time
@@ -1479,20 +2259,24 @@ class GitHubRepoInfo:
             if weekly_code_changes:
                 display(Markdown("### Weekly Code Changes"))
 
-                # Convert to DataFrame for plotting
-                dates = [datetime.strptime(week['date'], '%Y-%m-%d') for week in weekly_code_changes]
-                additions = [week['additions'] for week in weekly_code_changes]
-                deletions = [week['deletions'] for week in weekly_code_changes]
+                # Convert to DataFrame for plotting; columns come out as arrays (dates parsed in one call)
+                changes_df = pd.DataFrame(weekly_code_changes)
+                plot_dates = changes_df['date'].to_numpy(dtype='datetime64[D]')
 
                 try:
                     # Convert data to proper format for plotting
-                    plot_dates = np.array(dates)
-                    plot_additions = np.array([float(a) for a in additions])
-                    plot_deletions = np.array([float(d) for d in deletions])
+                    plot_additions = changes_df['additions'].to_numpy(dtype=np.float64)
+                    plot_deletions = changes_df['deletions'].to_numpy(dtype=np.float64)
 
+                    dense = len(plot_dates) > self.dense_chart_weeks
                     plt.figure(figsize=(14, 6))
-                    plt.bar(plot_dates, plot_additions, color='green', alpha=0.6, label='Additions')
-                    plt.bar(plot_dates, plot_deletions, color='red', alpha=0.6, label='Deletions')
+                    if dense:
+                        # Years of history: one filled step polygon per series instead of a Rectangle per week
+                        plt.fill_between(plot_dates, plot_additions, step='mid', color='green', alpha=0.6, label='Additions')
+                        plt.fill_between(plot_dates, plot_deletions, step='mid', color='red', alpha=0.6, label='Deletions')
+                    else:
+                        plt.bar(plot_dates, plot_additions, color='green', alpha=0.6, label='Additions')
+                        plt.bar(plot_dates, plot_deletions, color='red', alpha=0.6, label='Deletions')
                     plt.title("Weekly Code Changes")
                     plt.xlabel("Date")
                     plt.ylabel("Lines Changed")
@@ -1500,20 +2284,19 @@ class GitHubRepoInfo:
 
                     # Format x-axis to show dates nicely
                     plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-                    plt.gca().xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+                    plt.gca().xaxis.set_major_locator(mdates.AutoDateLocator() if dense else mdates.MonthLocator(interval=1))
                     plt.gcf().autofmt_xdate()
 
                     plt.tight_layout()
                     plt.show()
+                    plt.close()
                 except Exception as e:
+                    plt.close()
                     print(f"Error generating code changes chart: {str(e)}")
                     print("Displaying raw data instead:")
-                    changes_df = pd.DataFrame({
-                        'Date': [week['date'] for week in weekly_code_changes],
-                        'Additions': [week['additions'] for week in weekly_code_changes],
-                        'Deletions': [week['deletions'] for week in weekly_code_changes]
-                    })
-                    display(changes_df.head(10))
+                    display(changes_df[['date', 'additions', 'deletions']]
+                            .rename(columns={'date': 'Date', 'additions': 'Additions', 'deletions': 'Deletions'})
+                            .head(10))
 
             # Display issue resolution metrics
             issue_timeline = repo_data["temporal_analysis"]["issue_timeline"]
@@ -1524,8 +2307,10 @@ class GitHubRepoInfo:
 
                 if resolution_times:
                     # Calculate statistics
-                    avg_resolution = np.mean(resolution_times)
-                    median_resolution = np.median(resolution_times)
+                    # Convert once (None becomes NaN); the statistics and the histogram share the array
+                    resolution_array = np.asarray(resolution_times, dtype=np.float64)
+                    avg_resolution = np.nanmean(resolution_array)
+                    median_resolution = np.nanmedian(resolution_array)
 
                     display(HTML(f"""
                     <div style="background-color:#f5f5f5; padding:15px; border-radius:5px; margin:10px 0;">
@@ -1538,9 +2323,9 @@ class GitHubRepoInfo:
                     # Plot histogram of resolution times
                     try:
                         plt.figure(figsize=(10, 6))
-                        # Ensure all values are float and clip to reasonable range
-                        resolution_times_clean = np.array([float(rt) for rt in resolution_times if rt is not None])
-                        plt.hist(np.clip(resolution_times_clean, 0, 168), bins=20, alpha=0.7)  # Clip to one week for readability
+                        # Keep finite values and clip to a reasonable range
+                        resolution_times_clean = resolution_array[np.isfinite(resolution_array)]
+                        plt.hist(np.clip(resolution_times_clean, 0, 168, out=resolution_times_clean), bins=20, alpha=0.7)  # Clip to one week for readability
                         plt.title("Issue Resolution Times (Capped at 1 Week)")
                         plt.xlabel("Hours to Resolution")
                         plt.ylabel("Number of Issues")
@@ -1549,7 +2334,9 @@ class GitHubRepoInfo:
                         plt.legend()
                         plt.tight_layout()
                         plt.show()
+                        plt.close()
                     except Exception as e:
+                        plt.close()
                         print(f"Error generating issue resolution histogram: {str(e)}")
                         print("Skipping histogram visualization due to data compatibility issues.")
 
@@ -1586,7 +2373,9 @@ class GitHubRepoInfo:
                             plt.xticks(rotation=45, ha='right')
                             plt.tight_layout()
                             plt.show()
+                            plt.close()
                         except Exception as e:
+                            plt.close()
                             print(f"Error generating issue labels chart: {str(e)}")
                             print("Skipping labels visualization due to data compatibility issues.")
 
@@ -1609,8 +2398,10 @@ class GitHubRepoInfo:
                     merge_times = pr_timeline['merge_times']
 
                     if merge_times:
-                        avg_merge = np.mean(merge_times)
-                        median_merge = np.median(merge_times)
+                        # Convert once (None becomes NaN); the statistics and the histogram share the array
+                        merge_array = np.asarray(merge_times, dtype=np.float64)
+                        avg_merge = np.nanmean(merge_array)
+                        median_merge = np.nanmedian(merge_array)
 
                         display(HTML(f"""
                         <div style="background-color:#2c2c2c; color:#f5f5f5; padding:15px; border-radius:8px; margin:10px 0;">
@@ -1623,9 +2414,9 @@ class GitHubRepoInfo:
                         # Plot histogram of merge times
                         try:
                             plt.figure(figsize=(10, 6))
-                            # Ensure all values are float and clip to reasonable range
-                            merge_times_clean = np.array([float(mt) for mt in merge_times if mt is not None])
-                            plt.hist(np.clip(merge_times_clean, 0, 168), bins=20, alpha=0.7)  # Clip to one week for readability
+                            # Keep finite values and clip to a reasonable range
+                            merge_times_clean = merge_array[np.isfinite(merge_array)]
+                            plt.hist(np.clip(merge_times_clean, 0, 168, out=merge_times_clean), bins=20, alpha=0.7)  # Clip to one week for readability
                             plt.title("PR Merge Times (Capped at 1 Week)")
                             plt.xlabel("Hours to Merge")
                             plt.ylabel("Number of PRs")
@@ -1634,7 +2425,9 @@ class GitHubRepoInfo:
                             plt.legend()
                             plt.tight_layout()
                             plt.show()
+                            plt.close()
                         except Exception as e:
+                            plt.close()
                             print(f"Error generating PR merge time histogram: {str(e)}")
                             print("Skipping histogram visualization due to data compatibility issues.")
 
@@ -1648,21 +2441,21 @@ class GitHubRepoInfo:
         # Filter for Python/JavaScript/TypeScript files
         code_files = [
             file for file in repo_data["text_content"]["text_files"]
-            if file["name"].endswith(('.py', '.js', '.ts', '.jsx', '.tsx'))
+            if file["extension"] in CODE_EXTENSIONS
         ]
 
         # Sort by complexity if available
         complexity_metrics = repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]
         complexity_dict = {path: cc for path, cc in complexity_metrics}
 
-        # Sort files by complexity (if available) or by file size
+        # Pick the max_files most complex files (if available) or largest files, without sorting them all
         if complexity_dict:
-            code_files.sort(key=lambda x: complexity_dict.get(x["path"], 0), reverse=True)
+            top_files = heapq.nlargest(max_files, code_files, key=lambda x: complexity_dict.get(x["path"], 0))
         else:
-            code_files.sort(key=lambda x: len(x["content"]), reverse=True)
+            top_files = heapq.nlargest(max_files, code_files, key=lambda x: len(x["content"]))
 
         # Display up to max_files
-        for i, file in enumerate(code_files[:max_files]):
+        for i, file in enumerate(top_files):
             file_path = file["path"]
             complexity = complexity_dict.get(file_path, "N/A")
 
@@ -1684,56 +2477,82 @@ class GitHubRepoInfo:
                 """))
 
             # Get file extension for syntax highlighting
-            ext = os.path.splitext(file["name"])[1][1:]  # Remove the dot
+            ext = file["extension"][1:]  # Remove the dot
 
             # Display code with syntax highlighting (first 100 lines max)
+            # Split off only the previewed lines, and count the rest without materializing them
             code = file["content"]
-            lines = code.split("\n")
-            preview_lines = lines[:min(100, len(lines))]
-            preview = "\n".join(preview_lines)
+            lines = code.split("\n", 100)
+            preview = "\n".join(lines[:100])
 
             display(Markdown(f"```{ext}\n{preview}\n```"))
 
             if len(lines) > 100:
-                display(Markdown(f"*... ({len(lines) - 100} more lines) ...*"))
+                remaining = code.count("\n") + 1 - 100
+                display(Markdown(f"*... ({remaining} more lines) ...*"))
 
-    def export_repo_text(self, repo_data, output_dir='/content/repo_text'):
-        """Export repository text content and analysis to files in Colab."""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+    def export_repo_text(self, repo_data, output_dir='/content/repo_text', archive=False):
+        """Export repository text content and analysis to files in Colab.
 
+        With archive=True everything goes into a single output_dir + '.zip' instead of a directory
+        tree, which saves a file open and close per exported file on slow or networked filesystems.
+        Otherwise the files are written from a thread pool, overlapping their open/write latency.
+        """
+        writes = []
+        if archive:
+            archive_file = zipfile.ZipFile(f"{output_dir}.zip", 'w', zipfile.ZIP_DEFLATED, compresslevel=1)
+            executor = None
+        else:
+            archive_file = None
+            executor = ThreadPoolExecutor(max_workers=self.max_export_writers)
+            os.makedirs(os.path.join(output_dir, "code"), exist_ok=True)
+            if repo_data["text_content"]["documentation"]:
+                os.makedirs(os.path.join(output_dir, "docs"), exist_ok=True)
+
+        def write_file(path, text):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        def write_text(rel_path, text):
+            if archive_file:
+                archive_file.writestr(rel_path, text)  # ZipFile writes must stay sequential
+            else:
+                writes.append(executor.submit(write_file, os.path.join(output_dir, rel_path), text))
+
+        try:
+            self._export_repo_text(repo_data, write_text)
+        finally:
+            if archive_file:
+                archive_file.close()
+            if executor:
+                executor.shutdown()
+
+        # Surface the first failed write, as the sequential writes did
+        for write in writes:
+            write.result()
+
+    def _export_repo_text(self, repo_data, write_text):
+        """Write the export files of export_repo_text through write_text(relative_path, text)."""
         # Write README
         if repo_data["text_content"]["readme"] and repo_data["text_content"]["readme"].get("content"):
-            readme_path = os.path.join(output_dir, "README.md")
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(repo_data["text_content"]["readme"]["content"])
+            write_text("README.md", repo_data["text_content"]["readme"]["content"])
 
         # Write documentation files
         if repo_data["text_content"]["documentation"]:
-            docs_dir = os.path.join(output_dir, "docs")
-            if not os.path.exists(docs_dir):
-                os.makedirs(docs_dir)
-
             for doc in repo_data["text_content"]["documentation"]:
-                # Create directory structure if needed
-                doc_path = os.path.join(docs_dir, doc["name"])
-                with open(doc_path, 'w', encoding='utf-8') as f:
-                    f.write(doc["content"])
+                write_text(f"docs/{doc['name']}", doc["content"])
 
         # Write code files
-        code_dir = os.path.join(output_dir, "code")
-        if not os.path.exists(code_dir):
-            os.makedirs(code_dir)
-
         for file in repo_data["text_content"]["text_files"]:
-            if os.path.splitext(file["name"])[1].lower() in ['.py', '.js', '.ts', '.jsx', '.tsx']:
-                file_path = os.path.join(code_dir, file["name"])
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(file["content"])
-
-        # Write enhanced repository summary
-        summary_path = os.path.join(output_dir, "repo_summary.md")
-        with open(summary_path, 'w', encoding='utf-8') as f:
+            if file["extension"] in CODE_EXTENSIONS:
+                write_text(f"code/{file['name']}", file["content"])
+
+        # Most complex files first, ranked once for both the complexity table and the code structure section
+        complexity_data = repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]
+        most_complex = heapq.nlargest(10, complexity_data, key=itemgetter(1))
+
+        # Write enhanced repository summary, built in memory and written once
+        with io.StringIO() as f:
             # Get basic info
             basic = repo_data["basic_info"]
 
@@ -1806,14 +2625,11 @@ class GitHubRepoInfo:
             if repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]:
                 f.write("## Code Complexity\n\n")
 
-                complexity_data = repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]
-                complexity_data.sort(key=lambda x: x[1], reverse=True)
-
                 f.write("### Most Complex Files\n\n")
                 f.write("| File | Cyclomatic Complexity |\n")
                 f.write("|------|------------------------|\n")
 
-                for path, cc in complexity_data[:10]:
+                for path, cc in most_complex:
                     f.write(f"| {path} | {cc} |\n")
 
                 f.write("\n")
@@ -1855,15 +2671,8 @@ class GitHubRepoInfo:
 
                 external_deps = repo_data["text_content"]["dependencies"]["external"]
 
-                # Count unique external dependencies
-                all_external = set()
-                for deps in external_deps.values():
-                    all_external.update(deps)
-
                 # Find most imported packages
-                ext_counts = Counter()
-                for deps in external_deps.values():
-                    ext_counts.update(deps)
+                ext_counts = Counter(chain.from_iterable(external_deps.values()))
 
                 top_imports = ext_counts.most_common(10)
 
@@ -1881,10 +2690,7 @@ class GitHubRepoInfo:
                 f.write("## Code Structure\n\n")
 
                 # Get summary of most significant files
-                complexity_data = repo_data["text_content"]["complexity_metrics"]["cyclomatic_complexity"]
-                complexity_data.sort(key=lambda x: x[1], reverse=True)
-
-                for path, _ in complexity_data[:5]:
+                for path, _ in most_complex[:5]:
                     summary = repo_data["text_content"]["code_summary"].get(path)
                     if summary:
                         f.write(f"### {path}\n\n")
@@ -1912,9 +2718,18 @@ class GitHubRepoInfo:
                                 f.write(f"- `{imp}`\n")
                             f.write("\n")
 
+            write_text("repo_summary.md", f.getvalue())
+
     # --- NEW METHOD for getting specific PR details ---
     def get_pull_request_details(self, owner, repo, pr_number):
-        """Get detailed information for a specific Pull Request using PyGithub."""
+        """Get detailed information for a specific Pull Request.
+
+        Uses a single GraphQL request when a token is set, else (or on GraphQL errors) PyGithub.
+        """
+        details = self._get_pull_request_details_graphql(owner, repo, pr_number)
+        if details is not None:
+            return details
+
         if not self.github:
             print("PyGithub client not initialized. Cannot fetch PR details.")
             # Fallback maybe? Or just return None
@@ -1960,6 +2775,47 @@ class GitHubRepoInfo:
             print(f"An unexpected error occurred fetching PR details: {e}")
             return None
 
+    def _get_pull_request_details_graphql(self, owner, repo, pr_number):
+        """get_pull_request_details via GraphQL; None without a token or on error."""
+        if not self.token:
+            return None
+
+        response = self.session.post(
+            f"{self.base_url}/graphql",
+            headers=self._headers_for(self._tokens[0]),
+            json={"query": PR_DETAILS_QUERY, "variables": {"owner": owner, "name": repo, "number": pr_number}}
+        )
+        payload = orjson.loads(response.content) if response.status_code == 200 else {}
+        pr = ((payload.get("data") or {}).get("repository") or {}).get("pullRequest")
+        if payload.get("errors") or not pr:
+            return None
+
+        def timestamp(value):
+            # Same form as PyGithub's datetime.isoformat()
+            return value.replace("Z", "+00:00") if value else None
+
+        return {
+            "number": pr["number"],
+            "title": pr["title"],
+            "state": "open" if pr["state"] == "OPEN" else "closed",
+            "merged": pr["merged"],
+            "body": pr["body"] or "",
+            "url": pr["url"],
+            "created_at": timestamp(pr["createdAt"]),
+            "updated_at": timestamp(pr["updatedAt"]),
+            "closed_at": timestamp(pr["closedAt"]),
+            "merged_at": timestamp(pr["mergedAt"]),
+            "author": pr["author"]["login"] if pr["author"] else "N/A",
+            "commits_count": pr["commits"]["totalCount"],
+            "additions": pr["additions"],
+            "deletions": pr["deletions"],
+            "changed_files_count": pr["changedFiles"],
+            "labels": [label["name"] for label in pr["labels"]["nodes"]],
+            "assignees": [assignee["login"] for assignee in pr["assignees"]["nodes"]],
+            "milestone": pr["milestone"]["title"] if pr["milestone"] else None,
+            "repo_full_name": f"{owner}/{repo}",
+        }
+
 
 # --- Colab Helpers (Keep these as provided) ---
 try:
@@ -1968,65 +2824,47 @@ try:
 except ImportError:
     IN_COLAB = False
 
+# Only a notebook kernel (Jupyter, Colab) renders rich output; in a script or server display() just prints a repr
+IN_NOTEBOOK = getattr(get_ipython(), 'kernel', None) is not None
+
+def render_markdown(text):
+    """Render Markdown in a notebook, or print the text as-is anywhere else."""
+    if IN_NOTEBOOK:
+        display(Markdown(text))
+    else:
+        print(text)
+
 # ...(keep download_file and save_json_to_colab functions)...
-class CustomJSONEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, set):
-                return list(obj)
-            elif isinstance(obj, (datetime, np.datetime64)):
-                 # Handle both standard datetime and numpy datetime64
-                if isinstance(obj, np.datetime64):
-                     # Convert numpy datetime64 to standard datetime
-                     ts = pd.to_datetime(obj)
-                     return ts.isoformat()
-                return obj.isoformat()
-            elif isinstance(obj, (np.int64, np.int32)):
-                 return int(obj)
-            elif isinstance(obj, (np.float64, np.float32)):
-                 return float(obj)
-            elif hasattr(obj, '__dict__'):
-                 # Be careful with complex objects, might expose too much
-                 # Consider filtering attributes if needed
-                 return {k: v for k, v in obj.__dict__.items() if not k.startswith('_') and not callable(v)}
-            # Let the base class default method raise the TypeError
-            return super(CustomJSONEncoder, self).default(obj)
-
-def convert_sets_to_lists(obj):
-    # Recursive function to convert sets and handle numpy types
-    if isinstance(obj, dict):
-        return {k: convert_sets_to_lists(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_sets_to_lists(i) for i in obj]
-    elif isinstance(obj, set):
-        return [convert_sets_to_lists(i) for i in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_sets_to_lists(i) for i in obj)
-    elif isinstance(obj, (np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32)):
-         return float(obj)
-    elif isinstance(obj, np.datetime64):
-         ts = pd.to_datetime(obj)
-         return ts.isoformat()
-    elif isinstance(obj, np.bool_):
-         return bool(obj)
+def _json_default(obj):
+    """orjson fallback for the types it does not serialize natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
     elif isinstance(obj, np.ndarray):
-         return convert_sets_to_lists(obj.tolist()) # Convert numpy arrays to lists
-    else:
-        # Attempt to handle other non-serializable types gracefully
-        try:
-            json.dumps(obj) # Test if serializable
-            return obj
-        except TypeError:
-            return str(obj) # Convert to string as a fallback
+        return obj.tolist()  # Arrays orjson rejects (non-contiguous, object dtype)
+    elif hasattr(obj, 'isoformat'):
+        return obj.isoformat()  # datetime subclasses such as pandas Timestamps
+    elif isinstance(obj, tuple):
+        return list(obj)  # namedtuples such as radon's Function/Class blocks; orjson rejects tuple subclasses
+    # Convert to string as a fallback
+    return str(obj)
 
 def save_json_to_colab(data, filename='/content/repo_info.json'):
     """Save JSON data to a file in Colab and provide download option."""
-    # ... (rest of the save_json_to_colab function using the above helpers) ...
-    converted_data = convert_sets_to_lists(data)
+    # orjson serializes numpy scalars/arrays and datetimes itself, so the data needs no conversion pass first
+    option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
     try:
-        with open(filename, 'w') as f:
-            json.dump(converted_data, f, indent=2, cls=CustomJSONEncoder)
+        with open(filename, 'wb') as f:
+            if isinstance(data, dict) and data:
+                # Encode and write one top-level key at a time, so only one section's bytes are held at once.
+                # Each {key: value} dump is sliced to its inner lines, so the file matches a single dump
+                f.write(b"{\n")
+                for i, (key, value) in enumerate(data.items()):
+                    if i:
+                        f.write(b",\n")
+                    f.write(orjson.dumps({key: value}, default=_json_default, option=option)[2:-2])
+                f.write(b"\n}")
+            else:
+                f.write(orjson.dumps(data, default=_json_default, option=option))
         print(f"Data saved to {filename}")
         if IN_COLAB:
             print("To download the JSON file, run the following cell:")
@@ -2038,9 +2876,272 @@ def save_json_to_colab(data, filename='/content/repo_info.json'):
 
 
 # --- GraphRepoAnalyzer Class ---
+# Cypher statements are module constants so every call sends identical text and hits Neo4j's query plan cache;
+# values always go in as $parameters, never formatted into the query
+# Connection pool settings: enough connections for the concurrent populate sessions, and a
+# bounded wait for a free one instead of blocking indefinitely
+NEO4J_DRIVER_OPTIONS = {
+    "max_connection_pool_size": 50,
+    "connection_acquisition_timeout": 10,
+}
+
+NEO4J_SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT repo_name IF NOT EXISTS FOR (r:Repository) REQUIRE r.fullName IS UNIQUE;",
+    "CREATE CONSTRAINT user_login IF NOT EXISTS FOR (u:User) REQUIRE u.login IS UNIQUE;",
+    "CREATE CONSTRAINT commit_sha IF NOT EXISTS FOR (c:Commit) REQUIRE c.sha IS UNIQUE;",
+    "CREATE CONSTRAINT file_path IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE;",
+    "CREATE CONSTRAINT lang_name IF NOT EXISTS FOR (l:Language) REQUIRE l.name IS UNIQUE;",
+    "CREATE CONSTRAINT dep_name IF NOT EXISTS FOR (d:Dependency) REQUIRE d.name IS UNIQUE;",
+    "CREATE CONSTRAINT issue_num IF NOT EXISTS FOR (i:Issue) REQUIRE i.number IS UNIQUE;", # Assumes issue number is unique within repo context - adjust if needed
+    "CREATE CONSTRAINT pr_num IF NOT EXISTS FOR (p:PullRequest) REQUIRE p.number IS UNIQUE;", # Same assumption for PRs
+    # Indexes for batched MERGE keys that no uniqueness constraint covers
+    "CREATE INDEX function_file_name IF NOT EXISTS FOR (fn:Function) ON (fn.file, fn.name);",
+    "CREATE INDEX class_file_name IF NOT EXISTS FOR (cl:Class) ON (cl.file, cl.name);",
+)
+
+MERGE_OWNER_QUERY = """
+MATCH (r:Repository {fullName: $full_name})
+MERGE (u:User {login: $owner_login})
+ON CREATE SET u.avatarUrl = $avatar_url, u.type = $owner_type
+MERGE (r)-[:OWNED_BY]->(u)
+"""
+
+MERGE_LANGUAGE_QUERY = """
+MATCH (repo:Repository {fullName: $full_name})
+MERGE (l:Language {name: $lang})
+MERGE (repo)-[rel:USES_LANGUAGE]->(l)
+SET rel.bytes = $bytes_count
+"""
+
+MERGE_CONTRIBUTORS_QUERY = """
+MATCH (repo:Repository {fullName: $full_name})
+UNWIND $rows AS row
+MERGE (u:User {login: row.login})
+ON CREATE SET u.avatarUrl = row.avatar_url, u.profileUrl = row.profile_url
+MERGE (repo)-[rel:HAS_CONTRIBUTOR]->(u)
+SET rel.contributions = row.contributions
+"""
+
+MERGE_COMMITS_QUERY = """
+MATCH (repo:Repository {fullName: $full_name})
+UNWIND $rows AS row
+MERGE (c:Commit {sha: row.sha})
+ON CREATE SET c.message = row.message, c.date = datetime(row.date)
+MERGE (repo)-[:HAS_COMMIT]->(c)
+"""
+
+MERGE_USERS_QUERY = """
+UNWIND $logins AS login
+MERGE (u:User {login: login})
+"""
+
+MERGE_AUTHORS_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Commit {sha: row.sha})
+MATCH (u:User {login: row.login})
+MERGE (u)-[:AUTHORED]->(c)
+"""
+
+MERGE_COMMITTERS_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Commit {sha: row.sha})
+MATCH (u:User {login: row.login})
+MERGE (u)-[:COMMITTED]->(c)
+"""
+
+MERGE_FILES_QUERY = """
+MATCH (repo:Repository {fullName: $full_name})
+UNWIND $rows AS row
+MERGE (f:File {path: row.path})
+ON CREATE SET f.name = row.name, f.extension = row.extension, f.isCode = row.is_code
+MERGE (repo)-[:CONTAINS_FILE]->(f)
+"""
+
+SET_FILE_METRICS_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.path})
+SET f.linesTotal = row.total, f.linesCode = row.code, f.linesComment = row.comment,
+    f.linesBlank = row.blank, f.commentRatio = row.ratio
+"""
+
+SET_FILE_COMPLEXITY_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.path})
+SET f.complexityCyclomatic = row.cc, f.maintainabilityIndex = row.mi
+"""
+
+MERGE_FUNCTIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.path})
+MERGE (fn:Function {name: row.name, file: row.path}) // Unique by name + file path
+ON CREATE SET fn.args = row.args, fn.complexity = row.cc, fn.docstring = row.doc
+MERGE (f)-[:DEFINES_FUNCTION]->(fn)
+"""
+
+MERGE_CLASSES_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.path})
+MERGE (cl:Class {name: row.name, file: row.path}) // Unique by name + file path
+ON CREATE SET cl.methods = row.methods, cl.docstring = row.doc, cl.extends = row.extends
+MERGE (f)-[:DEFINES_CLASS]->(cl)
+"""
+
+MERGE_INTERNAL_DEPS_QUERY = """
+UNWIND $rows AS row
+MATCH (source:File {path: row.source}), (target:File {path: row.target})
+MERGE (source)-[:DEPENDS_ON]->(target)
+"""
+
+MERGE_DEPENDENCIES_QUERY = """
+UNWIND $names AS name
+MERGE (dep:Dependency {name: name})
+"""
+
+MERGE_EXTERNAL_DEPS_QUERY = """
+UNWIND $rows AS row
+MATCH (source:File {path: row.source})
+MATCH (dep:Dependency {name: row.package})
+MERGE (source)-[:IMPORTS]->(dep)
+"""
+
+MERGE_REPOSITORY_QUERY = """
+MERGE (r:Repository {fullName: $full_name})
+ON CREATE SET
+    r.name = $name,
+    r.owner = $owner,
+    r.description = $description,
+    r.url = $url,
+    r.createdAt = datetime($created_at),
+    r.updatedAt = datetime($updated_at),
+    r.stars = $stars,
+    r.forks = $forks,
+    r.openIssues = $open_issues,
+    r.language = $language,
+    r.license = $license
+RETURN r
+"""
+
+GRAPH_COUNTS_QUERY = """
+MATCH (n) RETURN 'node' AS kind, labels(n) AS key, count(*) AS count
+UNION ALL
+MATCH ()-[r]->() RETURN 'rel' AS kind, type(r) AS key, count(*) AS count
+"""
+
+GRAPH_SAMPLE_QUERY = """
+CALL {
+    MATCH (repo:Repository {fullName: $repo_name})
+    OPTIONAL MATCH (repo)-[r1:OWNED_BY|HAS_CONTRIBUTOR|CONTAINS_FILE|HAS_COMMIT|USES_LANGUAGE]->(related)
+    RETURN repo AS source, type(r1) AS relationship, related AS target
+    UNION
+    MATCH (repo:Repository {fullName: $repo_name})<-[r2:AUTHORED|COMMITTED]-(user:User)
+    RETURN user AS source, type(r2) AS relationship, repo AS target // Show user -> repo link
+    UNION
+    MATCH (file:File)<-[:CONTAINS_FILE]-(repo:Repository {fullName: $repo_name})
+    OPTIONAL MATCH (file)-[r3:DEFINES_FUNCTION|DEFINES_CLASS|DEPENDS_ON|IMPORTS]->(related_code)
+    RETURN file AS source, type(r3) AS relationship, related_code AS target
+}
+RETURN source, relationship, target
+LIMIT $max_rels
+"""
+
+# Representative property per node label, and how to display it, for graph summaries
+NODE_NAME_FORMATS = {
+    'Repository': ('fullName', str),
+    'User': ('login', str),
+    'File': ('path', os.path.basename), # Show file name
+    'Language': ('name', str),
+    'Dependency': ('name', str),
+    'Function': ('name', str),
+    'Class': ('name', str),
+    'Commit': ('sha', lambda sha: sha[:7]), # Short SHA
+    'Issue': ('number', lambda number: f"#{number}"),
+    'PullRequest': ('number', lambda number: f"#{number}"),
+}
+
+# Pull request summary prompt pieces; only the header is formatted per call
+PR_SUMMARY_INTRO_TEMPLATE = """
+You are an AI assistant specializing in summarizing GitHub Pull Requests.
+Analyze the following Pull Request details from repository '{repo_name}' and provide a summary tailored for a '{role}'.
+"""
+
+PR_DETAILS_TEMPLATE = """
+**Pull Request #{pr_number}: {title}**
+*   **Author:** {author}
+*   **Status:** {state} ({merged_status})
+*   **Created:** {created_at}
+*   **Commits:** {commits_count}
+*   **Changed Files:** {changed_files}
+*   **Code Churn:** +{additions} / -{deletions} lines
+*   **Labels:** {labels}
+*   **Description/Body:**
+{truncated_body}
+---
+"""
+
+# Several pull requests summarized in one call; the reply must be JSON so it can be split per PR
+PR_BATCH_SUMMARY_TEMPLATE = """
+You are an AI assistant specializing in summarizing GitHub Pull Requests.
+Analyze the following {count} Pull Requests from repository '{repo_name}' and provide a summary of each tailored for a '{role}'.
+{pull_requests}{role_instructions}
+Respond with only a JSON array holding one object per Pull Request, in the order given:
+[{{"pr_number": <number>, "summary": "<Markdown summary>"}}]
+"""
+
+DEVELOPER_SUMMARY_INSTRUCTIONS = """
+**Summary Focus (Developer):**
+*   Summarize the core technical changes and their purpose.
+*   Identify key files, modules, or functions affected.
+*   Mention any potential technical complexities, risks, or areas needing careful code review (based *only* on the description and metadata).
+*   Note any mention of tests added or modified.
+*   Be concise and focus on technical aspects relevant for peer review or understanding the change.
+"""
+
+MANAGER_SUMMARY_INSTRUCTIONS = """
+**Summary Focus (Manager/Team Lead):**
+*   Explain the high-level purpose and business value (what problem does this PR solve or what feature does it add?).
+*   Summarize the overall status (e.g., Ready for Review, Needs Work, Merged, Blocked?).
+*   Give a sense of the PR's size/complexity (e.g., Small/Medium/Large based on file/line changes and description).
+*   Highlight any mentioned risks, blockers, or dependencies on other work.
+*   Include the author and key dates (created, merged/closed).
+*   Focus on information needed for tracking progress and impact.
+"""
+
+PRODUCT_SUMMARY_INSTRUCTIONS = """
+**Summary Focus (Program/Product Manager):**
+*   Describe the user-facing impact or the feature/bug fix being addressed.
+*   Relate the PR to product goals or requirements if possible (based on title/body/labels).
+*   Note the status (especially if merged or closed).
+*   Mention associated issues or tickets if referenced in the body (though not explicitly provided here, look for patterns like '#123').
+*   Focus on 'what' and 'why' from a product perspective.
+"""
+
+GENERAL_SUMMARY_INSTRUCTIONS = """
+**Summary Focus (General):**
+*   State the main goal or purpose of the PR clearly.
+*   Identify the author and the current status (Open/Closed/Merged).
+*   Provide a brief, balanced overview of the key changes made.
+*   Keep the summary accessible to a wider audience.
+"""
+
+PR_ROLE_INSTRUCTIONS = {
+    'Developer': DEVELOPER_SUMMARY_INSTRUCTIONS,
+    'Manager': MANAGER_SUMMARY_INSTRUCTIONS,
+    'Team Lead': MANAGER_SUMMARY_INSTRUCTIONS,
+    'Program Manager': PRODUCT_SUMMARY_INSTRUCTIONS,
+    'Product Owner': PRODUCT_SUMMARY_INSTRUCTIONS,
+}
+
+
 class GraphRepoAnalyzer:
     """Integrates GitHub analysis with Neo4j and Gemini."""
 
+    # Most rows sent in one UNWIND statement, so a huge repository isn't shipped as a single Bolt message
+    unwind_batch_size = 10000
+    # Gemini calls in flight at once across all analyzers, to stay within the provider's rate limits
+    gemini_slots = threading.BoundedSemaphore(8)
+    # Seconds a graph summary is reused by ask_gemini_about_repo before Neo4j is queried again
+    graph_summary_ttl = 300
+
     # --- Keep ALL existing methods from the previous version ---
     # ... ( __init__, close, _create_neo4j_constraints, _run_cypher, ...)
     def __init__(self, github_token=None, neo4j_uri=None, neo4j_user=None, neo4j_password=None, gemini_api_key=None):
@@ -2059,7 +3160,8 @@ class GraphRepoAnalyzer:
         else:
             try:
                 # Use basic_auth for Neo4j driver authentication
-                self.neo4j_driver = GraphDatabase.driver(self.neo4j_uri, auth=basic_auth(self.neo4j_user, self.neo4j_password))
+                self.neo4j_driver = GraphDatabase.driver(self.neo4j_uri, auth=basic_auth(self.neo4j_user, self.neo4j_password),
+                                                         **NEO4J_DRIVER_OPTIONS)
                 self.neo4j_driver.verify_connectivity()
                 print("Successfully connected to Neo4j.")
                 self._create_neo4j_constraints()
@@ -2081,129 +3183,132 @@ class GraphRepoAnalyzer:
                 print(f"Error initializing Gemini: {e}")
                 self.gemini_model = None
 
-        self.github_analyzer = GitHubRepoInfo(token=self.github_token)
+        # Without an explicit token GitHubRepoInfo resolves GITHUB_TOKENS (rotated) before GITHUB_TOKEN itself
+        self.github_analyzer = GitHubRepoInfo(token=github_token)
         self.repo_data = None
         self.repo_full_name = None # Store repo name for context
+        self._graph_summary_cache = {} # repo full name -> (time.monotonic() when built, graph summary)
 
     def close(self):
-        """Close the Neo4j driver connection."""
+        """Close the Neo4j driver connection and the GitHub HTTP client."""
+        self.github_analyzer.close()
         if self.neo4j_driver:
             self.neo4j_driver.close()
             print("Neo4j connection closed.")
 
     def _create_neo4j_constraints(self):
-        """Create unique constraints for better performance and data integrity."""
+        """Create unique constraints and indexes for better performance and data integrity."""
         if not self.neo4j_driver: return
-        constraints = [
-            "CREATE CONSTRAINT repo_name IF NOT EXISTS FOR (r:Repository) REQUIRE r.fullName IS UNIQUE;",
-            "CREATE CONSTRAINT user_login IF NOT EXISTS FOR (u:User) REQUIRE u.login IS UNIQUE;",
-            "CREATE CONSTRAINT commit_sha IF NOT EXISTS FOR (c:Commit) REQUIRE c.sha IS UNIQUE;",
-            "CREATE CONSTRAINT file_path IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE;",
-            "CREATE CONSTRAINT lang_name IF NOT EXISTS FOR (l:Language) REQUIRE l.name IS UNIQUE;",
-            "CREATE CONSTRAINT dep_name IF NOT EXISTS FOR (d:Dependency) REQUIRE d.name IS UNIQUE;",
-            "CREATE CONSTRAINT issue_num IF NOT EXISTS FOR (i:Issue) REQUIRE i.number IS UNIQUE;", # Assumes issue number is unique within repo context - adjust if needed
-            "CREATE CONSTRAINT pr_num IF NOT EXISTS FOR (p:PullRequest) REQUIRE p.number IS UNIQUE;", # Same assumption for PRs
-        ]
         try:
+            def create_schema(tx):
+                for constraint in NEO4J_SCHEMA_STATEMENTS:
+                    tx.run(constraint)
+
+            # One schema-only transaction instead of an auto-commit round trip per statement
             with self.neo4j_driver.session() as session:
-                for constraint in constraints:
-                    session.run(constraint)
+                session.execute_write(create_schema)
             print("Neo4j constraints ensured.")
         except Exception as e:
             print(f"Error creating Neo4j constraints: {e}")
 
 
-    def _run_cypher(self, query, parameters=None):
-        """Helper function to run Cypher queries."""
+    def _run_cypher(self, query, parameters=None, as_tuples=False):
+        """Helper function to run Cypher queries.
+
+        Rows come back as dicts, or with `as_tuples` as plain value tuples, which skips
+        building a dict per row and keeps nodes as Node objects instead of property dicts.
+        """
         if not self.neo4j_driver:
             print("Neo4j connection not available.")
             return None
         try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query, parameters)
-                return [record.data() for record in result] # Return results as list of dicts
+            # execute_query borrows a pooled session and retries transient errors, instead of a new session per call
+            records, _, _ = self.neo4j_driver.execute_query(query, parameters)
+            if as_tuples:
+                return [tuple(record) for record in records]
+            return [record.data() for record in records] # Return results as list of dicts
         except Exception as e:
             print(f"Error running Cypher query: {e}")
             print(f"Query: {query}")
             print(f"Parameters: {parameters}")
             return None
 
+    def _generate_content(self, prompt, **kwargs):
+        """Call Gemini (blocking), waiting for a free slot when too many calls are in flight."""
+        with self.gemini_slots:
+            return self.gemini_model.generate_content(prompt, **kwargs)
+
+    def _run_batched(self, tx, query, rows, parameters=None):
+        """Run an UNWIND $rows query over `rows` in chunks of at most unwind_batch_size."""
+        for start in range(0, len(rows), self.unwind_batch_size):
+            tx.run(query, {**(parameters or {}), 'rows': rows[start:start + self.unwind_batch_size]})
+
     # ... ( _populate_basic_info, _populate_contributors, _populate_commits, ...)
 
     def _populate_basic_info(self, tx, repo_node, basic_info):
         """Populate basic repo info and owner."""
         owner_login = basic_info.get('owner', {}).get('login')
         if owner_login:
-            tx.run("""
-                MERGE (u:User {login: $owner_login})
-                ON CREATE SET u.avatarUrl = $avatar_url, u.type = $owner_type
-                MERGE (r)-[:OWNED_BY]->(u)
-                """, owner_login=owner_login,
-                     avatar_url=basic_info.get('owner', {}).get('avatar_url'),
-                     owner_type=basic_info.get('owner', {}).get('type'))
+            tx.run(MERGE_OWNER_QUERY, {'full_name': repo_node['fullName'],
+                                       'owner_login': owner_login,
+                                       'avatar_url': basic_info.get('owner', {}).get('avatar_url'),
+                                       'owner_type': basic_info.get('owner', {}).get('type')})
 
         # Add languages
         languages = self.repo_data.get("languages", {})
         if languages:
             for lang, bytes_count in languages.items():
-                tx.run("""
-                    MERGE (l:Language {name: $lang})
-                    MERGE (repo)-[rel:USES_LANGUAGE]->(l)
-                    SET rel.bytes = $bytes_count
-                    """, repo=repo_node, lang=lang, bytes_count=bytes_count)
+                tx.run(MERGE_LANGUAGE_QUERY, {'full_name': repo_node['fullName'], 'lang': lang, 'bytes_count': bytes_count})
 
     def _populate_contributors(self, tx, repo_node):
         """Populate contributors."""
         contributors = self.repo_data.get("contributors", [])
         if contributors:
-            for contrib in contributors:
-                tx.run("""
-                    MERGE (u:User {login: $login})
-                    ON CREATE SET u.avatarUrl = $avatar_url, u.profileUrl = $profile_url
-                    MERGE (repo)-[rel:HAS_CONTRIBUTOR]->(u)
-                    SET rel.contributions = $contributions
-                    """, repo=repo_node, login=contrib['login'],
-                         avatar_url=contrib.get('avatar_url'),
-                         profile_url=contrib.get('html_url'),
-                         contributions=contrib['contributions'])
+            # One statement for all contributors: a single round-trip and a single query plan
+            rows = [{'login': contrib['login'],
+                     'avatar_url': contrib.get('avatar_url'),
+                     'profile_url': contrib.get('html_url'),
+                     'contributions': contrib['contributions']} for contrib in contributors]
+            self._run_batched(tx, MERGE_CONTRIBUTORS_QUERY, rows, {'full_name': repo_node['fullName']})
 
     def _populate_commits(self, tx, repo_node):
         """Populate recent commits and link authors."""
         commits = self.repo_data.get("recent_commits", [])
         if commits:
+            # Build every row in Python, then write commits, authors and committers with one UNWIND each
+            # instead of up to three statements per commit
+            commit_rows, author_rows, committer_rows = [], [], []
             for commit_data in commits:
                 sha = commit_data['sha']
                 commit_info = commit_data['commit']
-                author_info = commit_info.get('author', {})
-                committer_info = commit_info.get('committer', {})
-                author_login = commit_data.get('author', {}).get('login') # GitHub user if linked
-                committer_login = commit_data.get('committer', {}).get('login')
-
-                # Create commit node
-                tx.run("""
-                    MERGE (c:Commit {sha: $sha})
-                    ON CREATE SET c.message = $message, c.date = datetime($date)
-                    MERGE (repo)-[:HAS_COMMIT]->(c)
-                    """, repo=repo_node, sha=sha,
-                         message=commit_info.get('message', '')[:500], # Limit message size
-                         date=author_info.get('date')) # Use author date
-
-                # Link author (if GitHub user)
+                author_info = commit_info.get('author') or {}
+                author_login = (commit_data.get('author') or {}).get('login') # GitHub user if linked
+                committer_login = (commit_data.get('committer') or {}).get('login')
+
+                commit_rows.append({'sha': sha,
+                                    'message': commit_info.get('message', '')[:500], # Limit message size
+                                    'date': author_info.get('date')}) # Use author date
+                # Link author (if GitHub user); else, could store author name/email on commit node if needed
                 if author_login:
-                    tx.run("""
-                        MATCH (c:Commit {sha: $sha})
-                        MERGE (u:User {login: $login})
-                        MERGE (u)-[:AUTHORED]->(c)
-                        """, sha=sha, login=author_login)
-                # Else, could store author name/email on commit node if needed
-
+                    author_rows.append({'sha': sha, 'login': author_login})
                 # Link committer (if GitHub user and different from author)
                 if committer_login and committer_login != author_login:
-                     tx.run("""
-                        MATCH (c:Commit {sha: $sha})
-                        MERGE (u:User {login: $login})
-                        MERGE (u)-[:COMMITTED]->(c)
-                        """, sha=sha, login=committer_login)
+                    committer_rows.append({'sha': sha, 'login': committer_login})
+
+            # Create commit nodes
+            self._run_batched(tx, MERGE_COMMITS_QUERY, commit_rows, {'full_name': repo_node['fullName']})
+
+            # Each linked login is merged once, however many commits it authored or committed;
+            # the edge statements then only look users up
+            logins = list({row['login'] for row in author_rows} | {row['login'] for row in committer_rows})
+            if logins:
+                tx.run(MERGE_USERS_QUERY, {'logins': logins})
+
+            # The unique constraints on Commit.sha and User.login back these lookups with indexes
+            if author_rows:
+                self._run_batched(tx, MERGE_AUTHORS_QUERY, author_rows)
+            if committer_rows:
+                self._run_batched(tx, MERGE_COMMITTERS_QUERY, committer_rows)
 
     # ... ( _populate_files_and_code, _populate_dependencies, populate_neo4j_graph, ...)
     def _populate_files_and_code(self, tx, repo_node):
@@ -2211,18 +3316,13 @@ class GraphRepoAnalyzer:
         code_summary = self.repo_data.get("text_content", {}).get("code_summary", {})
         text_files = self.repo_data.get("text_content", {}).get("text_files", [])
 
-        # Create file nodes first
+        # Walk the files once in Python, then write each kind of row with a single UNWIND statement
+        file_rows, metric_rows, complexity_rows, function_rows, class_rows = [], [], [], [], []
         for file_info in text_files:
             path = file_info['path']
-            name = file_info['name']
-            extension = os.path.splitext(name)[1].lower()
-            is_code = extension in ['.py', '.js', '.ts', '.jsx', '.tsx'] # Add more if needed
-
-            tx.run("""
-                MERGE (f:File {path: $path})
-                ON CREATE SET f.name = $name, f.extension = $extension, f.isCode = $is_code
-                MERGE (repo)-[:CONTAINS_FILE]->(f)
-                """, repo=repo_node, path=path, name=name, extension=extension, is_code=is_code)
+            extension = file_info['extension']
+            file_rows.append({'path': path, 'name': file_info['name'], 'extension': extension,
+                              'is_code': extension in CODE_EXTENSIONS})
 
             # If it's a code file with analysis, add details
             if path in code_summary:
@@ -2230,49 +3330,43 @@ class GraphRepoAnalyzer:
                 metrics = summary.get('metrics', {})
                 complexity = summary.get('complexity', {})
 
-                # Add metrics
                 if metrics:
-                    tx.run("""
-                        MATCH (f:File {path: $path})
-                        SET f.linesTotal = $total, f.linesCode = $code, f.linesComment = $comment, f.linesBlank = $blank, f.commentRatio = $ratio
-                        """, path=path, total=metrics.get('total_lines'), code=metrics.get('code_lines'),
-                             comment=metrics.get('comment_lines'), blank=metrics.get('blank_lines'),
-                             ratio=metrics.get('comment_ratio'))
-
-                # Add complexity
+                    metric_rows.append({'path': path, 'total': metrics.get('total_lines'),
+                                        'code': metrics.get('code_lines'), 'comment': metrics.get('comment_lines'),
+                                        'blank': metrics.get('blank_lines'), 'ratio': metrics.get('comment_ratio')})
+
                 if complexity:
-                    tx.run("""
-                        MATCH (f:File {path: $path})
-                        SET f.complexityCyclomatic = $cc, f.maintainabilityIndex = $mi
-                        """, path=path, cc=complexity.get('overall'), mi=complexity.get('maintainability_index'))
+                    complexity_rows.append({'path': path, 'cc': complexity.get('overall'),
+                                            'mi': complexity.get('maintainability_index')})
 
-                # Add Functions (if language supports detailed analysis)
+                # Functions and classes (if language supports detailed analysis); names must be strings
                 for func in summary.get("detailed_functions", []):
-                     # Ensure func_name is a string
-                    func_name = str(func.get('name', 'unknown_function'))
-                    tx.run("""
-                        MATCH (f:File {path: $path})
-                        MERGE (fn:Function {name: $func_name, file: $path}) // Unique by name + file path
-                        ON CREATE SET fn.args = $args, fn.complexity = $cc, fn.docstring = $doc
-                        MERGE (f)-[:DEFINES_FUNCTION]->(fn)
-                        """, path=path, func_name=func_name,
-                             args=json.dumps(func.get('args', [])), # Store args as JSON string
-                             cc=func.get('complexity'),
-                             doc=func.get('docstring', '')[:200]) # Limit docstring
-
-                # Add Classes (if language supports detailed analysis)
+                    function_rows.append({'path': path, 'name': str(func.get('name', 'unknown_function')),
+                                          'args': json.dumps(func.get('args', [])), # Store args as JSON string
+                                          'cc': func.get('complexity'),
+                                          'doc': (func.get('docstring') or '')[:200]}) # Limit docstring
+
                 for cls in summary.get("detailed_classes", []):
-                     # Ensure cls_name is a string
-                    cls_name = str(cls.get('name', 'unknown_class'))
-                    tx.run("""
-                        MATCH (f:File {path: $path})
-                        MERGE (cl:Class {name: $cls_name, file: $path}) // Unique by name + file path
-                        ON CREATE SET cl.methods = $methods, cl.docstring = $doc, cl.extends = $extends
-                        MERGE (f)-[:DEFINES_CLASS]->(cl)
-                        """, path=path, cls_name=cls_name,
-                             methods=json.dumps([m['name'] for m in cls.get('methods', [])]), # Store method names
-                             doc=cls.get('docstring', '')[:200],
-                             extends=cls.get('extends')) # If JS/TS analysis provides it
+                    class_rows.append({'path': path, 'name': str(cls.get('name', 'unknown_class')),
+                                       'methods': json.dumps([m['name'] for m in cls.get('methods', [])]), # Store method names
+                                       'doc': (cls.get('docstring') or '')[:200],
+                                       'extends': cls.get('extends')}) # If JS/TS analysis provides it
+
+        # Create file nodes first
+        if file_rows:
+            self._run_batched(tx, MERGE_FILES_QUERY, file_rows, {'full_name': repo_node['fullName']})
+
+        if metric_rows:
+            self._run_batched(tx, SET_FILE_METRICS_QUERY, metric_rows)
+
+        if complexity_rows:
+            self._run_batched(tx, SET_FILE_COMPLEXITY_QUERY, complexity_rows)
+
+        if function_rows:
+            self._run_batched(tx, MERGE_FUNCTIONS_QUERY, function_rows)
+
+        if class_rows:
+            self._run_batched(tx, MERGE_CLASSES_QUERY, class_rows)
 
 
     def _populate_dependencies(self, tx, repo_node):
@@ -2281,27 +3375,22 @@ class GraphRepoAnalyzer:
         internal_deps = dependencies.get('internal', {})
         external_deps = dependencies.get('external', {})
 
-        # Internal Dependencies (File -> File)
-        for source_path, target_paths in internal_deps.items():
-            for target_path in target_paths:
-                 # Ensure both files exist before creating relationship
-                tx.run("""
-                    MATCH (source:File {path: $source_path}), (target:File {path: $target_path})
-                    WHERE EXISTS(source.path) AND EXISTS(target.path) // Ensure nodes exist
-                    MERGE (source)-[:DEPENDS_ON]->(target)
-                    """, source_path=source_path, target_path=target_path)
-
-        # External Dependencies (File -> Dependency)
-        for source_path, package_names in external_deps.items():
-            for package_name in package_names:
-                 # Ensure package name is valid before creating
-                if package_name and isinstance(package_name, str):
-                    tx.run("""
-                        MATCH (source:File {path: $source_path})
-                        WHERE EXISTS(source.path) // Ensure source file exists
-                        MERGE (dep:Dependency {name: $package_name})
-                        MERGE (source)-[:IMPORTS]->(dep)
-                        """, source_path=source_path, package_name=package_name)
+        # Flatten both dependency maps into edge rows and write each kind with a single UNWIND statement
+        internal_rows = [{'source': source_path, 'target': target_path}
+                         for source_path, target_paths in internal_deps.items() for target_path in target_paths]
+        # Ensure package name is valid before creating
+        external_rows = [{'source': source_path, 'package': package_name}
+                         for source_path, package_names in external_deps.items() for package_name in package_names
+                         if package_name and isinstance(package_name, str)]
+
+        # Internal Dependencies (File -> File); MATCH already skips edges whose files don't exist
+        if internal_rows:
+            self._run_batched(tx, MERGE_INTERNAL_DEPS_QUERY, internal_rows)
+
+        # External Dependencies (File -> Dependency); each package is merged once, not once per importing file
+        if external_rows:
+            tx.run(MERGE_DEPENDENCIES_QUERY, {'names': list({row['package'] for row in external_rows})})
+            self._run_batched(tx, MERGE_EXTERNAL_DEPS_QUERY, external_rows)
 
 
     def populate_neo4j_graph(self):
@@ -2318,47 +3407,50 @@ class GraphRepoAnalyzer:
         print(f"Populating Neo4j graph for repository: {full_name}")
 
         try:
-            with self.neo4j_driver.session(database="neo4j") as session: # Ensure using correct database if needed
-                # Create/Merge Repository Node
-                repo_result = session.execute_write(
-                    lambda tx: tx.run("""
-                        MERGE (r:Repository {fullName: $full_name})
-                        ON CREATE SET
-                            r.name = $name,
-                            r.owner = $owner,
-                            r.description = $description,
-                            r.url = $url,
-                            r.createdAt = datetime($created_at),
-                            r.updatedAt = datetime($updated_at),
-                            r.stars = $stars,
-                            r.forks = $forks,
-                            r.openIssues = $open_issues,
-                            r.language = $language,
-                            r.license = $license
-                        RETURN r
-                        """, full_name=full_name,
-                                       name=basic_info['name'],
-                                       owner=basic_info['owner']['login'],
-                                       description=basic_info.get('description', ''),
-                                       url=basic_info['html_url'],
-                                       created_at=basic_info['created_at'],
-                                       updated_at=basic_info['updated_at'],
-                                       stars=basic_info['stargazers_count'],
-                                       forks=basic_info['forks_count'],
-                                       open_issues=basic_info['open_issues_count'],
-                                       language=basic_info.get('language'),
-                                       license=basic_info.get('license', {}).get('name')
-                                       ).single()[0] # Get the repo node itself
-                )
-
-                # Call helper functions within transactions for atomicity
-                session.execute_write(self._populate_basic_info, repo_result, basic_info)
-                session.execute_write(self._populate_contributors, repo_result)
-                session.execute_write(self._populate_commits, repo_result)
-                session.execute_write(self._populate_files_and_code, repo_result)
-                session.execute_write(self._populate_dependencies, repo_result)
-                # Add calls for issues, PRs etc. if needed
+            def merge_repository(tx):
+                # Create/Merge Repository Node, then its owner and languages in the same transaction
+                parameters = {'full_name': full_name,
+                              'name': basic_info['name'],
+                              'owner': basic_info['owner']['login'],
+                              'description': basic_info.get('description', ''),
+                              'url': basic_info['html_url'],
+                              'created_at': basic_info['created_at'],
+                              'updated_at': basic_info['updated_at'],
+                              'stars': basic_info['stargazers_count'],
+                              'forks': basic_info['forks_count'],
+                              'open_issues': basic_info['open_issues_count'],
+                              'language': basic_info.get('language'),
+                              'license': (basic_info.get('license') or {}).get('name')} # License is null for unlicensed repos
+                repo_node = tx.run(MERGE_REPOSITORY_QUERY, parameters).single()[0] # Get the repo node itself
+                self._populate_basic_info(tx, repo_node, basic_info)
+                return repo_node
 
+            with self.neo4j_driver.session(database="neo4j") as session: # Ensure using correct database if needed
+                repo_result = session.execute_write(merge_repository)
+                # Later sessions wait for exactly this write and nothing else
+                repo_bookmarks = session.last_bookmarks()
+
+            # Call helper functions within transactions for atomicity. Once the Repository node exists the
+            # groups below are independent, so each runs in its own session (sessions aren't thread-safe);
+            # dependencies MATCH File nodes, so they share the files transaction. Conflicting MERGEs on
+            # shared User nodes surface as transient errors, which execute_write retries
+            def populate(*helpers):
+                def work(tx):
+                    for helper in helpers:
+                        helper(tx, repo_result)
+
+                with self.neo4j_driver.session(database="neo4j", bookmarks=repo_bookmarks) as helper_session:
+                    helper_session.execute_write(work)
+
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(populate, self._populate_contributors),
+                           executor.submit(populate, self._populate_commits),
+                           executor.submit(populate, self._populate_files_and_code, self._populate_dependencies)]
+                for future in futures:
+                    future.result()  # Re-raise the first failure
+            # Add calls for issues, PRs etc. if needed
+
+            self._graph_summary_cache.pop(full_name, None) # The cached summary describes the old graph
             print(f"Successfully populated graph for {full_name}.")
 
         except Exception as e:
@@ -2403,77 +3495,27 @@ class GraphRepoAnalyzer:
         if not self.neo4j_driver or not self.repo_full_name:
             return "No graph data available."
 
-        # Get counts
-        node_counts_query = "MATCH (n) RETURN labels(n) AS label, count(*) AS count"
-        rel_counts_query = "MATCH ()-[r]->() RETURN type(r) AS type, count(*) AS count"
-        node_counts = self._run_cypher(node_counts_query)
-        rel_counts = self._run_cypher(rel_counts_query)
-
-        # Get sample nodes/rels related to the repo
-        sample_query = """
-        MATCH (repo:Repository {fullName: $repo_name})
-        // Get repo node, owner, some contributors, some files, some commits
-        OPTIONAL MATCH (repo)-[:OWNED_BY]->(owner:User)
-        OPTIONAL MATCH (repo)-[:HAS_CONTRIBUTOR]->(contrib:User)
-        WITH repo, owner, collect(contrib)[..5] AS contributors // Limit contributors
-        OPTIONAL MATCH (repo)-[:CONTAINS_FILE]->(file:File)
-        WITH repo, owner, contributors, collect(file)[..10] AS files // Limit files
-        OPTIONAL MATCH (repo)-[:HAS_COMMIT]->(commit:Commit)
-        WITH repo, owner, contributors, files, collect(commit)[..5] AS commits // Limit commits
-        // Get relationships between these sampled nodes
-        CALL apoc.path.subgraphNodes([repo, owner] + contributors + files + commits, {
-            maxLevel: 1, relationshipFilter:'>' // Only outgoing relationships from these nodes
-        }) YIELD node
-        MATCH (n)-[r]->(m)
-        WHERE n IN [repo, owner] + contributors + files + commits AND m IN [repo, owner] + contributors + files + commits
-        RETURN n AS source, type(r) AS relationship, m AS target
-        LIMIT $max_rels
-        """
-        # Note: Needs APOC installed in Neo4j for subgraphNodes.
-        # Simpler alternative without APOC: Fetch specific relationships manually.
-        # Example simple alternative:
-        # sample_query_simple = """
-        # MATCH (repo:Repository {fullName: $repo_name})
-        # OPTIONAL MATCH (repo)-[r1:OWNED_BY|:HAS_CONTRIBUTOR|:CONTAINS_FILE|:HAS_COMMIT]->(related)
-        # WITH repo, type(r1) as rel_type, related LIMIT 15
-        # RETURN repo AS source, rel_type AS relationship, related AS target
-        # """
-
-        try:
-             # Attempt APOC query first
-            graph_sample = self._run_cypher(sample_query, {"repo_name": self.repo_full_name, "max_rels": max_rels})
-        except Exception as e:
-             print(f"APOC query failed ({e}), trying simpler graph sample query.")
-             sample_query_simple = """
-             MATCH (repo:Repository {fullName: $repo_name})
-             OPTIONAL MATCH (repo)-[r1:OWNED_BY|:HAS_CONTRIBUTOR|:CONTAINS_FILE|:HAS_COMMIT|:USES_LANGUAGE]->(related)
-             WITH repo, type(r1) as rel_type, related LIMIT $max_rels
-             RETURN repo AS source, rel_type AS relationship, related AS target
-             UNION
-             MATCH (repo:Repository {fullName: $repo_name})<-[r2:AUTHORED|:COMMITTED]-(user:User)
-             WITH repo, type(r2) as rel_type, user LIMIT $max_rels
-             RETURN user AS source, rel_type AS relationship, repo AS target // Show user -> repo link
-             UNION
-             MATCH (file:File)<-[:CONTAINS_FILE]-(repo:Repository {fullName: $repo_name})
-             OPTIONAL MATCH (file)-[r3:DEFINES_FUNCTION|:DEFINES_CLASS|:DEPENDS_ON|:IMPORTS]->(related_code)
-             WITH file, type(r3) as rel_type, related_code LIMIT $max_rels
-             RETURN file AS source, rel_type AS relationship, related_code AS target
-             """
-             graph_sample = self._run_cypher(sample_query_simple, {"repo_name": self.repo_full_name, "max_rels": max_rels})
+        # Get node and relationship counts in one round-trip, told apart by kind
+        counts = self._run_cypher(GRAPH_COUNTS_QUERY) or []
+        node_counts = [c for c in counts if c['kind'] == 'node']
+        rel_counts = [c for c in counts if c['kind'] == 'rel']
 
+        # Get sample nodes/rels related to the repo; plain Cypher, so it works without APOC
+        # The query's own LIMIT caps the rows server-side; tuples keep the nodes' labels for _node_to_string
+        graph_sample = self._run_cypher(GRAPH_SAMPLE_QUERY, {"repo_name": self.repo_full_name, "max_rels": max_rels},
+                                        as_tuples=True)
 
         summary = "Graph Context Summary:\n"
         if node_counts:
-             summary += "Node Counts: " + ", ".join([f"{c['label'][0]}: {c['count']}" for c in node_counts if c['label']]) + "\n"
+             summary += "Node Counts: " + ", ".join([f"{c['key'][0]}: {c['count']}" for c in node_counts if c['key']]) + "\n"
         if rel_counts:
-             summary += "Relationship Counts: " + ", ".join([f"{r['type']}: {r['count']}" for r in rel_counts if r['type']]) + "\n"
+             summary += "Relationship Counts: " + ", ".join([f"{r['key']}: {r['count']}" for r in rel_counts if r['key']]) + "\n"
         if graph_sample:
              summary += f"\nSample Relationships (up to {max_rels}):\n"
-             for rel in graph_sample:
+             for source, rel_type, target in graph_sample:
                  # Safely extract node properties for display
-                 source_repr = self._node_to_string(rel.get('source'))
-                 target_repr = self._node_to_string(rel.get('target'))
-                 rel_type = rel.get('relationship', 'UNKNOWN_REL')
+                 source_repr = self._node_to_string(source)
+                 target_repr = self._node_to_string(target)
                  if source_repr and target_repr and rel_type:
                     summary += f"- ({source_repr})-[:{rel_type}]->({target_repr})\n"
         else:
@@ -2486,16 +3528,11 @@ class GraphRepoAnalyzer:
         if not node or not hasattr(node, 'labels') or not hasattr(node, 'items'):
             return None
 
-        label = list(node.labels)[0] if node.labels else 'Node'
-        props = dict(node.items())
-        # Choose a representative property
-        if 'fullName' in props: name = props['fullName']
-        elif 'login' in props: name = props['login']
-        elif 'path' in props: name = os.path.basename(props['path']) # Show file name
-        elif 'name' in props: name = props['name']
-        elif 'sha' in props: name = props['sha'][:7] # Short SHA
-        elif 'number' in props: name = f"#{props['number']}"
-        else: name = node.element_id # Fallback to element ID
+        label = next(iter(node.labels), 'Node')
+        # Choose a representative property for the label without copying the node's properties
+        key, format_name = NODE_NAME_FORMATS.get(label, (None, None))
+        value = node.get(key) if key else None
+        name = format_name(value) if value is not None else node.element_id # Fallback to element ID
 
         # Limit name length
         name_str = str(name)
@@ -2509,79 +3546,10 @@ class GraphRepoAnalyzer:
 
     def _get_pr_summary_prompt(self, pr_details, role):
         """Generates the Gemini prompt for PR summarization based on role."""
-        # Extract key details safely
-        title = pr_details.get('title', 'N/A')
-        body = pr_details.get('body', 'No description provided.')
-        pr_number = pr_details.get('number', 'N/A')
         repo_name = pr_details.get('repo_full_name', 'N/A')
-        author = pr_details.get('author', 'N/A')
-        state = pr_details.get('state', 'N/A')
-        merged_status = 'Merged' if pr_details.get('merged') else ('Closed' if state == 'closed' else 'Open')
-        created_at = pr_details.get('created_at', 'N/A')
-        commits_count = pr_details.get('commits_count', 'N/A')
-        changed_files = pr_details.get('changed_files_count', 'N/A')
-        additions = pr_details.get('additions', 'N/A')
-        deletions = pr_details.get('deletions', 'N/A')
-        labels = ', '.join(pr_details.get('labels', [])) or 'None'
-
-        # Truncate long body
-        max_body_len = 1500
-        truncated_body = body[:max_body_len] + ('...' if len(body) > max_body_len else '')
-
-        base_prompt = f"""
-You are an AI assistant specializing in summarizing GitHub Pull Requests.
-Analyze the following Pull Request details from repository '{repo_name}' and provide a summary tailored for a '{role}'.
-
-**Pull Request #{pr_number}: {title}**
-*   **Author:** {author}
-*   **Status:** {state.capitalize()} ({merged_status})
-*   **Created:** {created_at}
-*   **Commits:** {commits_count}
-*   **Changed Files:** {changed_files}
-*   **Code Churn:** +{additions} / -{deletions} lines
-*   **Labels:** {labels}
-*   **Description/Body:**
-{truncated_body}
----
-"""
-        role_instructions = ""
-        # Define role-specific instructions
-        if role == 'Developer':
-            role_instructions = """
-**Summary Focus (Developer):**
-*   Summarize the core technical changes and their purpose.
-*   Identify key files, modules, or functions affected.
-*   Mention any potential technical complexities, risks, or areas needing careful code review (based *only* on the description and metadata).
-*   Note any mention of tests added or modified.
-*   Be concise and focus on technical aspects relevant for peer review or understanding the change.
-"""
-        elif role == 'Manager' or role == 'Team Lead':
-             role_instructions = """
-**Summary Focus (Manager/Team Lead):**
-*   Explain the high-level purpose and business value (what problem does this PR solve or what feature does it add?).
-*   Summarize the overall status (e.g., Ready for Review, Needs Work, Merged, Blocked?).
-*   Give a sense of the PR's size/complexity (e.g., Small/Medium/Large based on file/line changes and description).
-*   Highlight any mentioned risks, blockers, or dependencies on other work.
-*   Include the author and key dates (created, merged/closed).
-*   Focus on information needed for tracking progress and impact.
-"""
-        elif role == 'Program Manager' or role == 'Product Owner':
-            role_instructions = """
-**Summary Focus (Program/Product Manager):**
-*   Describe the user-facing impact or the feature/bug fix being addressed.
-*   Relate the PR to product goals or requirements if possible (based on title/body/labels).
-*   Note the status (especially if merged or closed).
-*   Mention associated issues or tickets if referenced in the body (though not explicitly provided here, look for patterns like '#123').
-*   Focus on 'what' and 'why' from a product perspective.
-"""
-        else: # Default/General
-            role_instructions = """
-**Summary Focus (General):**
-*   State the main goal or purpose of the PR clearly.
-*   Identify the author and the current status (Open/Closed/Merged).
-*   Provide a brief, balanced overview of the key changes made.
-*   Keep the summary accessible to a wider audience.
-"""
+        base_prompt = PR_SUMMARY_INTRO_TEMPLATE.format(repo_name=repo_name, role=role) + self._format_pr_details(pr_details)
+        # Roles without dedicated instructions get the general summary
+        role_instructions = PR_ROLE_INSTRUCTIONS.get(role, GENERAL_SUMMARY_INSTRUCTIONS)
 
         return base_prompt + role_instructions + "\n**Summary:**" # Ask for summary explicitly
 
@@ -2614,11 +3582,11 @@ Analyze the following Pull Request details from repository '{repo_name}' and pro
             # print(prompt[:1000] + "..." if len(prompt) > 1000 else prompt) # Debug: Print truncated prompt
             # print("-----------------------------")
 
-            response = self.gemini_model.generate_content(prompt)
+            response = self._generate_content(prompt)
 
             print("\n--- Gemini PR Summary ---")
             summary_text = response.text
-            display(Markdown(summary_text))
+            render_markdown(summary_text)
             print("------------------------")
             return summary_text
 
@@ -2632,43 +3600,46 @@ Analyze the following Pull Request details from repository '{repo_name}' and pro
             return "No repository data available."
 
         basic = self.repo_data["basic_info"]
-        summary = f"Repository Summary: {basic['full_name']}\n"
-        summary += f"Description: {basic.get('description', 'N/A')}\n"
-        summary += f"Stars: {basic.get('stargazers_count', 0)}, Forks: {basic.get('forks_count', 0)}, Open Issues: {basic.get('open_issues_count', 0)}\n"
-        summary += f"Main Language: {basic.get('language', 'N/A')}\n"
-        summary += f"Last Updated: {basic.get('updated_at', 'N/A')}\n"
+        # Collect the lines and join once at the end instead of re-copying the summary on every +=
+        parts = [
+            f"Repository Summary: {basic['full_name']}\n",
+            f"Description: {basic.get('description', 'N/A')}\n",
+            f"Stars: {basic.get('stargazers_count', 0)}, Forks: {basic.get('forks_count', 0)}, Open Issues: {basic.get('open_issues_count', 0)}\n",
+            f"Main Language: {basic.get('language', 'N/A')}\n",
+            f"Last Updated: {basic.get('updated_at', 'N/A')}\n",
+        ]
 
         if self.repo_data.get("languages"):
             langs = list(self.repo_data["languages"].keys())
-            summary += f"Languages Used: {', '.join(langs[:5])}{'...' if len(langs) > 5 else ''}\n"
+            parts.append(f"Languages Used: {', '.join(langs[:5])}{'...' if len(langs) > 5 else ''}\n")
 
         if self.repo_data.get("contributors"):
             contribs = [c['login'] for c in self.repo_data["contributors"][:5]]
-            summary += f"Top Contributors: {', '.join(contribs)}{'...' if len(self.repo_data['contributors']) > 5 else ''}\n"
+            parts.append(f"Top Contributors: {', '.join(contribs)}{'...' if len(self.repo_data['contributors']) > 5 else ''}\n")
 
         if self.repo_data.get("text_content", {}).get("aggregate_metrics"):
             metrics = self.repo_data["text_content"]["aggregate_metrics"]
-            summary += f"Code Metrics (approx): {metrics.get('total_code_lines', 0)} LoC, Comment Ratio: {metrics.get('average_comment_ratio', 0):.2f}\n"
+            parts.append(f"Code Metrics (approx): {metrics.get('total_code_lines', 0)} LoC, Comment Ratio: {metrics.get('average_comment_ratio', 0):.2f}\n")
 
         # Add complexity summary if available
         complexity_data = self.repo_data.get("text_content", {}).get("complexity_metrics",{}).get("cyclomatic_complexity", [])
         if complexity_data:
-            cc_values = [c[1] for c in complexity_data if isinstance(c[1], (int, float))] # Extract valid numbers
-            if cc_values:
-                 summary += f"Avg Cyclomatic Complexity: {np.mean(cc_values):.2f}\n"
+            # Extract valid numbers straight into a float array, then average in NumPy
+            cc_values = np.fromiter((c[1] for c in complexity_data if isinstance(c[1], (int, float))), dtype=np.float64)
+            if cc_values.size:
+                 parts.append(f"Avg Cyclomatic Complexity: {cc_values.mean():.2f}\n")
 
         # Add dependency summary if available
         deps = self.repo_data.get("text_content", {}).get("dependencies", {}).get("external", {})
         if deps:
-             ext_counts = Counter()
-             for dep_list in deps.values():
-                 ext_counts.update(dep for dep in dep_list if isinstance(dep, str)) # Count valid string deps
+             # Count valid string deps in one pass over all files' lists
+             ext_counts = Counter(dep for dep in chain.from_iterable(deps.values()) if isinstance(dep, str))
              top_deps = ext_counts.most_common(5)
              if top_deps:
-                 summary += f"Top External Dependencies: {', '.join([d[0] for d in top_deps])}\n"
+                 parts.append(f"Top External Dependencies: {', '.join([d[0] for d in top_deps])}\n")
 
 
-        return summary.strip()
+        return "".join(parts).strip()
 
     def ask_gemini_about_repo(self, question):
         """Ask Gemini a question about the analyzed repository, using graph context."""
@@ -2684,7 +3655,13 @@ Analyze the following Pull Request details from repository '{repo_name}' and pro
 
         # 2. Get Graph Context (GraphRAG - Retrieval Step)
         #    (Simple version: get generic graph summary. Advanced: tailor query to question)
-        graph_context = self._get_graph_summary_for_llm() # Use the helper
+        #    The graph only changes when it is repopulated, so follow-up questions reuse a recent summary
+        cached = self._graph_summary_cache.get(self.repo_full_name)
+        if cached and time.monotonic() - cached[0] < self.graph_summary_ttl:
+            graph_context = cached[1]
+        else:
+            graph_context = self._get_graph_summary_for_llm() # Use the helper
+            self._graph_summary_cache[self.repo_full_name] = (time.monotonic(), graph_context)
 
         # 3. Construct the Prompt
         prompt = f"""You are an expert software engineering assistant analyzing the GitHub repository '{self.repo_full_name}'.
@@ -2713,11 +3690,11 @@ Provide a concise and informative answer, referencing the data sources (summary
             print(prompt[:1000] + "..." if len(prompt) > 1000 else prompt) # Print truncated prompt for review
             print("-----------------------------")
 
-            response = self.gemini_model.generate_content(prompt)
+            response = self._generate_content(prompt)
 
             print("\n--- Gemini's Response ---")
             # Display response using Markdown for better formatting
-            display(Markdown(response.text))
+            render_markdown(response.text)
             print("------------------------")
             return response.text
 
@@ -2738,13 +3715,15 @@ Provide a concise and informative answer, referencing the data sources (summary
         self.neo4j_driver = None
         self.gemini_model = None
         # Initialize github_analyzer using the potentially updated GitHubRepoInfo
-        self.github_analyzer = GitHubRepoInfo(token=self.github_token)
+        # Without an explicit token GitHubRepoInfo resolves GITHUB_TOKENS (rotated) before GITHUB_TOKEN itself
+        self.github_analyzer = GitHubRepoInfo(token=github_token)
 
         if not all([self.neo4j_uri, self.neo4j_user, self.neo4j_password]):
             print("Warning: Neo4j credentials not fully provided. Graph features will be disabled.")
         else:
             try:
-                self.neo4j_driver = GraphDatabase.driver(self.neo4j_uri, auth=basic_auth(self.neo4j_user, self.neo4j_password))
+                self.neo4j_driver = GraphDatabase.driver(self.neo4j_uri, auth=basic_auth(self.neo4j_user, self.neo4j_password),
+                                                         **NEO4J_DRIVER_OPTIONS)
                 self.neo4j_driver.verify_connectivity()
                 print("Successfully connected to Neo4j.")
                 self._create_neo4j_constraints()
@@ -2766,6 +3745,7 @@ Provide a concise and informative answer, referencing the data sources (summary
 
         self.repo_data = None
         self.repo_full_name = None # Store repo name for context
+        self._graph_summary_cache = {} # repo full name -> (time.monotonic() when built, graph summary)
         self.owner = None # Store owner
         self.repo = None # Store repo name
 
@@ -2803,13 +3783,12 @@ Provide a concise and informative answer, referencing the data sources (summary
             print(f"Failed to get repository information for {self.repo_full_name}")
 
 
-    def _get_pr_summary_prompt(self, pr_details, role):
-        """Generates the Gemini prompt for PR summarization based on role."""
+    def _format_pr_details(self, pr_details):
+        """Format one pull request's metadata and (truncated) body for a summary prompt."""
         # Extract key details safely
         title = pr_details.get('title', 'N/A')
         body = pr_details.get('body', 'No description provided.')
         pr_number = pr_details.get('number', 'N/A')
-        repo_name = pr_details.get('repo_full_name', 'N/A')
         author = pr_details.get('author', 'N/A')
         state = pr_details.get('state', 'N/A')
         merged_status = 'Merged' if pr_details.get('merged') else ('Closed' if state == 'closed' else 'Open')
@@ -2822,62 +3801,21 @@ Provide a concise and informative answer, referencing the data sources (summary
 
         # Truncate long body
         max_body_len = 1500
-        truncated_body = body[:max_body_len] + ('...' if len(body) > max_body_len else '')
+        truncated_body = body if len(body) <= max_body_len else body[:max_body_len] + '...'
 
-        base_prompt = f"""
-You are an AI assistant specializing in summarizing GitHub Pull Requests.
-Analyze the following Pull Request details from repository '{repo_name}' and provide a summary tailored for a '{role}'.
+        return PR_DETAILS_TEMPLATE.format(
+            pr_number=pr_number, title=title, author=author,
+            state=state.capitalize(), merged_status=merged_status, created_at=created_at,
+            commits_count=commits_count, changed_files=changed_files, additions=additions,
+            deletions=deletions, labels=labels, truncated_body=truncated_body
+        )
 
-**Pull Request #{pr_number}: {title}**
-*   **Author:** {author}
-*   **Status:** {state.capitalize()} ({merged_status})
-*   **Created:** {created_at}
-*   **Commits:** {commits_count}
-*   **Changed Files:** {changed_files}
-*   **Code Churn:** +{additions} / -{deletions} lines
-*   **Labels:** {labels}
-*   **Description/Body:**
-{truncated_body}
----
-"""
-        role_instructions = ""
-        # Define role-specific instructions
-        if role == 'Developer':
-            role_instructions = """
-**Summary Focus (Developer):**
-*   Summarize the core technical changes and their purpose.
-*   Identify key files, modules, or functions affected.
-*   Mention any potential technical complexities, risks, or areas needing careful code review (based *only* on the description and metadata).
-*   Note any mention of tests added or modified.
-*   Be concise and focus on technical aspects relevant for peer review or understanding the change.
-"""
-        elif role == 'Manager' or role == 'Team Lead':
-             role_instructions = """
-**Summary Focus (Manager/Team Lead):**
-*   Explain the high-level purpose and business value (what problem does this PR solve or what feature does it add?).
-*   Summarize the overall status (e.g., Ready for Review, Needs Work, Merged, Blocked?).
-*   Give a sense of the PR's size/complexity (e.g., Small/Medium/Large based on file/line changes and description).
-*   Highlight any mentioned risks, blockers, or dependencies on other work.
-*   Include the author and key dates (created, merged/closed).
-*   Focus on information needed for tracking progress and impact.
-"""
-        elif role == 'Program Manager' or role == 'Product Owner':
-            role_instructions = """
-**Summary Focus (Program/Product Manager):**
-*   Describe the user-facing impact or the feature/bug fix being addressed.
-*   Relate the PR to product goals or requirements if possible (based on title/body/labels).
-*   Note the status (especially if merged or closed).
-*   Mention associated issues or tickets if referenced in the body (though not explicitly provided here, look for patterns like '#123').
-*   Focus on 'what' and 'why' from a product perspective.
-"""
-        else: # Default/General
-            role_instructions = """
-**Summary Focus (General):**
-*   State the main goal or purpose of the PR clearly.
-*   Identify the author and the current status (Open/Closed/Merged).
-*   Provide a brief, balanced overview of the key changes made.
-*   Keep the summary accessible to a wider audience.
-"""
+    def _get_pr_summary_prompt(self, pr_details, role):
+        """Generates the Gemini prompt for PR summarization based on role."""
+        repo_name = pr_details.get('repo_full_name', 'N/A')
+        base_prompt = PR_SUMMARY_INTRO_TEMPLATE.format(repo_name=repo_name, role=role) + self._format_pr_details(pr_details)
+        # Roles without dedicated instructions get the general summary
+        role_instructions = PR_ROLE_INSTRUCTIONS.get(role, GENERAL_SUMMARY_INSTRUCTIONS)
 
         return base_prompt + role_instructions + "\n**Summary:**" # Ask for summary explicitly
 
@@ -2910,11 +3848,11 @@ Analyze the following Pull Request details from repository '{repo_name}' and pro
             # print(prompt[:1000] + "..." if len(prompt) > 1000 else prompt) # Debug: Print truncated prompt
             # print("-----------------------------")
 
-            response = self.gemini_model.generate_content(prompt)
+            response = self._generate_content(prompt)
 
             print("\n--- Gemini PR Summary ---")
             summary_text = response.text
-            display(Markdown(summary_text))
+            render_markdown(summary_text)
             print("------------------------")
             return summary_text
 
@@ -2922,6 +3860,70 @@ Analyze the following Pull Request details from repository '{repo_name}' and pro
             print(f"Error communicating with Gemini for PR summary: {e}")
             return f"Error asking Gemini: {e}"
 
+    def summarize_pull_requests(self, pr_numbers, role):
+        """Summarize several PRs for a role with a single Gemini call.
+
+        PR details are fetched concurrently and Gemini is asked for a JSON array of
+        {pr_number, summary} objects. PRs missing from a malformed or partial reply are
+        summarized one by one instead. Returns {pr_number: summary} in request order.
+        """
+        if not self.gemini_model or not self.owner or not self.repo or not self.github_analyzer:
+            # summarize_pull_request reports which prerequisite is missing
+            return {pr_number: self.summarize_pull_request(pr_number, role) for pr_number in pr_numbers}
+        if not pr_numbers:
+            return {}
+
+        print(f"\nFetching details for {len(pr_numbers)} PRs in {self.repo_full_name}...")
+        with ThreadPoolExecutor(max_workers=min(len(pr_numbers), self.github_analyzer.max_concurrent_requests)) as executor:
+            details = list(executor.map(
+                lambda pr_number: self.github_analyzer.get_pull_request_details(self.owner, self.repo, pr_number),
+                pr_numbers
+            ))
+
+        summaries = {pr_number: f"Could not retrieve details for PR #{pr_number}."
+                     for pr_number, pr_details in zip(pr_numbers, details) if not pr_details}
+        fetched = {pr_number: pr_details for pr_number, pr_details in zip(pr_numbers, details) if pr_details}
+
+        if fetched:
+            print(f"Generating summaries for role: {role}...")
+            prompt = PR_BATCH_SUMMARY_TEMPLATE.format(
+                count=len(fetched), repo_name=self.repo_full_name, role=role,
+                pull_requests="".join(self._format_pr_details(pr_details) for pr_details in fetched.values()),
+                role_instructions=PR_ROLE_INSTRUCTIONS.get(role, GENERAL_SUMMARY_INSTRUCTIONS)
+            )
+            batch = {}
+            try:
+                response = self._generate_content(prompt, generation_config={"response_mime_type": "application/json"})
+                # Tolerate a reply wrapped in a Markdown code fence
+                text = re.sub(r"^```(?:json)?\s*|\s*```$", "", response.text.strip())
+                batch = {int(item["pr_number"]): str(item["summary"]) for item in orjson.loads(text)}
+            except Exception as e:
+                print(f"Batched PR summary failed ({e}), summarizing PRs individually.")
+
+            for pr_number, pr_details in fetched.items():
+                if pr_number in batch:
+                    summaries[pr_number] = batch[pr_number]
+                    continue
+                try:
+                    summaries[pr_number] = self._generate_content(self._get_pr_summary_prompt(pr_details, role)).text
+                except Exception as e:
+                    print(f"Error communicating with Gemini for PR summary: {e}")
+                    summaries[pr_number] = f"Error asking Gemini: {e}"
+
+        print("\n--- Gemini PR Summaries ---")
+        for pr_number in pr_numbers:
+            render_markdown(f"### PR #{pr_number}\n{summaries[pr_number]}")
+        print("------------------------")
+        return {pr_number: summaries[pr_number] for pr_number in pr_numbers}
+
+    async def summarize_pull_request_async(self, pr_number, role):
+        """summarize_pull_request for async callers; the blocking GitHub and Gemini calls run on a worker thread."""
+        return await asyncio.to_thread(self.summarize_pull_request, pr_number, role)
+
+    async def ask_gemini_about_repo_async(self, question):
+        """ask_gemini_about_repo for async callers; the blocking Neo4j and Gemini calls run on a worker thread."""
+        return await asyncio.to_thread(self.ask_gemini_about_repo, question)
+
 
 # --- Main function for running in Colab/Script ---
 def run_graph_repo_analyzer():
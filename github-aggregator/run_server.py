@@ -1,19 +1,42 @@
-import json
+import orjson
 import os
 import asyncio
 import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 from groq import Groq
 from activities import (
     get_repo_info, get_contributors, get_commits,
-    get_branches, get_issues, get_pull_requests, get_readme
+    get_branches, get_issues, get_pull_requests, get_readme,
+    get_repo_bundle
 )
 
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Optional: without it the response cache only matches exact repeats
+    SentenceTransformer = None
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional: without it conversations live in process memory and the server runs one worker
+    redis = None
+
+try:
+    import tiktoken
+except ImportError:  # Optional: without it the repo context is cut at an estimated characters-per-token ratio
+    tiktoken = None
+
 client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
 
 # response = client.chat.completions.create(
@@ -30,29 +53,290 @@ load_dotenv()
 LAMBDA_API_KEY = os.environ.get("LAMBDA_API_KEY")
 LAMBDA_API_BASE = "https://api.lambda.ai/v1"
 
-# Initialize Lambda AI client using OpenAI SDK
-lambda_client = OpenAI(
+# Initialize Lambda AI client using the OpenAI SDK's async client, so requests run on the event loop
+lambda_client = AsyncOpenAI(
     api_key=LAMBDA_API_KEY,
     base_url=LAMBDA_API_BASE
 )
 
-# Path to the repository context file
-CREW_AI_CONTEXT_PATH = "/Users/akezh/Desktop/A2A-MCP-hackathon/github-aggregator/groq-python.txt"
+# Path to the repository context file, overridable with REPO_CONTEXT_PATH
+CREW_AI_CONTEXT_PATH = os.environ.get(
+    "REPO_CONTEXT_PATH", "/Users/akezh/Desktop/A2A-MCP-hackathon/github-aggregator/groq-python.txt"
+)
+# Context window the prompt is sized for, and tokens reserved for the model's answer
+MODEL_CONTEXT_TOKENS = 128000
+MAX_OUTPUT_TOKENS = 2048
+# Tokens of repository context included in the system prompt, leaving room in the
+# window for the conversation history and the answer
+REPO_CONTEXT_TOKENS = 100000
+# Tokens of conversation history sent with each question: what is left of the window after the
+# repository context, the answer, and a margin for the prompt's instructions
+CHAT_HISTORY_TOKENS = MODEL_CONTEXT_TOKENS - REPO_CONTEXT_TOKENS - MAX_OUTPUT_TOKENS - 2000
+# Average characters per token, used to cut the context when tiktoken isn't installed
+CHARS_PER_TOKEN = 4
+# Characters read from the file before counting tokens; generous, so dense text still fills the budget
+REPO_CONTEXT_CHARS = REPO_CONTEXT_TOKENS * CHARS_PER_TOKEN * 2
+
+def count_tokens(text):
+    """Number of tokens in `text` (estimated from its length without tiktoken)."""
+    if tiktoken is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(tiktoken.get_encoding("cl100k_base").encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut `text` to at most `max_tokens` tokens (estimated from its length without tiktoken)."""
+    if tiktoken is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    encoding = tiktoken.get_encoding("cl100k_base")
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+def load_repo_context():
+    """Read the start of the repository context file, or a placeholder if it can't be read."""
+    try:
+        with open(CREW_AI_CONTEXT_PATH, 'r', encoding='utf-8') as f:
+            return truncate_to_tokens(f.read(REPO_CONTEXT_CHARS), REPO_CONTEXT_TOKENS)
+    except Exception as e:
+        print(f"Error reading repo context: {e}")
+        return "Repository context could not be loaded."
+
+def repo_context_mtime():
+    """Modification time of the repository context file, or None if it can't be read."""
+    try:
+        return os.stat(CREW_AI_CONTEXT_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+def build_system_prompt(repo_context):
+    """Create the system prompt with repository context."""
+    return f"""
+        You are an AI assistant specialized in analyzing and explaining code repositories.
+
+You are given access to a repository with the following structure and contents:
+
+<CONTEXT_START>
+{repo_context}
+<CONTEXT_END>
+
+Your task is to help users understand this repository.
+
+When asked about the repository, respond with a clear and concise explanation using **valid Markdown syntax** that is compatible with `.md` files. You should:
+
+### 🔍 Focus on:
+- Explaining repository structure and file relationships
+- Highlighting implementation patterns or architectural decisions
+- Showing how components work together
+- Guiding users on how to explore the repo logically
+
+### 📘 Output Format:
+Follow this structure for each explanation:
+
+1. **Provide the file name as a level-2 header** (`## filename.ext`)
+2. **Describe what the file does**
+3. **Include a relevant code snippet** using Markdown fenced code blocks
+4. **Proceed to the next important file**, repeating the above format
 
-# In-memory storage for conversations
-conversations = {}
+### 💡 Example Markdown Output:
 
-app = FastAPI(title="GitHub Repository Analysis API")
+````markdown
+## app/main.py
 
-# Add CORS middleware to allow requests from your React app
+This file contains the entry point of the application. It initializes the Flask server and defines the main routes used in the backend.
+
+```python
+from flask import Flask
+
+app = Flask(__name__)
+
+@app.route("/")
+def home():
+    return "Welcome to the app!"
+        """
+
+# Loaded once at startup instead of re-reading the file on every chat request; the system
+# message is rebuilt only when the file's modification time changes (see current_system_message)
+REPO_CONTEXT_MTIME = repo_context_mtime()
+REPO_CONTEXT = load_repo_context()
+SYSTEM_MESSAGE = {"role": "system", "content": build_system_prompt(REPO_CONTEXT)}
+system_message_lock = asyncio.Lock()
+
+async def current_system_message():
+    """Return the shared system message, reloading the repository context if its file has changed."""
+    global REPO_CONTEXT_MTIME, REPO_CONTEXT, SYSTEM_MESSAGE
+    mtime = repo_context_mtime()
+    if mtime != REPO_CONTEXT_MTIME:
+        # Only one request re-reads the file; the others wait and reuse its result
+        async with system_message_lock:
+            if mtime != REPO_CONTEXT_MTIME:
+                REPO_CONTEXT = await asyncio.to_thread(load_repo_context)
+                SYSTEM_MESSAGE = {"role": "system", "content": build_system_prompt(REPO_CONTEXT)}
+                REPO_CONTEXT_MTIME = mtime
+                response_cache.clear()  # Cached answers were generated from the old context
+    return SYSTEM_MESSAGE
+
+# Conversation storage limits: both the number of conversations kept in memory and the
+# messages kept per conversation are bounded
+MAX_CONVERSATIONS = 1000
+MAX_CONVERSATION_MESSAGES = 20
+# Most recent messages of a conversation sent to the model with each new question, as long
+# as they also fit in CHAT_HISTORY_TOKENS
+CHAT_CONTEXT_MESSAGES = 10
+
+# With REDIS_URL set, conversations are kept in Redis instead so that every worker process
+# sees the same history; idle conversations expire after CONVERSATION_TTL seconds
+REDIS_URL = os.environ.get("REDIS_URL")
+CONVERSATION_TTL = 24 * 60 * 60
+redis_client = redis.from_url(REDIS_URL) if redis is not None and REDIS_URL else None
+
+class ConversationStore:
+    """Message histories by conversation ID.
+
+    Without a Redis client they live in an in-process LRU of `maxsize` conversations; with one
+    they are stored in Redis as JSON with a TTL, so every worker process sees the same history.
+    """
+
+    def __init__(self, redis_client=None, maxsize=MAX_CONVERSATIONS, max_messages=MAX_CONVERSATION_MESSAGES,
+                 ttl=CONVERSATION_TTL):
+        self.redis = redis_client
+        self.maxsize = maxsize
+        self.max_messages = max_messages
+        self.ttl = ttl
+        self._conversations = OrderedDict()  # conversation ID -> messages, least recently used first
+
+    async def get(self, conversation_id):
+        """Return a copy of the conversation's messages, or an empty list for a new one."""
+        if self.redis is not None:
+            data = await self.redis.get(f"conversation:{conversation_id}")
+            return orjson.loads(data) if data else []
+        messages = self._conversations.get(conversation_id)
+        if messages is None:
+            return []
+        self._conversations.move_to_end(conversation_id)
+        return list(messages)
+
+    async def put(self, conversation_id, messages):
+        """Store the conversation's most recent messages, evicting the least recently used past the limit."""
+        messages = messages[-self.max_messages:]
+        if self.redis is not None:
+            await self.redis.set(f"conversation:{conversation_id}", orjson.dumps(messages), ex=self.ttl)
+            return
+        self._conversations[conversation_id] = messages
+        self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self.maxsize:
+            self._conversations.popitem(last=False)
+
+conversation_store = ConversationStore(redis_client)
+
+# Semantic response cache: how many answers to keep, the embedding model, and the
+# cosine similarity at which a new prompt counts as a repeat of a cached one
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+RESPONSE_CACHE_THRESHOLD = 0.92
+
+class ResponseCache:
+    """LRU cache of assistant responses keyed by (history hash, question).
+
+    Only answers given after the same prior history are candidates. Among those the question
+    matches exactly or, when sentence-transformers is installed, by the cosine similarity of
+    its normalized embedding (a flat inner-product search). Only the question is embedded,
+    so a long history cannot push it past the model's input limit.
+    """
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, threshold=RESPONSE_CACHE_THRESHOLD):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries = OrderedDict()  # (history hash, question) -> (embedding or None, response)
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _embed(self, text):
+        if SentenceTransformer is None:
+            return None
+        with self._lock:
+            if self._model is None:  # Loaded on first use, not at import
+                self._model = SentenceTransformer(RESPONSE_CACHE_MODEL)
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def lookup(self, key):
+        """Return (cached response or None, embedding of the question to pass to store)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][1], None
+
+        history, question = key
+        embedding = self._embed(question)
+        if embedding is None:
+            return None, None
+
+        with self._lock:
+            keys = [k for k, (cached_embedding, _) in self._entries.items()
+                    if k[0] == history and cached_embedding is not None]
+            if keys:
+                scores = np.stack([self._entries[key][0] for key in keys]) @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self._entries.move_to_end(keys[best])
+                    return self._entries[keys[best]][1], embedding
+        return None, embedding
+
+    def store(self, key, embedding, response):
+        with self._lock:
+            self._entries[key] = (embedding, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+response_cache = ResponseCache()
+
+# Finished /api/analyze-repo reports per (owner, repo), least recently used first, reused for ANALYSIS_CACHE_TTL seconds
+ANALYSIS_CACHE_SIZE = 256
+ANALYSIS_CACHE_TTL = 600
+analysis_cache = OrderedDict()  # (owner, repo) -> (time.monotonic() when stored, MarkdownResponse)
+
+# orjson encodes the large raw_data payloads much faster than the stdlib json encoder
+app = FastAPI(title="GitHub Repository Analysis API", default_response_class=ORJSONResponse)
+
+# Origins allowed to call the API, comma-separated in CORS_ORIGINS (defaults to the React dev server)
+CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+
+# Add CORS middleware to allow requests from your React app. Explicit lists plus max_age let
+# browsers cache the preflight for a day instead of sending OPTIONS before every request
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[origin.strip() for origin in CORS_ORIGINS if origin.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Conversation-Id"],
+    max_age=86400,
 )
 
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the listed paths through uncompressed.
+
+    gzip buffers small writes until it has a full block, which would hold back streamed text.
+    """
+
+    def __init__(self, app, exclude_paths=(), **options):
+        super().__init__(app, **options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress JSON and markdown bodies of 1 KB or more; the large analyze-repo reports shrink several-fold.
+# The streamed chat answer is left uncompressed so each chunk reaches the client as it is generated
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024,
+                   exclude_paths=["/api/chat-with-repo-agent/stream"])
+
 class RepoRequest(BaseModel):
     owner: str
     repo: str
@@ -69,23 +353,99 @@ class ChatResponse(BaseModel):
     response: str
     conversation_id: str
 
+# Compact one-line renderings of the GitHub records for the analyze-repo prompt; plain text
+# costs far fewer tokens than the equivalent indented JSON
+REPO_INFO_FIELDS = [
+    'full_name', 'description', 'html_url', 'language', 'stargazers_count', 'forks_count',
+    'open_issues_count', 'default_branch', 'created_at', 'updated_at'
+]
+
+def _fmt_repo_info(repo_info):
+    lines = [f"- {field}: {repo_info[field]}" for field in REPO_INFO_FIELDS if repo_info.get(field) is not None]
+    if repo_info.get('license'):
+        lines.append(f"- license: {repo_info['license'].get('name')}")
+    if repo_info.get('topics'):
+        lines.append(f"- topics: {', '.join(repo_info['topics'])}")
+    return "\n".join(lines)
+
+def _fmt_contributor(c):
+    return f"- {c.get('login')} ({c.get('contributions', 0)} contributions)"
+
+def _fmt_commit(c):
+    commit = c.get('commit', {})
+    author = commit.get('author') or {}
+    message = (commit.get('message') or '').split('\n', 1)[0]
+    return f"- {c.get('sha', '')[:7]} {author.get('date', '')} {author.get('name', 'unknown')}: {message}"
+
+def _fmt_branch(b):
+    return f"- {b.get('name')}"
+
+def _fmt_issue(i):
+    user = i.get('user') or {}
+    return f"- #{i.get('number')} [{i.get('state')}] {i.get('title')} (by {user.get('login')}, {i.get('created_at')})"
+
+def fetch_result(result, default):
+    """Unwrap one asyncio.gather(..., return_exceptions=True) result, logging a failure and using `default`."""
+    if isinstance(result, Exception):
+        print(f"GitHub fetch failed: {result!r}")
+        return default
+    return result
+
+async def fetch_bundle(owner, repo):
+    """get_repo_bundle, with the README resolved over REST when the bundle has none.
+
+    The bundle only looks up HEAD:README.md, while the REST endpoint finds any README name
+    (readme.md, README.rst, README, ...).
+    """
+    bundle = await asyncio.to_thread(get_repo_bundle, owner, repo, max_issues=30, max_prs=30)
+    if bundle and bundle['readme'] is None:
+        bundle['readme'] = await asyncio.to_thread(get_readme, owner, repo)
+    return bundle
+
 @app.post("/api/analyze-repo")
 async def analyze_repo(request: RepoRequest):
     try:
         owner = request.owner
         repo = request.repo
         
-        repo_info = get_repo_info(owner, repo)
-        if not repo_info:
-            raise HTTPException(status_code=404, detail=f"Repository {owner}/{repo} not found")
-            
-        contributors = get_contributors(owner, repo)
-        commits = get_commits(owner, repo, max_commits=50)
-        branches = get_branches(owner, repo)
-        issues = get_issues(owner, repo, max_issues=30)
-        pull_requests = get_pull_requests(owner, repo, max_prs=30)
-        readme_data = get_readme(owner, repo)
-        
+        # GitHub names are case-insensitive; a recent report skips the GitHub fan-out and the LLM call
+        cache_key = (owner.lower(), repo.lower())
+        cached = analysis_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+            analysis_cache.move_to_end(cache_key)
+            return cached[1]
+
+        # One GraphQL round trip covers most of the report; fall back to REST without a token.
+        # The requests are independent, so they run concurrently on worker threads; one failed
+        # fetch leaves its section empty instead of failing the whole report
+        bundle, contributors, commits = map(fetch_result, await asyncio.gather(
+            fetch_bundle(owner, repo),
+            asyncio.to_thread(get_contributors, owner, repo),
+            asyncio.to_thread(get_commits, owner, repo, max_commits=50),
+            return_exceptions=True
+        ), (None, [], []))
+        if bundle:
+            repo_info = bundle['repository']
+            branches = bundle['branches']
+            issues = bundle['issues']
+            pull_requests = bundle['pull_requests']
+            readme_data = bundle['readme']
+        else:
+            repo_info, *rest = await asyncio.gather(
+                asyncio.to_thread(get_repo_info, owner, repo),
+                asyncio.to_thread(get_branches, owner, repo),
+                asyncio.to_thread(get_issues, owner, repo, max_issues=30),
+                asyncio.to_thread(get_pull_requests, owner, repo, max_prs=30),
+                asyncio.to_thread(get_readme, owner, repo),
+                return_exceptions=True
+            )
+            # The report needs the repository itself: a failed fetch is an error, only a None result means not found
+            if isinstance(repo_info, Exception):
+                raise repo_info
+            if not repo_info:
+                raise HTTPException(status_code=404, detail=f"Repository {owner}/{repo} not found")
+            branches, issues, pull_requests, readme_data = map(fetch_result, rest, ([], [], [], None))
+
         result = {
             'repository': repo_info,
             'contributors': contributors,
@@ -96,30 +456,36 @@ async def analyze_repo(request: RepoRequest):
             'readme': readme_data
         }
         
+        contributor_lines = "\n".join(map(_fmt_contributor, result.get('contributors', [])[:10]))
+        commit_lines = "\n".join(map(_fmt_commit, result.get('commits', [])[:5]))
+        branch_lines = "\n".join(map(_fmt_branch, result.get('branches', [])))
+        issue_lines = "\n".join(map(_fmt_issue, result.get('issues', [])[:5]))
+        pull_request_lines = "\n".join(map(_fmt_issue, result.get('pull_requests', [])[:5]))
+
         prompt = f"""
         Generate a comprehensive markdown report for GitHub repository {owner}/{repo}.
         Here's the data to include:
 
         Repository Information:
-        {json.dumps(result.get('repository', {}), indent=2)}
+        {_fmt_repo_info(result.get('repository') or {})}
 
         README Content:
-        {result.get('readme', {}).get('content', 'No README found')}
+        {(result.get('readme') or {}).get('content', 'No README found')}
 
         Contributors ({len(result.get('contributors', []))} total):
-        {json.dumps(result.get('contributors', [])[:10], indent=2)}
+        {contributor_lines}
 
         Recent Commits ({len(result.get('commits', []))} fetched):
-        {json.dumps(result.get('commits', [])[:5], indent=2)}
+        {commit_lines}
 
         Branches ({len(result.get('branches', []))} total):
-        {json.dumps(result.get('branches', []), indent=2)}
+        {branch_lines}
 
         Issues ({len(result.get('issues', []))} total):
-        {json.dumps(result.get('issues', [])[:5], indent=2)}
+        {issue_lines}
 
         Pull Requests ({len(result.get('pull_requests', []))} total):
-        {json.dumps(result.get('pull_requests', [])[:5], indent=2)}
+        {pull_request_lines}
 
         Format this into a professional, well-structured markdown report with sections, tables, and highlighted insights.
         Make it visually appealing and easy to navigate.
@@ -131,114 +497,107 @@ async def analyze_repo(request: RepoRequest):
         )
         
         # Return both the markdown and raw data
-        return MarkdownResponse(
+        markdown_response = MarkdownResponse(
             markdown=response,
             raw_data=result
         )
+        analysis_cache[cache_key] = (time.monotonic(), markdown_response)
+        analysis_cache.move_to_end(cache_key)
+        while len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+            analysis_cache.popitem(last=False)
+        return markdown_response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def fit_history(conversation, max_tokens=CHAT_HISTORY_TOKENS):
+    """Return the newest messages of the conversation that fit in `max_tokens`.
+
+    At most CHAT_CONTEXT_MESSAGES are kept, and the newest message always is, even if it alone is over budget.
+    """
+    recent = []
+    used = 0
+    for message in reversed(conversation[-CHAT_CONTEXT_MESSAGES:]):
+        used += count_tokens(message["content"])
+        if recent and used > max_tokens:
+            break
+        recent.append(message)
+    recent.reverse()
+    return recent
+
+async def prepare_chat(request):
+    """Add the user's message to its conversation and build what the model and the cache need.
+
+    Returns (conversation_id, conversation, messages, cache_key).
+    """
+    # Generate or use the provided conversation ID
+    conversation_id = request.conversation_id
+    if not conversation_id:
+        conversation_id = f"conv-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    
+    # Get existing conversation history or create new one
+    conversation = await conversation_store.get(conversation_id)
+    
+    # Add user message to conversation
+    conversation.append({"role": "user", "content": request.user_message})
+    
+    # Prepare messages: the shared static system message first, so providers can cache that prefix,
+    # then the conversation history (limited to manage context) ending with the new message
+    recent = fit_history(conversation)
+    messages = [await current_system_message(), *recent]
+    
+    # Repeats of an earlier question (the same or a near-identical one) after the same history are answered
+    # from the cache; the history only takes part as a hash, so it has to match exactly
+    history_hash = hashlib.sha256(orjson.dumps(recent[:-1])).hexdigest()
+    cache_key = (history_hash, request.user_message)
+    return conversation_id, conversation, messages, cache_key
+
+async def create_chat_completion(messages, stream=False):
+    """Call Lambda AI API with Llama 4 model."""
+    return await lambda_client.chat.completions.create(
+        model="llama-4-maverick-17b-128e-instruct-fp8",
+        messages=messages,
+        temperature=0.7,
+        max_tokens=MAX_OUTPUT_TOKENS,
+        stream=stream
+    )
+
+def log_prompt_cache_usage(completion):
+    """Print how much of the prompt the provider served from its prefix cache, when it reports it."""
+    usage = getattr(completion, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    if cached_tokens is not None:
+        print(f"Prompt cache: {cached_tokens}/{usage.prompt_tokens} prompt tokens cached")
+
+async def save_conversation(conversation_id, conversation, assistant_response):
+    """Record the assistant's reply and keep the conversation store within its limits."""
+    # Add assistant response to conversation
+    conversation.append({"role": "assistant", "content": assistant_response})
+    await conversation_store.put(conversation_id, conversation)
+
 @app.post("/api/chat-with-repo-agent")
 async def chat_with_repo_agent(request: ChatRequest):
     try:
-        # Generate or use the provided conversation ID
-        conversation_id = request.conversation_id
-        if not conversation_id:
-            conversation_id = f"conv-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        
-        # Get existing conversation history or create new one
-        conversation = conversations.get(conversation_id, [])
-        
-        # Add user message to conversation
-        conversation.append({"role": "user", "content": request.user_message})
-        
-        # Load the repository context from crewAI.txt
-        repo_context = ""
-        try:
-            with open(CREW_AI_CONTEXT_PATH, 'r', encoding='utf-8') as f:
-                # Load first chunk of context (limit due to token constraints)
-                repo_context = f.read(10000000)  # Read first ~500K characters
-        except Exception as e:
-            print(f"Error reading repo context: {e}")
-            repo_context = "Repository context could not be loaded."
-        
-        # Create the system prompt with repository context
-        system_prompt = f"""
-        You are an AI assistant specialized in analyzing and explaining code repositories.
-
-You are given access to a repository with the following structure and contents:
-
-<CONTEXT_START>
-{repo_context[:1000000]}
-<CONTEXT_END>
-
-Your task is to help users understand this repository.
-
-When asked about the repository, respond with a clear and concise explanation using **valid Markdown syntax** that is compatible with `.md` files. You should:
-
-### 🔍 Focus on:
-- Explaining repository structure and file relationships
-- Highlighting implementation patterns or architectural decisions
-- Showing how components work together
-- Guiding users on how to explore the repo logically
-
-### 📘 Output Format:
-Follow this structure for each explanation:
+        conversation_id, conversation, messages, cache_key = await prepare_chat(request)
+        assistant_response, cache_embedding = await asyncio.to_thread(response_cache.lookup, cache_key)
 
-1. **Provide the file name as a level-2 header** (`## filename.ext`)
-2. **Describe what the file does**
-3. **Include a relevant code snippet** using Markdown fenced code blocks
-4. **Proceed to the next important file**, repeating the above format
+        if assistant_response is None:
+            try:
+                # Make API call asynchronously using OpenAI client
+                completion = await create_chat_completion(messages)
 
-### 💡 Example Markdown Output:
+                # Extract the assistant's response
+                assistant_response = completion.choices[0].message.content
+                log_prompt_cache_usage(completion)
 
-````markdown
-## app/main.py
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Lambda AI API error: {str(e)}")
 
-This file contains the entry point of the application. It initializes the Flask server and defines the main routes used in the backend.
-
-```python
-from flask import Flask
-
-app = Flask(__name__)
-
-@app.route("/")
-def home():
-    return "Welcome to the app!"
-        """
-        
-        # Prepare messages for Groq
-        messages = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        # Add conversation history (limit to last 10 messages to manage context)
-        for msg in conversation[-10:]:
-            messages.append(msg)
-        
-        # Call Lambda AI API with Llama 4 model
-        try:
-            # Make API call asynchronously using OpenAI client
-            completion = await asyncio.to_thread(
-                lambda: lambda_client.chat.completions.create(
-                    model="llama-4-maverick-17b-128e-instruct-fp8",
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=2048
-                )
-            )
-            
-            # Extract the assistant's response
-            assistant_response = completion.choices[0].message.content
-            
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Lambda AI API error: {str(e)}")
-        
-        # Add assistant response to conversation
-        conversation.append({"role": "assistant", "content": assistant_response})
+            response_cache.store(cache_key, cache_embedding, assistant_response)
         
-        # Save the updated conversation in memory
-        conversations[conversation_id] = conversation
+        await save_conversation(conversation_id, conversation, assistant_response)
         
         return ChatResponse(
             response=assistant_response,
@@ -248,6 +607,44 @@ def home():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/chat-with-repo-agent/stream")
+async def chat_with_repo_agent_stream(request: ChatRequest):
+    """Like /api/chat-with-repo-agent, but streams the answer as plain text while it is generated.
+
+    The conversation ID is returned in the X-Conversation-Id response header.
+    """
+    conversation_id, conversation, messages, cache_key = await prepare_chat(request)
+    cached_response, cache_embedding = await asyncio.to_thread(response_cache.lookup, cache_key)
+
+    async def generate():
+        if cached_response is not None:
+            await save_conversation(conversation_id, conversation, cached_response)
+            yield cached_response
+            return
+
+        parts = []
+        try:
+            stream = await create_chat_completion(messages, stream=True)
+            async for chunk in stream:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    parts.append(content)
+                    yield content
+            response_cache.store(cache_key, cache_embedding, "".join(parts))
+        finally:
+            # Keep whatever was generated, even if the client disconnected midway
+            if parts:
+                await save_conversation(conversation_id, conversation, "".join(parts))
+
+    return StreamingResponse(generate(), media_type="text/plain; charset=utf-8",
+                             headers={"X-Conversation-Id": conversation_id})
+
 # For development
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Worker processes only share conversations through Redis, so without it default to a single worker;
+    # WEB_CONCURRENCY overrides the count. uvicorn picks uvloop and httptools automatically when they
+    # are installed (uvicorn[standard]). Per-request access logging is off to save work on the hot path
+    default_workers = (os.cpu_count() or 1) * 2 + 1 if redis_client is not None else 1
+    workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+    uvicorn.run("run_server:app", host="0.0.0.0", port=8000, workers=workers,
+                log_level="warning", access_log=False)